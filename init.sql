@@ -90,11 +90,147 @@ CREATE TABLE IF NOT EXISTS ted_tenders (
     updated_at TIMESTAMPTZ DEFAULT NOW()
 );
 
-CREATE INDEX IF NOT EXISTS idx_ted_country ON ted_tenders(buyer_country);
-CREATE INDEX IF NOT EXISTS idx_ted_deadline ON ted_tenders(deadline);
+-- Liste filtrée par pays, triée par date de publication
+CREATE INDEX IF NOT EXISTS idx_ted_country_publication
+    ON ted_tenders(buyer_country, publication_date DESC, notice_id);
+-- Notices datées : ouvertes d'un pays, notices expirant bientôt
+CREATE INDEX IF NOT EXISTS idx_ted_open_country_deadline
+    ON ted_tenders(buyer_country, deadline)
+    WHERE deadline IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_ted_open_deadline
+    ON ted_tenders(deadline)
+    WHERE deadline IS NOT NULL;
 CREATE INDEX IF NOT EXISTS idx_ted_publication ON ted_tenders(publication_date DESC);
 CREATE INDEX IF NOT EXISTS idx_ted_cpv ON ted_tenders USING gin(cpv_codes);
 
+-- =============================================
+-- TABLE: ted_tenders_archive (notices expirées, ted-api-module)
+-- Ajout seul : pages pleines, textes longs compressés (TOAST) dès 128 octets
+-- =============================================
+CREATE TABLE IF NOT EXISTS ted_tenders_archive
+    (LIKE ted_tenders INCLUDING DEFAULTS)
+    WITH (fillfactor = 100, toast_tuple_target = 128);
+ALTER TABLE ted_tenders_archive
+    ADD COLUMN IF NOT EXISTS archived_at TIMESTAMPTZ NOT NULL DEFAULT NOW();
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_ted_archive_notice ON ted_tenders_archive(notice_id);
+CREATE INDEX IF NOT EXISTS idx_ted_archive_publication ON ted_tenders_archive(publication_date DESC);
+CREATE INDEX IF NOT EXISTS idx_ted_archive_country ON ted_tenders_archive(buyer_country);
+
+-- =============================================
+-- VIEW: tender_search (recherche unifiée, ted-api-module)
+-- =============================================
+CREATE OR REPLACE VIEW tender_search AS
+SELECT notice_id::text AS id, 'TED'::text AS source, title, description,
+       buyer_name::text AS buyer_name, buyer_country::text AS location,
+       publication_date, deadline, procedure_type::text AS procedure_type,
+       to_jsonb(cpv_codes) AS cpv_codes, estimated_value, url,
+       FALSE AS is_joue
+FROM ted_tenders
+UNION ALL
+SELECT id::text, 'BOAMP'::text, title, description,
+       buyer_name::text, COALESCE(location, buyer_department)::text,
+       publication_date, deadline_date, procedure_type::text,
+       CASE WHEN cpv IS NULL THEN '[]'::jsonb ELSE jsonb_build_array(cpv) END,
+       NULL::numeric, boamp_url, COALESCE(is_joue, FALSE)
+FROM tender_cache
+WHERE source = 'BOAMP'
+UNION ALL
+SELECT id::text, 'PLACE'::text, titre, NULL::text,
+       acheteur::text, lieu::text,
+       COALESCE(date_publication, created_at), date_limite,
+       COALESCE(type_procedure, procedure)::text,
+       '[]'::jsonb, NULL::numeric, url, FALSE
+FROM place_tenders;
+
+-- =============================================
+-- TABLE: sync_runs (historique des synchronisations TED)
+-- =============================================
+CREATE TABLE IF NOT EXISTS sync_runs (
+    id BIGSERIAL PRIMARY KEY,
+    country VARCHAR(10) NOT NULL,
+    trigger VARCHAR(20) NOT NULL DEFAULT 'manual',   -- 'manual', 'scheduled'
+    status VARCHAR(20) NOT NULL DEFAULT 'running',   -- 'running', 'completed', 'error', 'interrupted'
+    started_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    finished_at TIMESTAMPTZ,
+    elapsed_seconds DOUBLE PRECISION,
+    pages INTEGER NOT NULL DEFAULT 0,
+    api_calls INTEGER NOT NULL DEFAULT 0,
+    fetched INTEGER NOT NULL DEFAULT 0,
+    inserted INTEGER NOT NULL DEFAULT 0,
+    updated INTEGER NOT NULL DEFAULT 0,
+    phases JSONB NOT NULL DEFAULT '[]'::jsonb,        -- durées par phase
+    error_message TEXT,
+    expected INTEGER,                                 -- notices attendues (progression)
+    progress_at TIMESTAMPTZ                           -- dernière mise à jour de progression
+);
+
+CREATE INDEX IF NOT EXISTS idx_sync_runs_started ON sync_runs(started_at DESC);
+CREATE INDEX IF NOT EXISTS idx_sync_runs_country ON sync_runs(country, started_at DESC);
+
+-- =============================================
+-- TABLE: sync_checkpoints (reprise des synchronisations interrompues)
+-- =============================================
+CREATE TABLE IF NOT EXISTS sync_checkpoints (
+    fingerprint VARCHAR(64) PRIMARY KEY,             -- sha256 (requête, champs, scope, taille de page)
+    country VARCHAR(10) NOT NULL,
+    query TEXT NOT NULL,
+    last_page INTEGER NOT NULL DEFAULT 0,            -- dernière page entièrement upsert
+    fetched INTEGER NOT NULL DEFAULT 0,
+    run_id BIGINT,
+    iteration_token TEXT,                            -- jeton TED (pagination ITERATION)
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- =============================================
+-- TABLE: backfill_checkpoints (reprise des backfills TED par fenêtre)
+-- =============================================
+CREATE TABLE IF NOT EXISTS backfill_checkpoints (
+    country VARCHAR(10) NOT NULL,
+    window_start DATE NOT NULL,                      -- date de publication (incluse)
+    window_end DATE NOT NULL,                        -- date de publication (incluse)
+    status VARCHAR(20) NOT NULL DEFAULT 'pending',   -- 'pending', 'running', 'completed', 'error'
+    last_page INTEGER NOT NULL DEFAULT 0,            -- dernière page TED upsert
+    fetched INTEGER NOT NULL DEFAULT 0,
+    inserted INTEGER NOT NULL DEFAULT 0,
+    updated INTEGER NOT NULL DEFAULT 0,
+    error_message TEXT,
+    iteration_token TEXT,                            -- jeton TED (pagination ITERATION)
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (country, window_start, window_end)
+);
+
+-- =============================================
+-- TABLES: tender_fingerprints / tender_duplicates (doublons BOAMP/TED)
+-- =============================================
+CREATE TABLE IF NOT EXISTS tender_fingerprints (
+    source VARCHAR(10) NOT NULL,
+    notice_id VARCHAR(100) NOT NULL,
+    blocking_key TEXT NOT NULL,     -- acheteur normalisé | date limite | division CPV
+    signature INTEGER[] NOT NULL,   -- MinHash des trigrammes du titre
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (source, notice_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_tender_fingerprints_block ON tender_fingerprints(blocking_key);
+
+CREATE TABLE IF NOT EXISTS tender_duplicates (
+    source VARCHAR(10) NOT NULL,
+    notice_id VARCHAR(100) NOT NULL,
+    duplicate_source VARCHAR(10) NOT NULL,
+    duplicate_notice_id VARCHAR(100) NOT NULL,
+    similarity REAL NOT NULL,
+    detected_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (source, notice_id, duplicate_source, duplicate_notice_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_tender_duplicates_reverse
+    ON tender_duplicates(duplicate_source, duplicate_notice_id);
+
+-- Version des données de ted_tenders : avancée après chaque écriture validée,
+-- contrôlée par l'index des deadlines de /api/tenders/expiring
+CREATE SEQUENCE IF NOT EXISTS ted_tenders_changes;
+
 -- =============================================
 -- TABLE: entreprises (from SQLite entreprises_cache)
 -- =============================================
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Benchmark des plans de requête de ted_tenders selon le jeu d'index.
+
+Insère des notices synthétiques (BENCH-*), puis compare avec EXPLAIN ANALYZE
+les requêtes de liste et d'expiration de TenderDatabase :
+- avant : index mono-colonne d'origine (idx_ted_country, idx_ted_deadline) ;
+- après : index de la migration 1 (idx_ted_country_publication,
+  idx_ted_open_country_deadline, idx_ted_open_deadline).
+
+Tout est exécuté dans une transaction annulée à la fin : la base n'est pas
+modifiée, mais ted_tenders reste verrouillée le temps du benchmark (à lancer
+sur une base de développement).
+
+Usage:
+    python benchmarks/bench_indexes.py [--rows 200000] [--database-url URL]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from sqlalchemy import text  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine  # noqa: E402
+
+from ted_api.config import get_settings  # noqa: E402
+from ted_api.database import TED_TENDERS_INDEX_SQL, TenderDatabase  # noqa: E402
+from ted_api.models import TenderFilter  # noqa: E402
+
+# Index remplacés par la migration 1 (init.sql d'origine)
+LEGACY_INDEXES = ("idx_ted_country", "idx_ted_deadline")
+LEGACY_INDEX_SQL: tuple[str, ...] = (
+    "CREATE INDEX IF NOT EXISTS idx_ted_country ON ted_tenders(buyer_country)",
+    "CREATE INDEX IF NOT EXISTS idx_ted_deadline ON ted_tenders(deadline)",
+)
+MIGRATION_INDEXES = (
+    "idx_ted_country_publication",
+    "idx_ted_open_country_deadline",
+    "idx_ted_open_deadline",
+)
+
+SEED_SQL = """
+    INSERT INTO ted_tenders (
+        notice_id, title, buyer_name, buyer_country, estimated_value, currency,
+        deadline, publication_date, url
+    )
+    SELECT
+        'BENCH-' || g,
+        'Notice de benchmark ' || g,
+        'Acheteur ' || (g % 500),
+        (ARRAY['FRA', 'DEU', 'ITA', 'ESP', 'POL', 'NLD', 'BEL'])[1 + g % 7],
+        CASE WHEN g % 4 = 0 THEN NULL ELSE (g % 1000) * 1000 END,
+        'EUR',
+        CASE WHEN g % 20 = 0 THEN NULL
+            ELSE NOW() + ((g % 120) - 60) * INTERVAL '1 day' END,
+        NOW() - (g % 365) * INTERVAL '1 day' - (g % 86400) * INTERVAL '1 second',
+        'https://ted.europa.eu/bench/' || g
+    FROM generate_series(1, :rows) AS g
+"""
+
+
+def listing_query(filters: TenderFilter) -> tuple[str, dict[str, Any]]:
+    """Requête de page de get_tenders (première page de 20)."""
+    where_sql, params = TenderDatabase._build_where(filters)
+    sql = f"""
+        SELECT * FROM ted_tenders {where_sql}
+        ORDER BY publication_date DESC, deadline ASC
+        LIMIT 20 OFFSET 0
+    """
+    return sql, params
+
+
+def count_query(filters: TenderFilter) -> tuple[str, dict[str, Any]]:
+    """Requête de comptage de get_tenders."""
+    where_sql, params = TenderDatabase._build_where(filters)
+    return f"SELECT COUNT(*) FROM ted_tenders {where_sql}", params
+
+
+def expiring_query(days: int) -> tuple[str, dict[str, Any]]:
+    """Requête de get_expiring_tenders."""
+    sql = """
+        SELECT * FROM ted_tenders
+        WHERE deadline IS NOT NULL
+        AND deadline >= CURRENT_DATE
+        AND deadline <= CURRENT_DATE + :days * INTERVAL '1 day'
+        ORDER BY deadline ASC
+    """
+    return sql, {"days": days}
+
+
+QUERIES: tuple[tuple[str, tuple[str, dict[str, Any]]], ...] = (
+    ("liste pays", listing_query(TenderFilter(country="FRA"))),
+    (
+        "liste pays ouverte + montants",
+        listing_query(
+            TenderFilter(country="FRA", days_remaining=0, min_value=100000, max_value=500000)
+        ),
+    ),
+    ("comptage pays ouvertes", count_query(TenderFilter(country="FRA", days_remaining=0))),
+    ("expirant sous 7 jours", expiring_query(7)),
+)
+
+
+def plan_summary(plan: dict[str, Any]) -> tuple[list[str], list[str]]:
+    """Types de nœuds et index utilisés d'un plan JSON (parcours en profondeur)."""
+    nodes: list[str] = []
+    indexes: list[str] = []
+    stack = [plan]
+    while stack:
+        node = stack.pop()
+        nodes.append(node["Node Type"])
+        if "Index Name" in node:
+            indexes.append(node["Index Name"])
+        stack.extend(reversed(node.get("Plans", [])))
+    return nodes, indexes
+
+
+async def explain(conn: AsyncConnection, sql: str, params: dict[str, Any]) -> dict[str, Any]:
+    """EXPLAIN (ANALYZE, BUFFERS) d'une requête : durée, nœuds, index, pages lues."""
+    result = await conn.execute(text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}"), params)
+    raw = result.scalar()
+    document = (json.loads(raw) if isinstance(raw, str) else raw)[0]
+    nodes, indexes = plan_summary(document["Plan"])
+    return {
+        "ms": document["Execution Time"],
+        "nodes": nodes,
+        "indexes": sorted(set(indexes)),
+        "buffers": document["Plan"].get("Shared Hit Blocks", 0)
+        + document["Plan"].get("Shared Read Blocks", 0),
+    }
+
+
+async def explain_all(conn: AsyncConnection) -> list[dict[str, Any]]:
+    """Plans de toutes les requêtes (meilleure durée sur 3 exécutions)."""
+    plans = []
+    for _, (sql, params) in QUERIES:
+        runs = [await explain(conn, sql, params) for _ in range(3)]
+        plans.append(min(runs, key=lambda run: run["ms"]))
+    return plans
+
+
+def describe(plan: dict[str, Any]) -> str:
+    """Résumé d'un plan sur une ligne."""
+    indexes = ", ".join(plan["indexes"]) or "aucun index"
+    nodes = " > ".join(dict.fromkeys(plan["nodes"]))
+    return f"{plan['ms']:9.2f} ms {plan['buffers']:7d} pages  [{indexes}] {nodes}"
+
+
+async def run(database_url: str, rows: int) -> None:
+    """Exécute le benchmark dans une transaction annulée."""
+    engine = create_async_engine(database_url)
+    try:
+        async with engine.connect() as conn:
+            transaction = await conn.begin()
+            try:
+                await conn.execute(text(SEED_SQL), {"rows": rows})
+                for statement in TED_TENDERS_INDEX_SQL:
+                    await conn.execute(text(statement))
+                for name in LEGACY_INDEXES:
+                    await conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+                await conn.execute(text("ANALYZE ted_tenders"))
+                after = await explain_all(conn)
+
+                for name in MIGRATION_INDEXES:
+                    await conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+                for statement in LEGACY_INDEX_SQL:
+                    await conn.execute(text(statement))
+                await conn.execute(text("ANALYZE ted_tenders"))
+                before = await explain_all(conn)
+            finally:
+                await transaction.rollback()
+    finally:
+        await engine.dispose()
+
+    print(f"{rows} notices synthétiques (transaction annulée)")
+    for (label, _), old, new in zip(QUERIES, before, after, strict=True):
+        gain = old["ms"] / new["ms"] if new["ms"] else float("inf")
+        print(f"\n{label} (x{gain:.1f})")
+        print(f"  avant : {describe(old)}")
+        print(f"  après : {describe(new)}")
+
+
+def main() -> None:
+    """Point d'entrée CLI."""
+    parser = argparse.ArgumentParser(description="Benchmark des index de ted_tenders")
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+    database_url = args.database_url or get_settings().async_database_url
+    asyncio.run(run(database_url, args.rows))
+
+
+if __name__ == "__main__":
+    main()
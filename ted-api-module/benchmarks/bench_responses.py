@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark du rendu des endpoints de liste.
+
+Compare, pour une page de 100 Tender, le chemin FastAPI par défaut
+(response_model + validation + encodeur) au chemin optimisé
+(TenderJSONResponse: sérialisation directe, sans re-validation).
+
+Avec --precomputed, les champs dérivés sont portés par les lignes comme
+lorsqu'ils sont calculés en SQL (TenderDatabase, reference_time).
+
+Usage:
+    python benchmarks/bench_responses.py [--requests 2000] [--items 100] [--precomputed]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import httpx  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+
+from ted_api.api.responses import TenderJSONResponse  # noqa: E402
+from ted_api.models import PaginatedResponse, Tender, reference_time  # noqa: E402
+
+
+def build_page(items: int, precomputed: bool = False) -> PaginatedResponse[Tender]:
+    """Construit une page de Tender représentative."""
+    now = datetime.now()
+    tenders = [
+        Tender(
+            notice_id=f"{100000 + i}-2024",
+            title=f"Fourniture de matériel informatique lot {i}",
+            description=None,
+            buyer_name="Ministère de l'Intérieur",
+            buyer_country="FRA",
+            estimated_value=250000.0 + i,
+            currency="EUR",
+            deadline=now + timedelta(days=i % 60),
+            publication_date=now - timedelta(days=i % 10),
+            cpv_codes=["30200000", "30210000"],
+            procedure_type="OPEN",
+            place_of_performance="FR101",
+            url=f"https://ted.europa.eu/fr/notice/-/detail/{100000 + i}-2024",
+        )
+        for i in range(items)
+    ]
+    if precomputed:
+        with reference_time(now):
+            for tender in tenders:
+                tender.set_derived_fields(tender.model_dump())
+    return PaginatedResponse(total=items * 50, page=1, limit=items, items=tenders)
+
+
+def build_app(page: PaginatedResponse[Tender]) -> FastAPI:
+    """Application avec les deux variantes de la route de liste."""
+    app = FastAPI()
+
+    @app.get("/default", response_model=PaginatedResponse[Tender])
+    async def default_route() -> PaginatedResponse[Tender]:
+        return page
+
+    @app.get(
+        "/optimized",
+        response_model=PaginatedResponse[Tender],
+        response_class=TenderJSONResponse,
+    )
+    async def optimized_route() -> TenderJSONResponse:
+        return TenderJSONResponse(page, reference=datetime.now())
+
+    return app
+
+
+async def measure(client: httpx.AsyncClient, path: str, requests: int) -> float:
+    """Retourne le débit (requêtes/seconde) pour une route."""
+    for _ in range(50):  # échauffement
+        await client.get(path)
+    start = time.perf_counter()
+    for _ in range(requests):
+        response = await client.get(path)
+        response.raise_for_status()
+    return requests / (time.perf_counter() - start)
+
+
+async def run(requests: int, items: int, precomputed: bool) -> None:
+    """Exécute le benchmark et affiche les résultats."""
+    app = build_app(build_page(items, precomputed))
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # Le contrat JSON doit rester identique
+        default = (await client.get("/default")).json()
+        optimized = (await client.get("/optimized")).json()
+        assert default["items"][0].keys() == optimized["items"][0].keys()
+
+        before = await measure(client, "/default", requests)
+        after = await measure(client, "/optimized", requests)
+
+    mode = "dérivés précalculés" if precomputed else "dérivés en Python"
+    print(f"{items} items/page, {requests} requêtes, {mode}")
+    print(f"  défaut (response_model)   : {before:8.1f} req/s")
+    print(f"  TenderJSONResponse        : {after:8.1f} req/s")
+    print(f"  gain: x{after / before:.2f}")
+
+
+def main() -> None:
+    """Point d'entrée CLI."""
+    parser = argparse.ArgumentParser(description="Benchmark rendu JSON")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--precomputed", action="store_true")
+    args = parser.parse_args()
+    asyncio.run(run(args.requests, args.items, args.precomputed))
+
+
+if __name__ == "__main__":
+    main()
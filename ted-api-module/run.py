@@ -6,11 +6,15 @@ Usage:
     python run.py              # Démarre le serveur API
     python run.py --sync       # Lance une synchronisation unique
     python run.py --daemon     # Démarre en mode daemon (sync planifiée)
+    python run.py --backfill --from 2023-01-01 --to 2023-12-31
+    python run.py --boamp      # Charge l'export BOAMP dans tender_cache
+    python run.py --partition  # Partitionne ted_tenders par mois de publication
 """
 
 import argparse
 import asyncio
 import sys
+from datetime import date
 from pathlib import Path
 
 # Ajouter src au path pour les imports
@@ -27,6 +31,9 @@ Exemples:
     python run.py                      # Démarrer le serveur API
     python run.py --sync               # Synchronisation unique
     python run.py --sync --country DEU # Sync Allemagne
+    python run.py --backfill --from 2023-01-01 --to 2023-12-31 --processes 4
+    python run.py --boamp --from 2024-01-01  # Export BOAMP depuis une date
+    python run.py --partition          # Partitionner ted_tenders (ponctuel)
     python run.py --host 127.0.0.1     # Écouter localhost seulement
     python run.py --port 3000          # Port personnalisé
     python run.py --reload             # Mode développement
@@ -43,6 +50,47 @@ Exemples:
         action="store_true",
         help="Démarrer en mode daemon (synchronisation planifiée)",
     )
+    parser.add_argument(
+        "--backfill",
+        action="store_true",
+        help="Backfill historique (scope ALL) par fenêtres de dates, multi-processus",
+    )
+    parser.add_argument(
+        "--boamp",
+        action="store_true",
+        help="Charger l'export BOAMP (Opendatasoft) dans tender_cache puis quitter",
+    )
+    parser.add_argument(
+        "--partition",
+        action="store_true",
+        help="Convertir ted_tenders en table partitionnée par mois puis quitter",
+    )
+    parser.add_argument(
+        "--from",
+        dest="date_from",
+        type=date.fromisoformat,
+        default=None,
+        help="Backfill/BOAMP: première date de publication (YYYY-MM-DD)",
+    )
+    parser.add_argument(
+        "--to",
+        dest="date_to",
+        type=date.fromisoformat,
+        default=None,
+        help="Backfill: dernière date de publication (défaut: aujourd'hui)",
+    )
+    parser.add_argument(
+        "--window-days",
+        type=int,
+        default=30,
+        help="Backfill: taille des fenêtres en jours (défaut: 30)",
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=None,
+        help="Backfill: nombre de processus (défaut: nombre de cœurs)",
+    )
     parser.add_argument(
         "--country",
         default=None,
@@ -73,7 +121,21 @@ Exemples:
 
     args = parser.parse_args()
 
-    if args.sync:
+    if args.backfill:
+        if args.date_from is None:
+            parser.error("--backfill requiert --from")
+        run_backfill_command(
+            start=args.date_from,
+            end=args.date_to or date.today(),
+            country=args.country,
+            window_days=args.window_days,
+            processes=args.processes,
+        )
+    elif args.boamp:
+        run_boamp_command(start=args.date_from)
+    elif args.partition:
+        run_partition_command()
+    elif args.sync:
         # Mode synchronisation unique
         run_sync(country=args.country)
     elif args.daemon:
@@ -101,6 +163,15 @@ def run_server(
 
     settings = get_settings()
 
+    # Chaque worker possède son propre pool : le total doit rester
+    # sous max_connections de PostgreSQL.
+    max_connections = workers * settings.db_max_connections_per_worker
+    print(
+        f"Pool PostgreSQL: {workers} worker(s) x "
+        f"{settings.db_max_connections_per_worker} connexions max "
+        f"= {max_connections} connexions"
+    )
+
     uvicorn.run(
         "ted_api.api.app:app",
         host=host or settings.api_host,
@@ -125,6 +196,102 @@ def run_sync(country: str | None = None) -> None:
         sys.exit(1)
 
 
+def run_backfill_command(
+    start: date,
+    end: date,
+    country: str | None = None,
+    window_days: int = 30,
+    processes: int | None = None,
+) -> None:
+    """Exécute un backfill historique, reprenable après interruption."""
+    from ted_api.backfill import run_backfill
+    from ted_api.config import get_settings
+
+    print(f"Backfill {country or 'FRA'} du {start} au {end} (fenêtres de {window_days} j)...")
+
+    checkpoints = asyncio.run(
+        run_backfill(
+            get_settings(),
+            start,
+            end,
+            country=country,
+            window_days=window_days,
+            processes=processes,
+        )
+    )
+    failed = [c for c in checkpoints if c.status != "completed"]
+    print(
+        f"Backfill terminé: {len(checkpoints) - len(failed)}/{len(checkpoints)} fenêtres, "
+        f"{sum(c.inserted for c in checkpoints)} insérés, "
+        f"{sum(c.updated for c in checkpoints)} mis à jour"
+    )
+    if failed:
+        for c in failed:
+            print(f"  {c.window_start} -> {c.window_end}: {c.error_message}")
+        print("Relancer la même commande pour reprendre.")
+        sys.exit(1)
+
+
+def run_boamp_command(start: date | None = None) -> None:
+    """Charge l'export BOAMP dans tender_cache."""
+    from ted_api.boamp import BoampClient, ingest_boamp
+    from ted_api.config import get_settings
+    from ted_api.database import TenderDatabase
+
+    settings = get_settings()
+    where = f"dateparution >= date'{start.isoformat()}'" if start else None
+
+    async def ingest() -> dict:
+        db = TenderDatabase(
+            settings.async_database_url,
+            engine_options=settings.database_engine_options,
+        )
+        try:
+            return await ingest_boamp(BoampClient(settings), db, where=where)
+        finally:
+            await db.close()
+
+    print(f"Export BOAMP{f' depuis le {start}' if start else ''}...")
+
+    try:
+        result = asyncio.run(ingest())
+        print(
+            f"Export BOAMP terminé: {result['records']} avis lus, "
+            f"{result['inserted']} insérés, {result['updated']} mis à jour "
+            f"({result['elapsed_seconds']} s)"
+        )
+    except Exception as e:
+        print(f"Erreur lors de l'export BOAMP: {e}")
+        sys.exit(1)
+
+
+def run_partition_command() -> None:
+    """Convertit ted_tenders en table partitionnée par mois de publication."""
+    from ted_api.config import get_settings
+    from ted_api.database import get_database
+
+    settings = get_settings()
+
+    async def partition() -> int:
+        db = await get_database(settings)
+        try:
+            return await db.partition_ted_tenders(settings.ted_partition_months_ahead)
+        finally:
+            await db.close()
+
+    print("Partitionnement de ted_tenders...")
+
+    try:
+        created = asyncio.run(partition())
+        if created:
+            print(f"ted_tenders partitionnée: {created} partitions mensuelles")
+        else:
+            print("ted_tenders est déjà partitionnée")
+    except Exception as e:
+        print(f"Erreur lors du partitionnement: {e}")
+        sys.exit(1)
+
+
 def run_daemon() -> None:
     """Démarre le scheduler en mode daemon."""
     from ted_api.config import get_settings
@@ -137,16 +304,18 @@ def run_daemon() -> None:
         scheduler.start()
 
         print(
-            f"Daemon démarré. Synchronisation planifiée à "
-            f"{settings.sync_hour:02d}:{settings.sync_minute:02d}"
+            f"Daemon démarré ({scheduler.elector.identity}). Synchronisation "
+            f"planifiée à {settings.sync_hour:02d}:{settings.sync_minute:02d} "
+            f"par la réplique leader"
         )
         print("Appuyez sur Ctrl+C pour arrêter...")
 
         try:
             while True:
                 await asyncio.sleep(60)
-        except KeyboardInterrupt:
-            scheduler.stop()
+        finally:
+            # Cède le leadership pour une bascule immédiate
+            await scheduler.shutdown()
             print("\nDaemon arrêté.")
 
     asyncio.run(daemon())
@@ -5,17 +5,20 @@ Point d'entrée principal du serveur web.
 """
 
 import logging
+import time
+from collections.abc import Awaitable, Callable
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
 import structlog
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 from ted_api.api.dependencies import init_dependencies, shutdown_dependencies
 from ted_api.api.routes import router
 from ted_api.config import get_settings
+from ted_api.metrics import HTTP_REQUEST_LATENCY, render_metrics
 
 # Configuration du logging structuré
 structlog.configure(
@@ -103,6 +106,32 @@ app.add_middleware(
 )
 
 
+@app.middleware("http")
+async def record_request_latency(
+    request: Request,
+    call_next: Callable[[Request], Awaitable[Response]],
+) -> Response:
+    """
+    Mesure la latence de chaque requête HTTP.
+
+    Les requêtes sont étiquetées par gabarit de route (/api/tenders/{notice_id})
+    et non par chemin, pour borner la cardinalité.
+    """
+    start = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        HTTP_REQUEST_LATENCY.labels(
+            request.method,
+            getattr(route, "path", "unmatched"),
+            str(status_code),
+        ).observe(time.perf_counter() - start)
+
+
 # Gestionnaire d'erreurs global
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception) -> JSONResponse:
@@ -132,6 +161,13 @@ async def global_exception_handler(request: Request, exc: Exception) -> JSONResp
 app.include_router(router)
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    """Métriques Prometheus (client TED, cache, base, sync, HTTP)."""
+    content, content_type = render_metrics()
+    return Response(content=content, media_type=content_type)
+
+
 # Route racine
 @app.get("/", tags=["root"])
 async def root() -> dict[str, str]:
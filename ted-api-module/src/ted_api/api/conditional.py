@@ -0,0 +1,221 @@
+"""
+Requêtes conditionnelles : ETag, Last-Modified et réponses 304.
+
+- Détail d'une notice : ETag fort dérivé de updated_at, et Last-Modified.
+  La version de chaque notice est lue dans TenderVersionMap (en mémoire,
+  sinon SELECT sur la clé primaire) : un 304 ne lit ni ne sérialise la
+  ligne complète.
+- Listes : ETag faible dérivé de la version des données de ted_tenders
+  (séquence ted_tenders_changes, avancée à chaque synchronisation), de
+  l'heure courante (champs calculés days_until_deadline, is_expired) et
+  des paramètres de la requête.
+
+Une écriture faite par un autre processus n'est vue qu'au contrôle suivant
+de la version (au plus check_interval secondes) : un 304 peut être servi
+pendant cet intervalle.
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from datetime import UTC, datetime
+from email.utils import format_datetime, parsedate_to_datetime
+
+import structlog
+from fastapi import Request, Response, status
+
+from ted_api.database import TenderDatabase
+
+logger = structlog.get_logger(__name__)
+
+# Notices dont la version est gardée en mémoire (les moins récemment lues sortent)
+VERSION_MAP_MAX_ENTRIES = 50_000
+
+
+class TenderVersionMap:
+    """
+    Versions (updated_at) des notices, vidées à chaque changement de ted_tenders.
+
+    Seules les notices trouvées sont gardées : une notice absente est relue
+    à chaque requête, pour qu'une notice tout juste synchronisée ne soit
+    jamais servie en 404.
+    """
+
+    def __init__(
+        self,
+        db: TenderDatabase,
+        check_interval: float = 10.0,
+        max_entries: int = VERSION_MAP_MAX_ENTRIES,
+    ) -> None:
+        """
+        Initialise une table vide.
+
+        Args:
+            db: Base de données
+            check_interval: Intervalle de contrôle de la version de
+                ted_tenders (secondes)
+            max_entries: Nombre maximal de notices gardées
+        """
+        self.db = db
+        self.check_interval = check_interval
+        self.max_entries = max_entries
+        self._versions: OrderedDict[str, datetime] = OrderedDict()
+        self._data_version: int | None = None
+        self._local_version = -1
+        self._checked_at = 0.0
+
+    async def data_version(self) -> int:
+        """
+        Version des données de ted_tenders.
+
+        Relue au plus une fois par check_interval, et dès qu'une écriture
+        est validée par ce processus ; un changement vide la table.
+        """
+        now = time.monotonic()
+        if (
+            self._data_version is None
+            or self._local_version != self.db.tenders_version
+            or now - self._checked_at >= self.check_interval
+        ):
+            local_version = self.db.tenders_version
+            version = await self.db.get_tenders_changes()
+            if version != self._data_version:
+                self._versions.clear()
+                self._data_version = version
+            self._local_version = local_version
+            self._checked_at = now
+        return self._data_version
+
+    async def updated_at(self, notice_id: str) -> datetime | None:
+        """
+        Date de modification d'une notice.
+
+        Args:
+            notice_id: Identifiant de la notice
+
+        Returns:
+            Date de modification, None si la notice n'existe pas
+        """
+        await self.data_version()
+        updated_at = self._versions.get(notice_id)
+        if updated_at is not None:
+            self._versions.move_to_end(notice_id)
+            return updated_at
+
+        updated_at = await self.db.get_tender_updated_at(notice_id)
+        if updated_at is not None:
+            self._versions[notice_id] = updated_at
+            if len(self._versions) > self.max_entries:
+                self._versions.popitem(last=False)
+        return updated_at
+
+
+def _utc(value: datetime) -> datetime:
+    """Datetime en UTC (naive considérée UTC)."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=UTC)
+    return value.astimezone(UTC)
+
+
+def tender_etag(updated_at: datetime) -> str:
+    """ETag fort d'une notice : updated_at en microsecondes (hexadécimal)."""
+    return f'"{int(_utc(updated_at).timestamp() * 1_000_000):x}"'
+
+
+def list_etag(data_version: int, request: Request, now: datetime) -> str:
+    """
+    ETag faible d'une liste.
+
+    Args:
+        data_version: Version des données de ted_tenders
+        request: Requête (chemin et paramètres, dans n'importe quel ordre)
+        now: Heure de référence des champs calculés (l'ETag change chaque heure)
+
+    Returns:
+        ETag W/"version-AAAAMMJJHH-empreinte"
+    """
+    query = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+    digest = hashlib.blake2b(
+        f"{request.url.path}?{query}".encode(), digest_size=8
+    ).hexdigest()
+    return f'W/"{data_version:x}-{now:%Y%m%d%H}-{digest}"'
+
+
+async def list_validators(
+    versions: TenderVersionMap, request: Request, now: datetime
+) -> dict[str, str]:
+    """
+    En-têtes de validation d'une liste.
+
+    Best-effort : si la version des données est illisible, la réponse part
+    sans ETag (jamais de 304) au lieu d'échouer.
+
+    Args:
+        versions: Table des versions
+        request: Requête
+        now: Heure de référence des champs calculés
+
+    Returns:
+        En-têtes ETag et Cache-Control, ou dict vide
+    """
+    try:
+        data_version = await versions.data_version()
+    except Exception as e:
+        logger.warning("Failed to read ted_tenders version", error=str(e))
+        return {}
+    return validator_headers(list_etag(data_version, request, now))
+
+
+def validator_headers(etag: str, last_modified: datetime | None = None) -> dict[str, str]:
+    """
+    En-têtes ETag, Last-Modified et Cache-Control.
+
+    Cache-Control: no-cache autorise la mise en cache, avec revalidation
+    (requête conditionnelle) à chaque utilisation.
+    """
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(_utc(last_modified), usegmt=True)
+    return headers
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Comparaison faible (RFC 9110) d'un en-tête If-None-Match avec un ETag."""
+    if if_none_match.strip() == "*":
+        return True
+    target = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == target for tag in if_none_match.split(","))
+
+
+def is_not_modified(request: Request, headers: dict[str, str]) -> bool:
+    """
+    Indique si le client a déjà la représentation courante.
+
+    If-None-Match est prioritaire ; If-Modified-Since n'est évalué qu'en son
+    absence (précision de la seconde, comme l'en-tête).
+
+    Args:
+        request: Requête
+        headers: En-têtes de validation de la réponse (voir validator_headers)
+    """
+    etag = headers.get("ETag")
+    if etag is None:
+        return False
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag_matches(if_none_match, etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    last_modified = headers.get("Last-Modified")
+    if not if_modified_since or last_modified is None:
+        return False
+    try:
+        since = _utc(parsedate_to_datetime(if_modified_since))
+    except (TypeError, ValueError):
+        return False
+    return parsedate_to_datetime(last_modified) <= since
+
+
+def not_modified(headers: dict[str, str]) -> Response:
+    """Réponse 304 sans corps, avec les en-têtes de validation."""
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
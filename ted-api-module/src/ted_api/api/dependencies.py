@@ -5,6 +5,8 @@ Fournit les singletons pour:
 - Settings
 - Cache backend
 - Database
+- Index des deadlines (GET /api/tenders/expiring)
+- Versions des notices (ETag)
 - TED API Client
 - Scheduler
 """
@@ -13,16 +15,21 @@ from typing import AsyncGenerator
 
 import structlog
 
+from ted_api.api.conditional import TenderVersionMap
 from ted_api.cache import CacheBackend, get_cache_backend_async
 from ted_api.client import TEDAPIClient
 from ted_api.config import Settings, get_settings
 from ted_api.database import TenderDatabase
+from ted_api.deadlines import DeadlineBucketIndex
+from ted_api.sync import cancel_sync_jobs
 
 logger = structlog.get_logger(__name__)
 
 # Singletons (initialisés au démarrage)
 _cache: CacheBackend | None = None
 _database: TenderDatabase | None = None
+_deadline_index: DeadlineBucketIndex | None = None
+_tender_versions: TenderVersionMap | None = None
 _client: TEDAPIClient | None = None
 
 
@@ -33,7 +40,7 @@ async def init_dependencies(settings: Settings | None = None) -> None:
     Args:
         settings: Configuration (optionnel, utilise get_settings() sinon)
     """
-    global _cache, _database, _client
+    global _cache, _database, _deadline_index, _tender_versions, _client
 
     if settings is None:
         settings = get_settings()
@@ -45,10 +52,27 @@ async def init_dependencies(settings: Settings | None = None) -> None:
     logger.info("Cache initialized", type=type(_cache).__name__)
 
     # Database
-    _database = TenderDatabase(settings.async_database_url)
+    _database = TenderDatabase(
+        settings.async_database_url,
+        engine_options=settings.database_engine_options,
+        replica_url=settings.async_database_replica_url,
+        replica_max_lag=settings.db_replica_max_lag,
+        replica_check_interval=settings.db_replica_check_interval,
+    )
     await _database.init_schema()
+    _database.enable_pool_metrics()
     logger.info("Database initialized", url=settings.database_url)
 
+    # Index des deadlines (construit à la première requête)
+    _deadline_index = DeadlineBucketIndex(
+        _database,
+        check_interval=settings.tenders_version_check_interval,
+        max_age=settings.expiring_index_max_age,
+    )
+    _tender_versions = TenderVersionMap(
+        _database, check_interval=settings.tenders_version_check_interval
+    )
+
     # TED API Client
     _client = TEDAPIClient(settings, _cache)
     logger.info("TED API client initialized")
@@ -56,14 +80,20 @@ async def init_dependencies(settings: Settings | None = None) -> None:
 
 async def shutdown_dependencies() -> None:
     """Ferme proprement toutes les dépendances."""
-    global _cache, _database, _client
+    global _cache, _database, _deadline_index, _tender_versions, _client
 
     logger.info("Shutting down dependencies...")
 
+    # Les synchronisations en tâche de fond utilisent le client et la base
+    await cancel_sync_jobs()
+
     if _client is not None:
         await _client.close()
         _client = None
 
+    _deadline_index = None
+    _tender_versions = None
+
     if _database is not None:
         await _database.close()
         _database = None
@@ -94,6 +124,20 @@ async def get_database() -> TenderDatabase:
     return _database
 
 
+async def get_deadline_index() -> DeadlineBucketIndex:
+    """Dépendance pour l'index des deadlines."""
+    if _deadline_index is None:
+        raise RuntimeError("Deadline index not initialized. Call init_dependencies() first.")
+    return _deadline_index
+
+
+async def get_tender_versions() -> TenderVersionMap:
+    """Dépendance pour la table des versions des notices (ETag)."""
+    if _tender_versions is None:
+        raise RuntimeError("Tender versions not initialized. Call init_dependencies() first.")
+    return _tender_versions
+
+
 async def get_ted_client() -> TEDAPIClient:
     """Dépendance pour le client TED API."""
     if _client is None:
@@ -0,0 +1,104 @@
+"""
+Réponses JSON optimisées pour les endpoints de lecture.
+
+Les routes retournent directement une TenderJSONResponse construite à partir
+des modèles déjà validés: FastAPI ne re-valide pas le response_model.
+Les modèles Pydantic sont sérialisés en bytes par pydantic-core (Rust),
+le reste par orjson.
+"""
+
+import csv
+import io
+from datetime import datetime
+from functools import lru_cache
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter
+
+from ted_api.models import DERIVED_TENDER_FIELDS, Tender, reference_time
+
+
+@lru_cache(maxsize=32)
+def _list_adapter(model: type[BaseModel]) -> TypeAdapter[list[Any]]:
+    """TypeAdapter list[model] (construction coûteuse, mis en cache)."""
+    return TypeAdapter(list[model])  # type: ignore[valid-type]
+
+
+class TenderJSONResponse(JSONResponse):
+    """
+    Réponse JSON sans re-validation du response_model.
+
+    Les champs calculés des Tender partagent une heure de référence unique
+    pour toute la réponse.
+    """
+
+    def __init__(
+        self,
+        content: Any,
+        status_code: int = 200,
+        headers: dict[str, str] | None = None,
+        reference: datetime | None = None,
+    ) -> None:
+        """
+        Initialise la réponse.
+
+        Args:
+            content: Modèle, liste de modèles ou données natives
+            status_code: Code HTTP
+            headers: En-têtes additionnels
+            reference: Heure de référence des champs calculés (défaut: now)
+        """
+        # Doit être défini avant super().__init__, qui appelle render()
+        self._reference = reference
+        super().__init__(content, status_code=status_code, headers=headers)
+
+    def render(self, content: Any) -> bytes:
+        """Sérialise le contenu en JSON."""
+        with reference_time(self._reference):
+            if isinstance(content, BaseModel):
+                return content.__pydantic_serializer__.to_json(content)
+            if (
+                isinstance(content, list)
+                and content
+                and isinstance(content[0], BaseModel)
+            ):
+                return _list_adapter(type(content[0])).dump_json(content)
+            return orjson.dumps(
+                content,
+                option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS,
+            )
+
+
+# Colonnes de l'export CSV: champs stockés puis champs dérivés
+EXPORT_COLUMNS: list[str] = [*Tender.model_fields, *DERIVED_TENDER_FIELDS]
+
+
+def encode_ndjson(tenders: list[Tender]) -> bytes:
+    """Encode un lot de Tender en NDJSON (un objet JSON par ligne)."""
+    return b"".join(
+        tender.__pydantic_serializer__.to_json(tender) + b"\n" for tender in tenders
+    )
+
+
+def encode_csv(tenders: list[Tender], header: bool = False) -> bytes:
+    """
+    Encode un lot de Tender en CSV.
+
+    Args:
+        tenders: Lot de Tender
+        header: Inclure la ligne d'en-tête
+
+    Returns:
+        Lignes CSV encodées en UTF-8 (codes CPV séparés par ";")
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(EXPORT_COLUMNS)
+    for tender in tenders:
+        data = tender.model_dump(mode="json")
+        data["cpv_codes"] = ";".join(data["cpv_codes"])
+        writer.writerow([data[column] for column in EXPORT_COLUMNS])
+    return buffer.getvalue().encode("utf-8")
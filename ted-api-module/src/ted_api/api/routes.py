@@ -3,37 +3,76 @@ Routes API REST pour les appels d'offres TED.
 
 Endpoints:
 - GET /api/tenders - Liste des appels d'offres avec filtres
+- GET /api/tenders/search - Recherche unifiée TED, BOAMP et PLACE
+- GET /api/tenders/export - Export complet en NDJSON ou CSV (streaming)
+- GET /api/tenders/archive - Appels d'offres archivés (requêtes historiques)
+- GET /api/tenders/archive/{notice_id} - Détails d'un appel d'offres archivé
 - GET /api/tenders/{notice_id} - Détails d'un appel d'offres
+- GET /api/tenders/{notice_id}/duplicates - Doublons détectés dans les autres sources
 - POST /api/tenders/sync - Déclenche une synchronisation manuelle
+- GET /api/tenders/sync/history - Historique des synchronisations
 - GET /api/tenders/stats - Statistiques
+
+Le détail d'une notice et les listes TED portent un ETag (voir
+ted_api.api.conditional) et répondent 304 aux requêtes conditionnelles.
 """
 
-from datetime import datetime
-from typing import Any
+from collections.abc import AsyncIterator
+from datetime import UTC, date, datetime
+from typing import Any, Literal
 
 import structlog
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-
-from ted_api.api.dependencies import get_database, get_ted_client
-from ted_api.client import TEDAPIClient, TEDAPIError
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+
+from ted_api.api.conditional import (
+    TenderVersionMap,
+    is_not_modified,
+    list_validators,
+    not_modified,
+    tender_etag,
+    validator_headers,
+)
+from ted_api.api.dependencies import (
+    get_database,
+    get_deadline_index,
+    get_settings_dep,
+    get_ted_client,
+    get_tender_versions,
+)
+from ted_api.api.responses import (
+    TenderJSONResponse,
+    encode_csv,
+    encode_ndjson,
+)
+from ted_api.client import TEDAPIClient
+from ted_api.config import Settings
 from ted_api.database import TenderDatabase
-from ted_api.models import PaginatedResponse, SyncStatus, Tender, TenderFilter
+from ted_api.deadlines import MAX_EXPIRING_DAYS, DeadlineBucketIndex
+from ted_api.models import (
+    TENDER_SOURCES,
+    PaginatedResponse,
+    SearchFilter,
+    SearchTender,
+    SyncRun,
+    SyncStatus,
+    Tender,
+    TenderDuplicate,
+    TenderFilter,
+    TenderSource,
+    reference_time,
+)
+from ted_api.sync import SyncAlreadyRunningError, start_sync_job
 
 logger = structlog.get_logger(__name__)
 
 router = APIRouter(prefix="/api", tags=["tenders"])
 
-# État de la synchronisation
-_sync_status = SyncStatus()
+# Lignes lues par lot (curseur serveur) lors d'un export
+EXPORT_BATCH_SIZE = 1000
 
 
-@router.get(
-    "/tenders",
-    response_model=PaginatedResponse[Tender],
-    summary="Liste des appels d'offres",
-    description="Récupère les appels d'offres avec filtres optionnels et pagination.",
-)
-async def get_tenders(
+def tender_filters(
     country: str | None = Query(
         "FRA",
         description="Code pays ISO (ex: FRA, DEU). Null pour tous les pays.",
@@ -62,15 +101,19 @@ async def get_tenders(
         min_length=2,
         description="Recherche full-text dans titre et description",
     ),
-    page: int = Query(1, ge=1, description="Numéro de page"),
-    limit: int = Query(20, ge=1, le=100, description="Résultats par page"),
-    db: TenderDatabase = Depends(get_database),
-) -> PaginatedResponse[Tender]:
+    published_from: date | None = Query(
+        None,
+        description="Première date de publication (YYYY-MM-DD, incluse)",
+    ),
+    published_to: date | None = Query(
+        None,
+        description="Dernière date de publication (YYYY-MM-DD, incluse)",
+    ),
+) -> TenderFilter:
     """
-    Liste les appels d'offres avec filtres optionnels.
+    Dépendance construisant un TenderFilter depuis les paramètres de requête.
 
-    Tous les filtres sont cumulatifs (AND).
-    Les résultats sont triés par date de publication (récent en premier).
+    Partagée par la liste paginée et l'export.
     """
     # Valider min/max value
     if min_value is not None and max_value is not None:
@@ -80,20 +123,55 @@ async def get_tenders(
                 detail="min_value ne peut pas être supérieur à max_value",
             )
 
-    filters = TenderFilter(
+    return TenderFilter(
         country=country,
         cpv=cpv,
         min_value=min_value,
         max_value=max_value,
         days_remaining=days_remaining,
         search_text=search,
+        published_from=published_from,
+        published_to=published_to,
     )
 
+
+@router.get(
+    "/tenders",
+    response_model=PaginatedResponse[Tender],
+    response_class=TenderJSONResponse,
+    summary="Liste des appels d'offres",
+    description="Récupère les appels d'offres avec filtres optionnels et pagination.",
+)
+async def get_tenders(
+    request: Request,
+    filters: TenderFilter = Depends(tender_filters),
+    page: int = Query(1, ge=1, description="Numéro de page"),
+    limit: int = Query(20, ge=1, le=100, description="Résultats par page"),
+    db: TenderDatabase = Depends(get_database),
+    versions: TenderVersionMap = Depends(get_tender_versions),
+) -> Response:
+    """
+    Liste les appels d'offres avec filtres optionnels.
+
+    Tous les filtres sont cumulatifs (AND).
+    Les résultats sont triés par date de publication (récent en premier).
+    ETag faible : 304 tant que ted_tenders n'a pas changé (dans l'heure).
+    """
     logger.info("Fetching tenders", filters=filters.model_dump(), page=page, limit=limit)
 
+    # Heure de référence capturée une fois: champs dérivés calculés en SQL
+    now = datetime.now()
+    headers = await list_validators(versions, request, now)
+    if is_not_modified(request, headers):
+        return not_modified(headers)
+
     try:
-        result = await db.get_tenders(filters=filters, page=page, limit=limit)
-        return result
+        result = await db.get_tenders(
+            filters=filters,
+            page=page,
+            limit=limit,
+            reference_time=now,
+        )
     except Exception as e:
         logger.error("Database error", error=str(e))
         raise HTTPException(
@@ -101,6 +179,8 @@ async def get_tenders(
             detail="Erreur de base de données",
         ) from e
 
+    return TenderJSONResponse(result, headers=headers, reference=now)
+
 
 @router.get(
     "/tenders/stats",
@@ -126,26 +206,98 @@ async def get_stats(
         ) from e
 
 
+@router.get(
+    "/tenders/search",
+    response_model=PaginatedResponse[SearchTender],
+    response_class=TenderJSONResponse,
+    summary="Recherche toutes sources",
+    description=(
+        "Recherche les avis TED, BOAMP et PLACE en une seule requête, "
+        "triés par date de publication."
+    ),
+)
+async def search_tenders(
+    source: list[TenderSource] | None = Query(
+        None,
+        description="Sources à interroger (répétable). Défaut: toutes.",
+    ),
+    cpv: str | None = Query(None, description="Code CPV (ex: 30000000)"),
+    days_remaining: int | None = Query(
+        None,
+        ge=0,
+        description="Nombre minimum de jours restants avant deadline",
+    ),
+    search: str | None = Query(
+        None,
+        min_length=2,
+        description="Recherche dans titre et description",
+    ),
+    dedupe: bool = Query(
+        True,
+        description="Masquer les avis BOAMP ayant un doublon TED détecté",
+    ),
+    page: int = Query(1, ge=1, description="Numéro de page"),
+    limit: int = Query(20, ge=1, le=100, description="Résultats par page"),
+    db: TenderDatabase = Depends(get_database),
+) -> TenderJSONResponse:
+    """
+    Recherche unifiée sur la vue tender_search.
+
+    Remplace l'interrogation de chaque source puis la fusion côté client.
+    """
+    filters = SearchFilter(
+        sources=source or list(TENDER_SOURCES),
+        cpv=cpv,
+        days_remaining=days_remaining,
+        search_text=search,
+        dedupe=dedupe,
+    )
+    logger.info("Searching tenders", filters=filters.model_dump(), page=page, limit=limit)
+
+    try:
+        result = await db.search_tenders(filters=filters, page=page, limit=limit)
+    except Exception as e:
+        logger.error("Database error", error=str(e))
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Erreur de base de données",
+        ) from e
+
+    return TenderJSONResponse(result)
+
+
 @router.get(
     "/tenders/expiring",
     response_model=list[Tender],
+    response_class=TenderJSONResponse,
     summary="Appels d'offres expirant bientôt",
 )
 async def get_expiring_tenders(
-    days: int = Query(7, ge=1, le=30, description="Nombre de jours"),
-    db: TenderDatabase = Depends(get_database),
-) -> list[Tender]:
+    request: Request,
+    days: int = Query(7, ge=1, le=MAX_EXPIRING_DAYS, description="Nombre de jours"),
+    index: DeadlineBucketIndex = Depends(get_deadline_index),
+    versions: TenderVersionMap = Depends(get_tender_versions),
+) -> Response:
     """
     Récupère les appels d'offres dont la deadline approche.
 
+    Servi depuis l'index des deadlines par jour (ted_api.deadlines) : aucune
+    requête tant que ted_tenders n'a pas changé. ETag faible comme /tenders.
+
     Args:
         days: Nombre de jours avant expiration (défaut: 7)
 
     Returns:
         Liste des Tender expirant dans les N prochains jours
     """
+    # Naive UTC : jours de l'index et champs calculés indépendants du fuseau de l'hôte
+    now = datetime.now(UTC).replace(tzinfo=None)
+    headers = await list_validators(versions, request, now)
+    if is_not_modified(request, headers):
+        return not_modified(headers)
+
     try:
-        return await db.get_expiring_tenders(days=days)
+        tenders = await index.get(days, now)
     except Exception as e:
         logger.error("Expiring tenders error", error=str(e))
         raise HTTPException(
@@ -153,10 +305,144 @@ async def get_expiring_tenders(
             detail="Erreur lors de la récupération des appels expirants",
         ) from e
 
+    return TenderJSONResponse(tenders, headers=headers, reference=now)
+
+
+@router.get(
+    "/tenders/export",
+    response_class=StreamingResponse,
+    summary="Export des appels d'offres",
+    description=(
+        "Exporte en streaming tous les appels d'offres correspondant aux filtres, "
+        "en NDJSON ou CSV, en une seule requête."
+    ),
+    responses={
+        200: {"content": {"application/x-ndjson": {}, "text/csv": {}}},
+    },
+)
+async def export_tenders(
+    export_format: Literal["ndjson", "csv"] = Query(
+        "ndjson",
+        alias="format",
+        description="Format d'export (ndjson ou csv)",
+    ),
+    filters: TenderFilter = Depends(tender_filters),
+    db: TenderDatabase = Depends(get_database),
+) -> StreamingResponse:
+    """
+    Exporte les appels d'offres filtrés sans pagination.
+
+    Les lignes sont lues par lots sur un curseur serveur et écrites au fil
+    de l'eau: la mémoire reste constante quelle que soit la taille de l'export.
+    """
+    now = datetime.now()
+    logger.info("Exporting tenders", filters=filters.model_dump(), format=export_format)
+
+    async def body() -> AsyncIterator[bytes]:
+        exported = 0
+        if export_format == "csv":
+            yield encode_csv([], header=True)
+        try:
+            async for batch in db.iter_tenders(
+                filters,
+                batch_size=EXPORT_BATCH_SIZE,
+                reference_time=now,
+            ):
+                with reference_time(now):
+                    if export_format == "csv":
+                        yield encode_csv(batch)
+                    else:
+                        yield encode_ndjson(batch)
+                exported += len(batch)
+        except Exception as e:
+            # Les en-têtes sont déjà envoyés: on ne peut que tronquer le flux
+            logger.error("Export failed", error=str(e), exported=exported)
+            raise
+        logger.info("Export completed", exported=exported, format=export_format)
+
+    media_type = "text/csv" if export_format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        body(),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="ted_tenders.{export_format}"',
+        },
+    )
+
+
+@router.get(
+    "/tenders/archive",
+    response_model=PaginatedResponse[Tender],
+    response_class=TenderJSONResponse,
+    summary="Appels d'offres archivés",
+    description="Requêtes historiques sur les appels d'offres expirés archivés.",
+)
+async def get_archived_tenders(
+    request: Request,
+    filters: TenderFilter = Depends(tender_filters),
+    page: int = Query(1, ge=1, description="Numéro de page"),
+    limit: int = Query(20, ge=1, le=100, description="Résultats par page"),
+    db: TenderDatabase = Depends(get_database),
+    versions: TenderVersionMap = Depends(get_tender_versions),
+) -> Response:
+    """
+    Liste les appels d'offres archivés (ted_tenders_archive).
+
+    Mêmes filtres que /api/tenders ; utiliser published_from et
+    published_to pour borner la période étudiée. ETag faible comme /tenders
+    (l'archivage avance la version des données).
+    """
+    now = datetime.now()
+    headers = await list_validators(versions, request, now)
+    if is_not_modified(request, headers):
+        return not_modified(headers)
+
+    try:
+        result = await db.get_archived_tenders(filters=filters, page=page, limit=limit)
+    except Exception as e:
+        logger.error("Archive query error", error=str(e))
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Erreur de base de données",
+        ) from e
+
+    return TenderJSONResponse(result, headers=headers, reference=now)
+
+
+@router.get(
+    "/tenders/archive/{notice_id}",
+    response_model=Tender,
+    response_class=TenderJSONResponse,
+    summary="Détails d'un appel d'offres archivé",
+    responses={
+        404: {"description": "Appel d'offres non archivé"},
+    },
+)
+async def get_archived_tender(
+    notice_id: str,
+    db: TenderDatabase = Depends(get_database),
+) -> TenderJSONResponse:
+    """
+    Récupère un appel d'offres archivé par son ID.
+
+    Raises:
+        404: Si l'appel d'offres n'est pas dans l'archive
+    """
+    tender = await db.get_archived_tender(notice_id)
+
+    if tender is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Appel d'offres '{notice_id}' non archivé",
+        )
+
+    return TenderJSONResponse(tender)
+
 
 @router.get(
     "/tenders/{notice_id}",
     response_model=Tender,
+    response_class=TenderJSONResponse,
     summary="Détails d'un appel d'offres",
     responses={
         404: {"description": "Appel d'offres non trouvé"},
@@ -164,144 +450,271 @@ async def get_expiring_tenders(
 )
 async def get_tender(
     notice_id: str,
+    request: Request,
     db: TenderDatabase = Depends(get_database),
-) -> Tender:
+    versions: TenderVersionMap = Depends(get_tender_versions),
+) -> Response:
     """
     Récupère les détails d'un appel d'offres par son ID.
 
+    ETag (updated_at) et Last-Modified : If-None-Match / If-Modified-Since
+    sont évalués sur la table des versions, avant toute lecture de la ligne.
+
     Args:
         notice_id: Identifiant de la notice TED (ex: "123456-2024")
 
     Returns:
-        Détails complets du Tender
+        Détails complets du Tender, ou 304 si le client a la version courante
 
     Raises:
         404: Si l'appel d'offres n'est pas trouvé
     """
-    tender = await db.get_tender_by_id(notice_id)
+    try:
+        updated_at = await versions.updated_at(notice_id)
+    except Exception as e:
+        logger.warning("Failed to read tender version", notice_id=notice_id, error=str(e))
+        updated_at = None
+    if updated_at is not None:
+        headers = validator_headers(tender_etag(updated_at), updated_at)
+        if is_not_modified(request, headers):
+            return not_modified(headers)
 
-    if tender is None:
+    # ETag de la réponse lu dans la même ligne que le corps (réplica éventuel)
+    row = await db.get_tender_with_version(notice_id)
+
+    if row is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Appel d'offres '{notice_id}' non trouvé",
         )
 
-    return tender
+    tender, updated_at = row
+    headers = validator_headers(tender_etag(updated_at), updated_at)
+    if is_not_modified(request, headers):
+        return not_modified(headers)
+    return TenderJSONResponse(tender, headers=headers)
+
+
+@router.get(
+    "/tenders/{notice_id}/duplicates",
+    response_model=list[TenderDuplicate],
+    response_class=TenderJSONResponse,
+    summary="Doublons d'un avis dans les autres sources",
+)
+async def get_tender_duplicates(
+    notice_id: str,
+    source: TenderSource = Query("TED", description="Source de l'avis (TED, BOAMP)"),
+    db: TenderDatabase = Depends(get_database),
+) -> TenderJSONResponse:
+    """
+    Récupère les doublons détectés d'un avis (ex: avis BOAMP publié au JOUE).
+
+    Args:
+        notice_id: Identifiant de l'avis dans sa source
+        source: Source de l'avis (défaut: TED)
+
+    Returns:
+        Doublons triés par similarité décroissante (liste vide si aucun)
+    """
+    try:
+        duplicates = await db.get_duplicates(source, notice_id)
+    except Exception as e:
+        logger.error("Duplicates lookup error", error=str(e))
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Erreur de base de données",
+        ) from e
+
+    return TenderJSONResponse(duplicates)
 
 
 @router.post(
     "/tenders/sync",
-    response_model=SyncStatus,
+    response_model=SyncRun,
+    status_code=status.HTTP_202_ACCEPTED,
     summary="Déclencher une synchronisation",
-    description="Lance une synchronisation manuelle avec l'API TED.",
+    description=(
+        "Lance une synchronisation manuelle en tâche de fond et retourne "
+        "l'exécution créée. La progression est consultable via "
+        "/tenders/sync/history/{run_id}."
+    ),
 )
 async def trigger_sync(
+    response: Response,
     country: str = Query("FRA", description="Code pays à synchroniser"),
     db: TenderDatabase = Depends(get_database),
     client: TEDAPIClient = Depends(get_ted_client),
-) -> SyncStatus:
+) -> SyncRun:
     """
     Déclenche une synchronisation manuelle des appels d'offres.
 
-    Cette opération peut prendre plusieurs secondes selon le nombre
-    d'appels d'offres à récupérer.
+    La synchronisation s'exécute en tâche de fond ; un verrou PostgreSQL
+    garantit une seule synchronisation par pays, tous workers confondus.
 
     Args:
         country: Code pays ISO à synchroniser (défaut: FRA)
 
     Returns:
-        Statut de la synchronisation
+        Exécution créée (statut running)
     """
-    global _sync_status
-
-    if _sync_status.status == "running":
+    try:
+        run_id = await start_sync_job(client, db, country, trigger="manual")
+        run = await db.get_sync_run(run_id)
+    except SyncAlreadyRunningError as e:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
-            detail="Une synchronisation est déjà en cours",
-        )
-
-    _sync_status = SyncStatus(status="running")
-
-    try:
-        logger.info("Starting manual sync", country=country)
-
-        # Récupérer les appels d'offres actifs
-        tenders = await client.get_active_tenders(country=country)
-
-        # Sauvegarder en base
-        inserted, updated = await db.upsert_tenders(tenders)
+            detail=f"Une synchronisation est déjà en cours pour {country}",
+        ) from e
+    except Exception as e:
+        logger.error("Sync start failed", error=str(e))
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erreur lors du lancement de la synchronisation: {e}",
+        ) from e
 
-        _sync_status = SyncStatus(
-            last_sync=datetime.now(),
-            total_synced=len(tenders),
-            new_notices=inserted,
-            status="completed",
+    logger.info("Manual sync started", country=country, run_id=run_id)
+    response.headers["Location"] = f"{router.prefix}/tenders/sync/history/{run_id}"
+    if run is None:
+        # Ligne purgée entre sa création et la lecture : la tâche tourne
+        return SyncRun(
+            id=run_id,
+            country=country,
+            trigger="manual",
+            status="running",
+            started_at=datetime.now(UTC),
         )
+    return run
 
-        logger.info(
-            "Manual sync completed",
-            total=len(tenders),
-            inserted=inserted,
-            updated=updated,
-        )
 
-        return _sync_status
+@router.get(
+    "/tenders/sync/status",
+    response_model=SyncStatus,
+    summary="Statut de synchronisation",
+)
+async def get_sync_status(
+    db: TenderDatabase = Depends(get_database),
+) -> SyncStatus:
+    """
+    Récupère le statut de la dernière synchronisation (table sync_runs).
 
-    except TEDAPIError as e:
-        _sync_status = SyncStatus(
-            status="error",
-            error_message=str(e),
-        )
-        logger.error("Sync failed", error=str(e))
+    Returns:
+        Statut de synchronisation (dernière date, nombre de notices, erreurs)
+    """
+    try:
+        runs = await db.list_sync_runs(page=1, limit=1)
+    except Exception as e:
+        logger.error("Sync status error", error=str(e))
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail=f"Erreur API TED: {e}",
+            detail="Erreur lors de la récupération du statut",
         ) from e
 
+    if not runs.items:
+        return SyncStatus()
+
+    run = runs.items[0]
+    return SyncStatus(
+        last_sync=run.finished_at or run.started_at,
+        total_synced=run.fetched,
+        new_notices=run.inserted,
+        status=run.status,
+        error_message=run.error_message,
+        report=run.to_report(),
+    )
+
+
+@router.get(
+    "/tenders/sync/history",
+    response_model=PaginatedResponse[SyncRun],
+    summary="Historique des synchronisations",
+)
+async def get_sync_history(
+    country: str | None = Query(None, description="Filtrer par pays"),
+    page: int = Query(1, ge=1, description="Numéro de page"),
+    limit: int = Query(20, ge=1, le=100, description="Résultats par page"),
+    db: TenderDatabase = Depends(get_database),
+) -> PaginatedResponse[SyncRun]:
+    """
+    Liste les synchronisations passées, de la plus récente à la plus ancienne.
+
+    Chaque exécution porte ses compteurs, ses durées par phase et son débit,
+    pour suivre l'évolution des performances dans le temps.
+
+    Returns:
+        Liste paginée des exécutions
+    """
+    try:
+        return await db.list_sync_runs(page=page, limit=limit, country=country)
     except Exception as e:
-        _sync_status = SyncStatus(
-            status="error",
-            error_message=str(e),
-        )
-        logger.error("Sync failed", error=str(e))
+        logger.error("Sync history error", error=str(e))
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Erreur lors de la synchronisation: {e}",
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Erreur lors de la récupération de l'historique",
         ) from e
 
 
 @router.get(
-    "/tenders/sync/status",
-    response_model=SyncStatus,
-    summary="Statut de synchronisation",
+    "/tenders/sync/history/{run_id}",
+    response_model=SyncRun,
+    summary="Détail d'une synchronisation",
 )
-async def get_sync_status() -> SyncStatus:
+async def get_sync_run(
+    run_id: int,
+    db: TenderDatabase = Depends(get_database),
+) -> SyncRun:
     """
-    Récupère le statut de la dernière synchronisation.
+    Récupère une exécution de synchronisation.
+
+    Args:
+        run_id: Identifiant de l'exécution
 
     Returns:
-        Statut de synchronisation (dernière date, nombre de notices, erreurs)
+        Exécution avec compteurs et durées par phase
     """
-    return _sync_status
+    run = await db.get_sync_run(run_id)
+
+    if run is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Synchronisation {run_id} non trouvée",
+        )
+
+    return run
 
 
 @router.delete(
     "/tenders/expired",
-    summary="Supprimer les appels expirés",
+    summary="Archiver (ou supprimer) les appels expirés",
     response_model=dict[str, int],
 )
 async def delete_expired_tenders(
     db: TenderDatabase = Depends(get_database),
+    settings: Settings = Depends(get_settings_dep),
 ) -> dict[str, int]:
     """
-    Supprime les appels d'offres dont la deadline est passée.
+    Retire de ted_tenders les appels d'offres dont la deadline est passée.
+
+    Par défaut (TED_ARCHIVE_ENABLED), ils sont déplacés dans
+    ted_tenders_archive et restent consultables via /api/tenders/archive ;
+    sinon ils sont supprimés. Si ted_tenders est partitionnée, les
+    partitions entièrement expirées au-delà de la rétention configurée sont
+    retirées en bloc.
 
     Returns:
-        Nombre d'appels supprimés
+        Nombre d'appels retirés (deleted) et, parmi eux, archivés (archived)
     """
     try:
-        deleted = await db.delete_expired_tenders()
-        return {"deleted": deleted}
+        if settings.ted_archive_enabled:
+            archived = await db.archive_expired_tenders(
+                batch_size=settings.ted_archive_batch_size,
+                partition_retention_months=settings.ted_partition_retention_months,
+            )
+            return {"deleted": archived, "archived": archived}
+        deleted = await db.delete_expired_tenders(
+            partition_retention_months=settings.ted_partition_retention_months,
+            detach_partitions=settings.ted_partition_expiry == "detach",
+        )
+        return {"deleted": deleted, "archived": 0}
     except Exception as e:
         logger.error("Delete expired error", error=str(e))
         raise HTTPException(
@@ -338,3 +751,20 @@ async def health_check(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail=f"Service unhealthy: {e}",
         ) from e
+
+
+@router.get(
+    "/health/pool",
+    summary="État du pool de connexions",
+    tags=["system"],
+)
+async def pool_status(
+    db: TenderDatabase = Depends(get_database),
+) -> dict[str, Any]:
+    """
+    Retourne l'utilisation du pool de connexions PostgreSQL du worker.
+
+    Returns:
+        Taille, connexions empruntées, attentes et temps de checkout
+    """
+    return db.pool_status()
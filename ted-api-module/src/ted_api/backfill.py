@@ -0,0 +1,253 @@
+"""
+Backfill historique TED réparti sur plusieurs processus.
+
+Un backfill (scope ALL) est limité par le décodage JSON et la validation
+Pydantic, donc par un seul cœur en asyncio. La période demandée est
+découpée en fenêtres de dates de publication, traitées en parallèle dans
+un ProcessPoolExecutor : chaque processus possède son client TED et son
+pool PostgreSQL, et upsert ses notices page par page.
+
+L'avancement de chaque fenêtre (dernière page upsert, compteurs) est
+enregistré dans backfill_checkpoints : relancer le même backfill ignore
+les fenêtres terminées et reprend les autres à la page suivante.
+"""
+
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from typing import Any
+
+import structlog
+
+from ted_api.client import TEDAPIClient
+from ted_api.config import Settings
+from ted_api.database import TenderDatabase
+from ted_api.dedup import fingerprint_tender, index_duplicates
+from ted_api.models import TED_FIELD_PROFILES, BackfillCheckpoint
+from ted_api.sync import convert_notices
+
+logger = structlog.get_logger(__name__)
+
+# Taille par défaut d'une fenêtre de dates de publication (jours)
+BACKFILL_WINDOW_DAYS = 30
+
+# Connexions par processus : un upsert et un checkpoint à la fois
+WORKER_ENGINE_OPTIONS: dict[str, Any] = {"pool_size": 1, "max_overflow": 1}
+
+
+def date_windows(
+    start: date, end: date, days: int = BACKFILL_WINDOW_DAYS
+) -> list[tuple[date, date]]:
+    """
+    Découpe une période en fenêtres contiguës de `days` jours.
+
+    Args:
+        start: Première date (incluse)
+        end: Dernière date (incluse)
+        days: Taille des fenêtres en jours
+
+    Returns:
+        Liste de (début, fin) inclusifs couvrant la période
+    """
+    if days < 1:
+        raise ValueError("days must be >= 1")
+    windows = []
+    current = start
+    while current <= end:
+        window_end = min(current + timedelta(days=days - 1), end)
+        windows.append((current, window_end))
+        current = window_end + timedelta(days=1)
+    return windows
+
+
+async def backfill_window_with(
+    client: TEDAPIClient,
+    db: TenderDatabase,
+    checkpoint: BackfillCheckpoint,
+) -> BackfillCheckpoint:
+    """
+    Backfill d'une fenêtre à partir de son checkpoint.
+
+    Chaque page est upsert puis le checkpoint est enregistré : une
+    interruption fait au plus rejouer une page (upsert idempotent).
+    En mode page_number, une fenêtre dépassant ted_max_page_window n'est
+    pas tronquée : elle passe en erreur (TEDPageWindowError) avant toute
+    page, à relancer avec des fenêtres plus courtes.
+
+    Args:
+        client: Client API TED
+        db: Base de données
+        checkpoint: Avancement courant de la fenêtre
+
+    Returns:
+        Checkpoint final (completed ou error)
+    """
+    state = checkpoint.model_copy(update={"status": "running", "error_message": None})
+    log = logger.bind(
+        country=state.country,
+        window_start=state.window_start.isoformat(),
+        window_end=state.window_end.isoformat(),
+    )
+    query = client.build_active_query(
+        country=state.country,
+        published_from=state.window_start,
+        published_to=state.window_end,
+    )
+
+    try:
+        await db.save_backfill_checkpoint(state)
+        async for response in client.scan_pages(
+            query,
+            fields=TED_FIELD_PROFILES["listing"],
+            scope="ALL",
+            start_page=state.last_page + 1,
+            start_token=state.iteration_token,
+            truncate=False,
+        ):
+            tenders = convert_notices(response.notices)
+            inserted, updated = await db.upsert_tenders(tenders) if tenders else (0, 0)
+            await index_duplicates(db, "TED", {t.notice_id: fingerprint_tender(t) for t in tenders})
+            state.last_page = response.page
+            state.iteration_token = response.iteration_next_token
+            state.fetched += len(tenders)
+            state.inserted += inserted
+            state.updated += updated
+            await db.save_backfill_checkpoint(state)
+        state.status = "completed"
+    except Exception as e:
+        log.error("Backfill window failed", page=state.last_page + 1, error=str(e))
+        state.status = "error"
+        state.error_message = str(e)
+
+    try:
+        await db.save_backfill_checkpoint(state)
+    except Exception as e:
+        log.error("Failed to save backfill checkpoint", error=str(e))
+
+    log.info(
+        "Backfill window finished",
+        status=state.status,
+        pages=state.last_page,
+        fetched=state.fetched,
+    )
+    return state
+
+
+def backfill_window(
+    settings_data: dict[str, Any],
+    checkpoint: BackfillCheckpoint,
+) -> BackfillCheckpoint:
+    """
+    Point d'entrée d'un processus worker : backfill d'une fenêtre.
+
+    Args:
+        settings_data: Configuration sérialisée (Settings.model_dump())
+        checkpoint: Avancement courant de la fenêtre
+
+    Returns:
+        Checkpoint final
+    """
+    settings = Settings(**settings_data)
+
+    async def run() -> BackfillCheckpoint:
+        # Pas de cache : les pages historiques ne sont lues qu'une fois
+        client = TEDAPIClient(settings, None)
+        db = TenderDatabase(
+            settings.async_database_url,
+            engine_options={**settings.database_engine_options, **WORKER_ENGINE_OPTIONS},
+        )
+        try:
+            return await backfill_window_with(client, db, checkpoint)
+        finally:
+            await client.close()
+            await db.close()
+
+    return asyncio.run(run())
+
+
+async def run_backfill(
+    settings: Settings,
+    start: date,
+    end: date,
+    country: str | None = None,
+    window_days: int = BACKFILL_WINDOW_DAYS,
+    processes: int | None = None,
+) -> list[BackfillCheckpoint]:
+    """
+    Backfill des notices publiées entre deux dates.
+
+    Les fenêtres déjà terminées (backfill_checkpoints) sont ignorées, les
+    autres reprennent après leur dernière page enregistrée.
+
+    Args:
+        settings: Configuration du module
+        start: Première date de publication (incluse)
+        end: Dernière date de publication (incluse)
+        country: Code pays (défaut: settings.ted_default_country)
+        window_days: Taille des fenêtres en jours
+        processes: Nombre de processus (défaut: nombre de cœurs)
+
+    Returns:
+        Checkpoints de toutes les fenêtres de la période
+    """
+    if country is None:
+        country = settings.ted_default_country
+    if processes is None:
+        processes = os.cpu_count() or 1
+
+    db = TenderDatabase(
+        settings.async_database_url,
+        engine_options=settings.database_engine_options,
+    )
+    try:
+        await db.init_schema()
+        existing = {
+            (c.window_start, c.window_end): c
+            for c in await db.get_backfill_checkpoints(country)
+        }
+    finally:
+        await db.close()
+
+    checkpoints = [
+        existing.get(window)
+        or BackfillCheckpoint(country=country, window_start=window[0], window_end=window[1])
+        for window in date_windows(start, end, window_days)
+    ]
+    pending = [c for c in checkpoints if c.status != "completed"]
+
+    logger.info(
+        "Starting backfill",
+        country=country,
+        windows=len(checkpoints),
+        pending=len(pending),
+        processes=processes,
+    )
+
+    results: dict[tuple[date, date], BackfillCheckpoint] = {}
+    if pending:
+        settings_data = settings.model_dump()
+        loop = asyncio.get_running_loop()
+        # spawn : pas de fork d'un processus portant une boucle asyncio
+        with ProcessPoolExecutor(
+            max_workers=min(processes, len(pending)),
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as pool:
+            done = await asyncio.gather(
+                *(
+                    loop.run_in_executor(pool, backfill_window, settings_data, checkpoint)
+                    for checkpoint in pending
+                )
+            )
+        results = {(c.window_start, c.window_end): c for c in done}
+
+    final = [results.get((c.window_start, c.window_end), c) for c in checkpoints]
+    logger.info(
+        "Backfill finished",
+        country=country,
+        completed=sum(c.status == "completed" for c in final),
+        errors=sum(c.status == "error" for c in final),
+        fetched=sum(c.fetched for c in final),
+    )
+    return final
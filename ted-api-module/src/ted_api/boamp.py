@@ -0,0 +1,454 @@
+"""
+Ingestion BOAMP via l'export Opendatasoft Explore v2.1.
+
+L'endpoint /catalog/datasets/boamp/exports/csv n'est pas paginé : tout le
+dataset (ou le sous-ensemble filtré par `where`) arrive en un seul
+téléchargement, au lieu de milliers d'appels /records limités à 100
+enregistrements. Le CSV est décodé au fil de l'eau (un champ entre
+guillemets peut s'étendre sur plusieurs lignes, notamment `donnees`).
+
+Comme la synchronisation TED, un producteur convertit les enregistrements
+en lots et un consommateur les écrit dans tender_cache par COPY
+(TenderDatabase.upsert_tender_cache), via une asyncio.Queue bornée.
+"""
+
+import asyncio
+import csv
+import json
+import re
+import time
+from collections.abc import AsyncGenerator, AsyncIterable
+from datetime import UTC, datetime
+from typing import Any
+
+import httpx
+import structlog
+
+from ted_api.config import Settings
+from ted_api.database import TenderDatabase
+from ted_api.dedup import fingerprint_boamp, index_duplicates
+from ted_api.models import BoampTender
+
+logger = structlog.get_logger(__name__)
+
+# Champs exportés (mêmes champs que la récupération paginée de veille-boamp)
+BOAMP_EXPORT_FIELDS: tuple[str, ...] = (
+    "idweb",
+    "objet",
+    "nomacheteur",
+    "datelimitereponse",
+    "datefindiffusion",
+    "dateparution",
+    "donnees",
+    "procedure_libelle",
+    "nature_libelle",
+    "famille_libelle",
+    "code_departement",
+    "url_avis",
+    "type_marche",
+    "perimetre",
+)
+
+# Séparateurs de l'export : champs, puis valeurs des champs multivalués
+BOAMP_CSV_DELIMITER = ";"
+BOAMP_LIST_SEPARATOR = "|"
+
+# Avis par COPY dans tender_cache
+BOAMP_BATCH_SIZE = 1000
+
+# Lots convertis en attente d'écriture (backpressure sur le téléchargement)
+BOAMP_QUEUE_SIZE = 2
+
+_CPV_PATTERN = re.compile(r"^(\d{8})")
+
+
+class BoampExportError(Exception):
+    """Erreur lors de l'export du dataset BOAMP."""
+
+    def __init__(self, message: str, status_code: int | None = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+async def iter_csv_lines(chunks: AsyncIterable[str]) -> AsyncGenerator[str, None]:
+    """
+    Découpe un flux texte en lignes sur "\\n" uniquement.
+
+    Contrairement à str.splitlines, les séparateurs Unicode présents dans
+    les champs (JSON de `donnees`) ne coupent pas la ligne.
+
+    Args:
+        chunks: Blocs de texte successifs
+
+    Yields:
+        Lignes sans le "\\n" final
+    """
+    buffer = ""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            yield line
+    if buffer:
+        yield buffer
+
+
+async def iter_csv_records(
+    lines: AsyncIterable[str],
+    delimiter: str = BOAMP_CSV_DELIMITER,
+) -> AsyncGenerator[dict[str, str], None]:
+    """
+    Décode un CSV ligne à ligne, la première ligne donnant les colonnes.
+
+    Un enregistrement est complet quand le nombre de guillemets lus est
+    pair (les guillemets échappés "" vont par deux).
+
+    Args:
+        lines: Lignes du CSV
+        delimiter: Séparateur de champs
+
+    Yields:
+        Enregistrements {colonne: valeur}
+    """
+    header: list[str] | None = None
+    pending: list[str] = []
+    quotes = 0
+
+    async for line in lines:
+        pending.append(line)
+        quotes += line.count('"')
+        if quotes % 2:
+            # Champ entre guillemets sur plusieurs lignes
+            continue
+        record = "\n".join(pending)
+        pending, quotes = [], 0
+        if not record.strip():
+            continue
+        row = next(csv.reader([record], delimiter=delimiter))
+        if header is None:
+            header = [name.lstrip("\ufeff") for name in row]
+            continue
+        # Ligne incomplète : colonnes manquantes absentes du dict
+        yield dict(zip(header, row, strict=False))
+
+    if pending:
+        logger.warning("Truncated CSV record ignored", length=sum(map(len, pending)))
+
+
+def _parse_datetime(value: str | None) -> datetime | None:
+    """Parse une date ISO de l'export (date seule ou date-heure), UTC si naïve."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=UTC)
+
+
+def _first(value: str | None) -> str | None:
+    """Première valeur d'un champ multivalué."""
+    if not value:
+        return None
+    return value.split(BOAMP_LIST_SEPARATOR)[0].strip() or None
+
+
+def _text(value: Any) -> str | None:
+    """Valeur textuelle d'un nœud JSON (chaîne ou {"#text": ...})."""
+    if isinstance(value, dict):
+        value = value.get("#text")
+    return None if value is None else str(value)
+
+
+def _match_cpv(value: Any) -> str | None:
+    """Code CPV à 8 chiffres en tête d'une valeur."""
+    match = _CPV_PATTERN.match(_text(value) or "")
+    return match.group(1) if match else None
+
+
+def _extract_cpv(donnees: dict[str, Any]) -> str | None:
+    """CPV principal : ancien format BOAMP, premier lot, puis eForms."""
+    objet = donnees.get("OBJET") or {}
+    cpv = _match_cpv((objet.get("CPV") or {}).get("PRINCIPAL"))
+    if cpv:
+        return cpv
+
+    lots = (objet.get("LOTS") or {}).get("LOT")
+    if isinstance(lots, list) and lots and isinstance(lots[0], dict):
+        cpv = _match_cpv((lots[0].get("CPV") or {}).get("PRINCIPAL"))
+        if cpv:
+            return cpv
+
+    notice = (donnees.get("EFORMS") or {}).get("ContractNotice") or {}
+    lot = notice.get("cac:ProcurementProjectLot") or {}
+    for project in (
+        notice.get("cac:ProcurementProject"),
+        lot.get("cac:ProcurementProject") if isinstance(lot, dict) else None,
+    ):
+        if isinstance(project, dict):
+            classification = project.get("cac:MainCommodityClassification") or {}
+            cpv = _match_cpv(classification.get("cbc:ItemClassificationCode"))
+            if cpv:
+                return cpv
+    return None
+
+
+def _extract_amount_range(donnees: dict[str, Any]) -> str | None:
+    """Fourchette de montant selon les seuils des marchés publics."""
+    amount_text = (
+        _text((donnees.get("OBJET") or {}).get("VALEUR_TOTALE"))
+        or _text((donnees.get("CARACTERISTIQUES") or {}).get("VALEUR_TOTALE_MARCHE"))
+    )
+    if amount_text is None:
+        notice = (donnees.get("EFORMS") or {}).get("ContractNotice") or {}
+        project = notice.get("cac:ProcurementProject") or {}
+        total = project.get("cac:RequestedTenderTotal") or {}
+        amount_text = _text(total.get("cbc:EstimatedOverallContractAmount"))
+    try:
+        amount = float(amount_text) if amount_text else 0.0
+    except ValueError:
+        return None
+    if amount <= 0:
+        return None
+    if amount < 40_000:
+        return "small"
+    if amount < 90_000:
+        return "medium"
+    if amount < 221_000:
+        return "large"
+    return "xlarge"
+
+
+def _market_nature(record: dict[str, str]) -> str | None:
+    """Nature du marché depuis type_marche, sinon nature_libelle."""
+    for value in (_first(record.get("type_marche")), record.get("nature_libelle")):
+        lowered = (value or "").lower()
+        if "fourniture" in lowered:
+            return "fournitures"
+        if "service" in lowered:
+            return "services"
+        if "travaux" in lowered or "travail" in lowered:
+            return "travaux"
+    return None
+
+
+def _truncate(value: str | None, length: int) -> str | None:
+    """Tronque une valeur à la taille de sa colonne."""
+    return value[:length] if value else value
+
+
+def boamp_record_to_tender(record: dict[str, str]) -> BoampTender | None:
+    """
+    Convertit un enregistrement de l'export BOAMP en ligne tender_cache.
+
+    Reprend les règles de mapToTender (veille-boamp/src/lib/boamp.ts).
+
+    Args:
+        record: Enregistrement CSV {champ: valeur}
+
+    Returns:
+        BoampTender, ou None sans identifiant ni date de parution
+    """
+    notice_id = record.get("idweb")
+    publication_date = _parse_datetime(record.get("dateparution"))
+    if not notice_id or publication_date is None:
+        return None
+
+    try:
+        donnees = json.loads(record.get("donnees") or "{}")
+    except ValueError:
+        donnees = {}
+    if not isinstance(donnees, dict):
+        donnees = {}
+
+    deadline = _parse_datetime(record.get("datelimitereponse"))
+    if deadline is None:
+        offers = (donnees.get("CONDITION_DELAI") or {}).get("RECEPT_OFFRES")
+        deadline = _parse_datetime(_text(offers))
+
+    cpv = _extract_cpv(donnees)
+    family = record.get("famille_libelle") or None
+    perimeter = (record.get("perimetre") or "").lower()
+
+    return BoampTender(
+        id=notice_id,
+        title=record.get("objet") or "Sans objet",
+        description=(
+            f"Marché public de {record.get('nature_libelle') or 'nature inconnue'}. "
+            f"Famille: {family or 'Non spécifiée'}."
+        ),
+        buyer_name=_truncate(record.get("nomacheteur") or "Acheteur inconnu", 500),
+        buyer_department=_truncate(_first(record.get("code_departement")), 200),
+        publication_date=publication_date,
+        deadline_date=deadline,
+        procedure_type=_truncate(record.get("procedure_libelle") or "Non spécifié", 100),
+        sectors=[family or "Autre"],
+        boamp_url=(
+            record.get("url_avis")
+            or f'https://www.boamp.fr/pages/avis/?q=idweb:"{notice_id}"'
+        ),
+        cpv=cpv,
+        market_nature=_market_nature(record),
+        amount_range=_extract_amount_range(donnees),
+        is_joue="europ" in perimeter or "EFORMS" in donnees,
+        is_defense_equipment=bool(cpv and cpv.startswith("35")),
+        raw_data={**record, "donnees": donnees},
+        expires_at=_parse_datetime(record.get("datefindiffusion")) or deadline,
+    )
+
+
+class BoampClient:
+    """
+    Client de l'export BOAMP (Opendatasoft Explore v2.1).
+
+    Attributes:
+        settings: Configuration du module
+    """
+
+    def __init__(self, settings: Settings) -> None:
+        """
+        Initialise le client d'export.
+
+        Args:
+            settings: Configuration du module
+        """
+        self.settings = settings
+        self._log = logger.bind(component="BoampClient")
+
+    def export_params(self, where: str | None = None) -> dict[str, str]:
+        """
+        Paramètres de l'export CSV.
+
+        Args:
+            where: Filtre ODSQL (défaut: settings.boamp_export_where)
+
+        Returns:
+            Paramètres de requête
+        """
+        params = {
+            "select": ",".join(BOAMP_EXPORT_FIELDS),
+            "delimiter": BOAMP_CSV_DELIMITER,
+            "list_separator": BOAMP_LIST_SEPARATOR,
+            "with_bom": "false",
+        }
+        where = where or self.settings.boamp_export_where
+        if where:
+            params["where"] = where
+        return params
+
+    async def iter_records(
+        self, where: str | None = None
+    ) -> AsyncGenerator[dict[str, str], None]:
+        """
+        Télécharge l'export en flux et produit ses enregistrements.
+
+        Args:
+            where: Filtre ODSQL (défaut: settings.boamp_export_where)
+
+        Yields:
+            Enregistrements CSV {champ: valeur}
+
+        Raises:
+            BoampExportError: En cas d'erreur HTTP ou réseau
+        """
+        params = self.export_params(where)
+        self._log.info("Starting BOAMP export", url=self.settings.boamp_export_url, where=where)
+        try:
+            async with httpx.AsyncClient(
+                timeout=httpx.Timeout(self.settings.boamp_request_timeout),
+                headers={"User-Agent": "TED-API-Module/1.0"},
+            ) as client:
+                async with client.stream(
+                    "GET", self.settings.boamp_export_url, params=params
+                ) as response:
+                    if response.status_code >= 400:
+                        await response.aread()
+                        raise BoampExportError(
+                            f"BOAMP export error: HTTP {response.status_code}",
+                            status_code=response.status_code,
+                        )
+                    lines = iter_csv_lines(response.aiter_text())
+                    async for record in iter_csv_records(lines):
+                        yield record
+        except httpx.HTTPError as e:
+            raise BoampExportError(f"BOAMP export failed: {e}") from e
+
+
+async def ingest_boamp(
+    client: BoampClient,
+    db: TenderDatabase,
+    where: str | None = None,
+    batch_size: int = BOAMP_BATCH_SIZE,
+) -> dict[str, Any]:
+    """
+    Charge l'export BOAMP dans tender_cache.
+
+    Args:
+        client: Client d'export BOAMP
+        db: Base de données
+        where: Filtre ODSQL (défaut: settings.boamp_export_where)
+        batch_size: Avis par COPY
+
+    Returns:
+        Dict avec records, skipped, inserted, updated et elapsed_seconds
+    """
+    queue: asyncio.Queue[list[BoampTender] | None] = asyncio.Queue(maxsize=BOAMP_QUEUE_SIZE)
+    records = skipped = inserted = updated = 0
+
+    async def produce() -> None:
+        nonlocal records, skipped
+        batch: list[BoampTender] = []
+        try:
+            async for record in client.iter_records(where):
+                records += 1
+                try:
+                    tender = boamp_record_to_tender(record)
+                except Exception as e:
+                    logger.warning(
+                        "Failed to parse BOAMP record", idweb=record.get("idweb"), error=str(e)
+                    )
+                    tender = None
+                if tender is None:
+                    skipped += 1
+                    continue
+                batch.append(tender)
+                if len(batch) >= batch_size:
+                    await queue.put(batch)
+                    batch = []
+        finally:
+            # Sur annulation, le consommateur a déjà échoué : file possiblement pleine
+            task = asyncio.current_task()
+            if task is None or not task.cancelling():
+                # Avis déjà téléchargés écrits même si l'export échoue ensuite
+                if batch:
+                    await queue.put(batch)
+                await queue.put(None)
+
+    async def consume() -> None:
+        nonlocal inserted, updated
+        while (batch := await queue.get()) is not None:
+            ins, upd = await db.upsert_tender_cache(batch)
+            inserted, updated = inserted + ins, updated + upd
+            await index_duplicates(db, "BOAMP", {t.id: fingerprint_boamp(t) for t in batch})
+            logger.debug("BOAMP batch written", records=records, inserted=inserted)
+
+    start = time.perf_counter()
+    producer = asyncio.create_task(produce())
+    try:
+        await consume()
+    except BaseException:
+        producer.cancel()
+        await asyncio.gather(producer, return_exceptions=True)
+        raise
+    # Propage les erreurs du téléchargement (BoampExportError)
+    await producer
+
+    result = {
+        "records": records,
+        "skipped": skipped,
+        "inserted": inserted,
+        "updated": updated,
+        "elapsed_seconds": round(time.perf_counter() - start, 3),
+    }
+    logger.info("BOAMP ingestion completed", **result)
+    return result
@@ -16,6 +16,8 @@ from typing import Any
 
 import structlog
 
+from ted_api.metrics import observe_cache
+
 logger = structlog.get_logger(__name__)
 
 
@@ -89,6 +91,7 @@ class MemoryCache(CacheBackend):
         self._log = logger.bind(component="MemoryCache")
         self._log.info("Memory cache initialized")
 
+    @observe_cache("get")
     async def get(self, key: str) -> Any | None:
         """Récupère une valeur du cache mémoire."""
         async with self._lock:
@@ -104,6 +107,7 @@ class MemoryCache(CacheBackend):
 
             return value
 
+    @observe_cache("set")
     async def set(self, key: str, value: Any, ttl: int) -> None:
         """Stocke une valeur avec TTL."""
         async with self._lock:
@@ -196,6 +200,7 @@ class RedisCache(CacheBackend):
                 raise
         return self._redis
 
+    @observe_cache("get")
     async def get(self, key: str) -> Any | None:
         """Récupère une valeur de Redis."""
         try:
@@ -208,6 +213,7 @@ class RedisCache(CacheBackend):
             self._log.warning("Redis get failed", key=key, error=str(e))
             return None
 
+    @observe_cache("set")
     async def set(self, key: str, value: Any, ttl: int) -> None:
         """Stocke une valeur dans Redis avec TTL."""
         try:
@@ -4,14 +4,22 @@ Client pour l'API TED (Tenders Electronic Daily).
 Gère les requêtes vers l'API TED avec:
 - Retry automatique sur erreurs 429/503
 - Cache des résultats
-- Pagination automatique
+- Pagination automatique, par numéro de page ou par jeton de
+  continuation (paginationMode=ITERATION) pour les parcours complets
+- Découpage des requêtes dépassant la fenêtre de pagination TED
+  (ted_max_page_window) en mode page_number
 - Logging structuré
 """
 
+import asyncio
 import hashlib
 import json
 import logging
-from collections.abc import AsyncGenerator
+import time
+from collections.abc import AsyncGenerator, Iterator, Sequence
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import date, timedelta
 from typing import Any
 
 import httpx
@@ -22,12 +30,15 @@ from tenacity import (
     stop_after_attempt,
     wait_exponential,
     before_sleep_log,
+    RetryCallState,
     RetryError,
 )
 
 from ted_api.config import Settings
+from ted_api.metrics import TED_RATE_LIMITED, TED_REQUEST_LATENCY, TED_REQUEST_RETRIES
 from ted_api.models import (
     DEFAULT_TED_FIELDS,
+    TED_FIELD_PROFILES,
     TEDAPIResponse,
     Tender,
     ted_notice_to_tender,
@@ -35,6 +46,61 @@ from ted_api.models import (
 
 logger = structlog.get_logger(__name__)
 
+_log_before_sleep = before_sleep_log(logger, logging.INFO)
+
+# Divisions CPV 2008 (2 premiers chiffres) : découpage thématique des requêtes
+CPV_DIVISIONS: tuple[str, ...] = (
+    "03", "09", "14", "15", "16", "18", "19", "22", "24", "30", "31", "32",
+    "33", "34", "35", "37", "38", "39", "41", "42", "43", "44", "45", "48",
+    "50", "51", "55", "60", "63", "64", "65", "66", "70", "71", "72", "73",
+    "75", "76", "77", "79", "80", "85", "90", "92", "98",
+)
+
+# Profondeur maximale du découpage CPV (chiffres significatifs : classe)
+CPV_SPLIT_MAX_DIGITS = 4
+
+# Profondeur du découpage par date de publication (scope ALL : 10 ans)
+SPLIT_LOOKBACK_DAYS = 3653
+
+
+def _before_retry(retry_state: RetryCallState) -> None:
+    """Compte la nouvelle tentative puis la journalise."""
+    TED_REQUEST_RETRIES.inc()
+    _log_before_sleep(retry_state)
+
+
+class RequestCounter:
+    """Nombre de requêtes HTTP émises vers l'API TED (retries inclus)."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+
+# Compteur actif dans le contexte courant (tâche asyncio), voir count_requests()
+_request_counter: ContextVar[RequestCounter | None] = ContextVar(
+    "ted_request_counter", default=None
+)
+
+
+@contextmanager
+def count_requests(counter: RequestCounter | None = None) -> Iterator[RequestCounter]:
+    """
+    Compte les requêtes TED émises dans le bloc (et les tâches qu'il crée).
+
+    Args:
+        counter: Compteur à incrémenter (défaut: nouveau compteur)
+
+    Yields:
+        RequestCounter incrémenté à chaque tentative HTTP
+    """
+    if counter is None:
+        counter = RequestCounter()
+    token = _request_counter.set(counter)
+    try:
+        yield counter
+    finally:
+        _request_counter.reset(token)
+
 
 class TEDAPIError(Exception):
     """Erreur lors d'une requête à l'API TED."""
@@ -44,6 +110,17 @@ class TEDAPIError(Exception):
         self.status_code = status_code
 
 
+class TEDPageWindowError(TEDAPIError):
+    """Requête dépassant la fenêtre de pagination TED (notices inaccessibles)."""
+
+    def __init__(self, total: int, window: int):
+        super().__init__(
+            f"TED page window exceeded: {total} notices, {window} reachable by page number"
+        )
+        self.total = total
+        self.window = window
+
+
 class TEDAPIClient:
     """
     Client pour l'API TED Search.
@@ -109,11 +186,40 @@ class TEDAPIClient:
         payload_str = json.dumps(payload, sort_keys=True)
         return f"ted:search:{hashlib.md5(payload_str.encode()).hexdigest()}"
 
+    def pagination_fingerprint(
+        self,
+        query: str,
+        fields: list[str] | None = None,
+        scope: str = "ACTIVE",
+    ) -> str:
+        """
+        Empreinte d'une pagination : mêmes pages pour une même empreinte.
+
+        Inclut la taille de page, dont dépend le découpage en pages, et le
+        mode de pagination (numéro de page ou jeton de continuation).
+
+        Args:
+            query: Requête de recherche TED
+            fields: Champs retournés (défaut: DEFAULT_TED_FIELDS)
+            scope: Étendue de recherche
+
+        Returns:
+            Empreinte hexadécimale (sha256)
+        """
+        payload = {
+            "query": query,
+            "fields": fields or DEFAULT_TED_FIELDS,
+            "scope": scope,
+            "limit": self.settings.ted_default_limit,
+            "pagination_mode": self.settings.ted_pagination_mode,
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
     @retry(
         retry=retry_if_exception_type((httpx.HTTPStatusError, httpx.TimeoutException)),
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=2, max=30),
-        before_sleep=before_sleep_log(logger, logging.INFO),
+        before_sleep=_before_retry,
         reraise=True,
     )
     async def _request(self, payload: dict[str, Any]) -> dict[str, Any]:
@@ -133,14 +239,23 @@ class TEDAPIClient:
 
         self._log.debug("TED API request", payload=payload)
 
+        counter = _request_counter.get()
+        if counter is not None:
+            counter.calls += 1
+
+        start = time.perf_counter()
         try:
             response = await client.post(
                 self.settings.ted_api_url,
                 json=payload,
             )
+            TED_REQUEST_LATENCY.labels(str(response.status_code)).observe(
+                time.perf_counter() - start
+            )
 
             # Gestion des erreurs HTTP
             if response.status_code == 429:
+                TED_RATE_LIMITED.inc()
                 retry_after = int(response.headers.get("Retry-After", 60))
                 self._log.warning(
                     "Rate limit hit",
@@ -172,6 +287,7 @@ class TEDAPIClient:
             return data
 
         except httpx.TimeoutException as e:
+            TED_REQUEST_LATENCY.labels("timeout").observe(time.perf_counter() - start)
             self._log.error("TED API timeout", error=str(e))
             raise
 
@@ -191,6 +307,8 @@ class TEDAPIClient:
         page: int = 1,
         scope: str = "ACTIVE",
         use_cache: bool = True,
+        iteration: bool = False,
+        iteration_token: str | None = None,
     ) -> TEDAPIResponse:
         """
         Recherche des appels d'offres via l'API TED.
@@ -200,9 +318,11 @@ class TEDAPIClient:
                    Ex: "notice-type = cn-standard AND buyer-country = FRA"
             fields: Champs à retourner (défaut: DEFAULT_TED_FIELDS)
             limit: Nombre de résultats par page (1-100)
-            page: Numéro de page (1-indexed)
+            page: Numéro de page (1-indexed), reporté tel quel en mode ITERATION
             scope: Étendue de recherche (ACTIVE, LATEST, ALL)
-            use_cache: Utiliser le cache si disponible
+            use_cache: Utiliser le cache si disponible (ignoré en mode ITERATION)
+            iteration: Pagination par jeton de continuation (paginationMode=ITERATION)
+            iteration_token: Jeton retourné par la page précédente (None: première page)
 
         Returns:
             TEDAPIResponse avec les notices trouvées
@@ -213,13 +333,20 @@ class TEDAPIClient:
         if fields is None:
             fields = DEFAULT_TED_FIELDS
 
-        payload = {
+        payload: dict[str, Any] = {
             "query": query,
             "fields": fields,
             "scope": scope,
-            "page": page,
             "limit": min(limit, 100),  # Max 100 par requête TED
         }
+        if iteration:
+            # Jeton lié à un curseur côté TED : réponse non réutilisable
+            payload["paginationMode"] = "ITERATION"
+            if iteration_token is not None:
+                payload["iterationNextToken"] = iteration_token
+            use_cache = False
+        else:
+            payload["page"] = page
 
         # Vérifier le cache
         cache_key = self._build_cache_key(payload)
@@ -238,6 +365,7 @@ class TEDAPIClient:
                 page=page,  # TED v3 ne retourne pas la page
                 limit=limit,
                 notices=data.get("notices", []),
+                iteration_next_token=data.get("iterationNextToken"),
             )
 
             # Mettre en cache
@@ -265,28 +393,30 @@ class TEDAPIClient:
         except Exception as e:
             raise TEDAPIError(f"Unexpected error: {e}") from e
 
-    async def get_active_tenders(
+    def build_active_query(
         self,
         country: str | None = None,
         notice_types: list[str] | None = None,
         cpv_codes: list[str] | None = None,
         min_value: float | None = None,
         max_value: float | None = None,
-        max_results: int | None = 1000,
-    ) -> list[Tender]:
+        published_from: date | None = None,
+        published_to: date | None = None,
+    ) -> str:
         """
-        Récupère les appels d'offres actifs avec filtres.
+        Construit la requête TED des appels d'offres actifs.
 
         Args:
-            country: Code pays ISO (ex: "FRA"). None = tous pays
+            country: Code pays ISO (ex: "FRA"). None = pays par défaut
             notice_types: Types de notice (défaut: cn-standard, cn-social)
             cpv_codes: Codes CPV à filtrer
             min_value: Valeur minimale
             max_value: Valeur maximale
-            max_results: Nombre maximum de résultats (défaut: 1000, None=illimité)
+            published_from: Date de publication minimale (incluse)
+            published_to: Date de publication maximale (incluse)
 
         Returns:
-            Liste des Tender correspondants
+            Requête au format expert TED
         """
         if country is None:
             country = self.settings.ted_default_country
@@ -294,7 +424,6 @@ class TEDAPIClient:
         if notice_types is None:
             notice_types = ["cn-standard", "cn-social"]
 
-        # Construire la requête
         query_parts = []
 
         # Types de notice
@@ -322,7 +451,47 @@ class TEDAPIClient:
         if max_value is not None:
             query_parts.append(f"estimated-value <= {max_value}")
 
-        query = " AND ".join(query_parts)
+        # Date de publication (format TED: YYYYMMDD)
+        if published_from is not None:
+            query_parts.append(f"publication-date >= {published_from:%Y%m%d}")
+        if published_to is not None:
+            query_parts.append(f"publication-date <= {published_to:%Y%m%d}")
+
+        return " AND ".join(query_parts)
+
+    async def get_active_tenders(
+        self,
+        country: str | None = None,
+        notice_types: list[str] | None = None,
+        cpv_codes: list[str] | None = None,
+        min_value: float | None = None,
+        max_value: float | None = None,
+        max_results: int | None = 1000,
+    ) -> list[Tender]:
+        """
+        Récupère les appels d'offres actifs avec filtres.
+
+        Args:
+            country: Code pays ISO (ex: "FRA"). None = tous pays
+            notice_types: Types de notice (défaut: cn-standard, cn-social)
+            cpv_codes: Codes CPV à filtrer
+            min_value: Valeur minimale
+            max_value: Valeur maximale
+            max_results: Nombre maximum de résultats (défaut: 1000, None=illimité)
+
+        Returns:
+            Liste des Tender correspondants
+        """
+        if country is None:
+            country = self.settings.ted_default_country
+
+        query = self.build_active_query(
+            country=country,
+            notice_types=notice_types,
+            cpv_codes=cpv_codes,
+            min_value=min_value,
+            max_value=max_value,
+        )
 
         self._log.info(
             "Fetching active tenders",
@@ -332,7 +501,9 @@ class TEDAPIClient:
 
         # Récupérer tous les résultats (avec limite optionnelle)
         tenders: list[Tender] = []
-        async for tender in self.get_all_tenders_paginated(query, max_results=max_results):
+        async for tender in self.get_all_tenders_paginated(
+            query, fields=TED_FIELD_PROFILES["listing"], max_results=max_results
+        ):
             tenders.append(tender)
 
         self._log.info(
@@ -343,28 +514,40 @@ class TEDAPIClient:
 
         return tenders
 
-    async def get_all_tenders_paginated(
+    async def iter_pages(
         self,
         query: str,
         fields: list[str] | None = None,
-        max_results: int | None = None,
         scope: str = "ACTIVE",
-    ) -> AsyncGenerator[Tender, None]:
+        start_page: int = 1,
+        truncate: bool = True,
+    ) -> AsyncGenerator[TEDAPIResponse, None]:
         """
-        Générateur async pour récupérer tous les résultats avec pagination.
+        Générateur async des pages brutes de résultats TED.
+
+        S'arrête sur une page vide ou quand toutes les notices annoncées
+        par l'API ont été reçues. Les notices au-delà de ted_max_page_window
+        sont inaccessibles : le parcours s'arrête à la fenêtre (truncate)
+        ou lève TEDPageWindowError dès la première page, avant d'en produire.
 
         Args:
             query: Requête de recherche TED
             fields: Champs à retourner
-            max_results: Nombre max de résultats (None = illimité)
             scope: Étendue de recherche
+            start_page: Première page à récupérer (reprise après interruption)
+            truncate: Tronquer à la fenêtre de pagination au lieu de lever
+                TEDPageWindowError
 
         Yields:
-            Tender: Appels d'offres un par un
+            TEDAPIResponse: Une page de notices non converties
+
+        Raises:
+            TEDPageWindowError: Si truncate est faux et que la requête
+                dépasse la fenêtre de pagination
         """
-        page = 1
+        page = start_page
         limit = self.settings.ted_default_limit
-        total_fetched = 0
+        received = (start_page - 1) * limit
 
         while True:
             response = await self.search_tenders(
@@ -376,8 +559,383 @@ class TEDAPIClient:
             )
 
             if not response.notices:
-                break
+                return
+
+            window = self.settings.ted_max_page_window
+            if not truncate and response.total > window:
+                raise TEDPageWindowError(response.total, window)
+
+            yield response
+            received += len(response.notices)
+
+            # Vérifier s'il y a d'autres pages
+            if received >= response.total:
+                return
+
+            # Pages au-delà de la fenêtre TED inaccessibles (iter_pages_complete)
+            if received >= window:
+                self._log.warning(
+                    "TED page window reached, results truncated",
+                    fetched=received,
+                    total=response.total,
+                )
+                return
+
+            page += 1
+
+            self._log.debug(
+                "Pagination progress",
+                page=page,
+                fetched=received,
+                total=response.total,
+            )
+
+    async def iter_pages_iteration(
+        self,
+        query: str,
+        fields: list[str] | None = None,
+        scope: str = "ACTIVE",
+        start_page: int = 1,
+        start_token: str | None = None,
+    ) -> AsyncGenerator[TEDAPIResponse, None]:
+        """
+        Générateur async des pages TED en mode ITERATION (jeton de continuation).
+
+        Chaque page porte le jeton de la suivante (iteration_next_token) :
+        le parcours n'est pas borné par la fenêtre de pagination et n'est
+        pas décalé par les notices publiées pendant la synchronisation.
+        Un jeton de reprise refusé par TED (expiré) relance le parcours
+        depuis le début, numérotation comprise (page 1) ; l'upsert étant
+        idempotent, les notices déjà traitées sont seulement relues.
+
+        Args:
+            query: Requête de recherche TED
+            fields: Champs à retourner
+            scope: Étendue de recherche
+            start_page: Numéro de la première page produite (compteur local)
+            start_token: Jeton de reprise (iteration_next_token d'une page traitée)
+
+        Yields:
+            TEDAPIResponse: Une page de notices non converties
+        """
+        page = start_page
+        token = start_token
+        limit = self.settings.ted_default_limit
+        received = 0
+
+        while True:
+            try:
+                response = await self.search_tenders(
+                    query=query,
+                    fields=fields,
+                    limit=limit,
+                    page=page,
+                    scope=scope,
+                    iteration=True,
+                    iteration_token=token,
+                )
+            except TEDAPIError as e:
+                if token is None or token != start_token or e.status_code not in (400, 404, 410):
+                    raise
+                self._log.warning(
+                    "TED iteration token rejected, restarting pagination",
+                    status_code=e.status_code,
+                )
+                # Parcours relancé : les numéros de page checkpointés repartent de 1
+                token = start_token = None
+                page = 1
+                continue
+
+            if not response.notices:
+                return
+
+            yield response
+            received += len(response.notices)
+
+            token = response.iteration_next_token
+            if token is None:
+                return
+
+            page += 1
+
+            self._log.debug(
+                "Iteration progress",
+                page=page,
+                fetched=received,
+                total=response.total,
+            )
+
+    def scan_pages(
+        self,
+        query: str,
+        fields: list[str] | None = None,
+        scope: str = "ACTIVE",
+        start_page: int = 1,
+        start_token: str | None = None,
+        truncate: bool = True,
+    ) -> AsyncGenerator[TEDAPIResponse, None]:
+        """
+        Pages d'un parcours complet selon settings.ted_pagination_mode.
+
+        Utilisé par la synchronisation et le backfill : en mode iteration la
+        reprise se fait par jeton, en mode page_number par numéro de page.
+
+        Args:
+            query: Requête de recherche TED
+            fields: Champs à retourner
+            scope: Étendue de recherche
+            start_page: Première page (numéro de reprise)
+            start_token: Jeton de reprise (mode iteration)
+            truncate: Mode page_number : tronquer à la fenêtre de pagination
+                au lieu de lever TEDPageWindowError (voir iter_pages)
+
+        Returns:
+            Générateur async de TEDAPIResponse
+        """
+        if self.settings.ted_pagination_mode == "iteration":
+            return self.iter_pages_iteration(
+                query, fields=fields, scope=scope, start_page=start_page, start_token=start_token
+            )
+        return self.iter_pages(
+            query, fields=fields, scope=scope, start_page=start_page, truncate=truncate
+        )
+
+    async def count_notices(self, query: str, scope: str = "ACTIVE") -> int:
+        """
+        Compte les notices d'une requête (totalNoticeCount, une notice lue).
+
+        Args:
+            query: Requête de recherche TED
+            scope: Étendue de recherche
+
+        Returns:
+            Nombre de notices annoncé par l'API
+        """
+        response = await self.search_tenders(
+            query=query,
+            fields=TED_FIELD_PROFILES["ids-only"],
+            limit=1,
+            page=1,
+            scope=scope,
+            use_cache=False,
+        )
+        return response.total
+
+    async def split_query(
+        self,
+        query: str,
+        scope: str = "ACTIVE",
+        published_from: date | None = None,
+        published_to: date | None = None,
+    ) -> list[tuple[str, int]]:
+        """
+        Découpe une requête en sous-requêtes tenant dans la fenêtre de pagination.
 
+        La période de publication est coupée en deux récursivement ; une
+        journée encore trop large est découpée par division CPV, puis par
+        groupe et classe CPV (TED inclut les sous-codes d'un code CPV), avec
+        une sous-requête résiduelle pour les notices classées au niveau du
+        parent. Les sous-requêtes vides sont écartées. Une notice classée dans plusieurs
+        divisions apparaît dans plusieurs sous-requêtes : dédupliquer.
+
+        Args:
+            query: Requête de recherche TED
+            scope: Étendue de recherche
+            published_from: Début de la période (défaut: 10 ans avant published_to)
+            published_to: Fin de la période (défaut: aujourd'hui)
+
+        Returns:
+            Liste de (sous-requête, nombre de notices)
+        """
+        window = self.settings.ted_max_page_window
+        semaphore = asyncio.Semaphore(self.settings.ted_split_concurrency)
+        if published_to is None:
+            published_to = date.today()
+        if published_from is None:
+            published_from = published_to - timedelta(days=SPLIT_LOOKBACK_DAYS)
+
+        async def count(sub: str) -> int:
+            async with semaphore:
+                return await self.count_notices(sub, scope)
+
+        async def leaf(sub: str) -> list[tuple[str, int]]:
+            total = await count(sub)
+            if total > window:
+                self._log.warning("Sub-query still exceeds TED window", query=sub, total=total)
+            return [(sub, total)] if total else []
+
+        async def by_cpv(base: str, parent: str | None) -> list[tuple[str, int]]:
+            if parent is None:
+                codes: Sequence[str] = CPV_DIVISIONS
+            else:
+                codes = [f"{parent}{digit}" for digit in range(1, 10)]
+            parts = list(await asyncio.gather(*(cpv_part(base, code) for code in codes)))
+            if parent is not None:
+                # Notices classées au niveau du parent, hors de tout sous-code
+                excluded = " ".join(code.ljust(8, "0") for code in codes)
+                parts.append(
+                    await leaf(
+                        f"{base} AND classification-cpv = {parent.ljust(8, '0')} "
+                        f"AND classification-cpv NOT IN ({excluded})"
+                    )
+                )
+            return [sub for part in parts for sub in part]
+
+        async def cpv_part(base: str, code: str) -> list[tuple[str, int]]:
+            sub = f"{base} AND classification-cpv = {code.ljust(8, '0')}"
+            if len(code) >= CPV_SPLIT_MAX_DIGITS:
+                return await leaf(sub)
+            total = await count(sub)
+            if total == 0:
+                return []
+            if total <= window:
+                return [(sub, total)]
+            return await by_cpv(base, code)
+
+        async def by_date(start: date, end: date) -> list[tuple[str, int]]:
+            sub = (
+                f"({query}) AND publication-date >= {start:%Y%m%d} "
+                f"AND publication-date <= {end:%Y%m%d}"
+            )
+            total = await count(sub)
+            if total == 0:
+                return []
+            if total <= window:
+                return [(sub, total)]
+            if start == end:
+                return await by_cpv(sub, None)
+            middle = start + (end - start) // 2
+            first, second = await asyncio.gather(
+                by_date(start, middle), by_date(middle + timedelta(days=1), end)
+            )
+            return first + second
+
+        subqueries = await by_date(published_from, published_to)
+        self._log.info(
+            "Query split to fit TED page window",
+            subqueries=len(subqueries),
+            total=sum(total for _, total in subqueries),
+        )
+        return subqueries
+
+    async def iter_pages_complete(
+        self,
+        query: str,
+        fields: list[str] | None = None,
+        scope: str = "ACTIVE",
+    ) -> AsyncGenerator[TEDAPIResponse, None]:
+        """
+        Comme iter_pages, sans troncature à la fenêtre de pagination TED.
+
+        La première page sert de sonde : si totalNoticeCount tient dans
+        ted_max_page_window, la pagination continue normalement. Sinon, en
+        mode iteration, la requête est parcourue par jeton de continuation ;
+        en mode page_number elle est découpée (split_query), les
+        sous-requêtes sont paginées en parallèle et les notices dédupliquées
+        par identifiant.
+
+        Args:
+            query: Requête de recherche TED
+            fields: Champs à retourner
+            scope: Étendue de recherche
+
+        Yields:
+            TEDAPIResponse: Pages de notices (total = somme des sous-requêtes)
+        """
+        pages = self.iter_pages(query, fields=fields, scope=scope)
+        first = await anext(pages, None)
+        if first is None:
+            return
+        if first.total <= self.settings.ted_max_page_window:
+            yield first
+            async for response in pages:
+                yield response
+            return
+        await pages.aclose()
+
+        if self.settings.ted_pagination_mode == "iteration":
+            self._log.info(
+                "TED page window exceeded, using iteration pagination",
+                total=first.total,
+                window=self.settings.ted_max_page_window,
+            )
+            async for response in self.iter_pages_iteration(query, fields=fields, scope=scope):
+                yield response
+            return
+
+        self._log.warning(
+            "TED page window exceeded, splitting query",
+            total=first.total,
+            window=self.settings.ted_max_page_window,
+        )
+        subqueries = await self.split_query(query, scope=scope)
+        total = sum(count for _, count in subqueries)
+        queue: asyncio.Queue[TEDAPIResponse | None] = asyncio.Queue(
+            maxsize=self.settings.ted_split_concurrency
+        )
+        semaphore = asyncio.Semaphore(self.settings.ted_split_concurrency)
+
+        async def fetch(sub: str) -> None:
+            async with semaphore:
+                async for response in self.iter_pages(sub, fields=fields, scope=scope):
+                    await queue.put(response)
+
+        async def fetch_all() -> BaseException | None:
+            failure: BaseException | None = None
+            try:
+                # TaskGroup : une erreur annule les autres sous-requêtes
+                async with asyncio.TaskGroup() as group:
+                    for sub, _ in subqueries:
+                        group.create_task(fetch(sub))
+            except* Exception as errors:
+                failure = errors.exceptions[0]
+            await queue.put(None)
+            return failure
+
+        task = asyncio.create_task(fetch_all())
+        seen: set[str] = set()
+        try:
+            while (page := await queue.get()) is not None:
+                notices = []
+                for notice in page.notices:
+                    notice_id = notice.get("ND", notice.get("publication-number"))
+                    if notice_id is not None:
+                        if notice_id in seen:
+                            continue
+                        seen.add(notice_id)
+                    notices.append(notice)
+                yield page.model_copy(update={"notices": notices, "total": total})
+            # Propage la première erreur des sous-requêtes (TEDAPIError)
+            failure = await task
+            if failure is not None:
+                raise failure
+        finally:
+            if not task.done():
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+
+    async def get_all_tenders_paginated(
+        self,
+        query: str,
+        fields: list[str] | None = None,
+        max_results: int | None = None,
+        scope: str = "ACTIVE",
+    ) -> AsyncGenerator[Tender, None]:
+        """
+        Générateur async pour récupérer tous les résultats avec pagination.
+
+        Args:
+            query: Requête de recherche TED
+            fields: Champs à retourner
+            max_results: Nombre max de résultats (None = illimité)
+            scope: Étendue de recherche
+
+        Yields:
+            Tender: Appels d'offres un par un
+        """
+        total_fetched = 0
+
+        async for response in self.iter_pages_complete(query, fields=fields, scope=scope):
             for notice in response.notices:
                 try:
                     tender = ted_notice_to_tender(notice)
@@ -394,19 +952,6 @@ class TEDAPIClient:
                         error=str(e),
                     )
 
-            # Vérifier s'il y a d'autres pages
-            if total_fetched >= response.total:
-                break
-
-            page += 1
-
-            self._log.debug(
-                "Pagination progress",
-                page=page,
-                fetched=total_fetched,
-                total=response.total,
-            )
-
     async def check_query_syntax(self, query: str) -> bool:
         """
         Vérifie la syntaxe d'une requête TED sans exécuter.
@@ -419,7 +964,7 @@ class TEDAPIClient:
         """
         payload = {
             "query": query,
-            "fields": ["notice-id"],
+            "fields": TED_FIELD_PROFILES["ids-only"],
             "check_query_syntax": True,
             "limit": 1,
         }
@@ -0,0 +1,125 @@
+"""
+Coordination des synchronisations planifiées entre répliques.
+
+Chaque réplique (daemon, conteneur) exécute APScheduler, mais seule la
+réplique élue leader lance les synchronisations planifiées. L'élection
+repose sur un verrou consultatif PostgreSQL de session :
+- le leader garde le verrou sur une connexion dédiée et vérifie
+  périodiquement qu'elle est vivante
+- si le leader meurt (ou perd sa connexion), PostgreSQL libère le verrou
+  et une autre réplique le prend au tour de campagne suivant
+- le nouveau leader rattrape la synchronisation planifiée manquée
+  (voir TenderSyncScheduler.catch_up)
+
+Le verrou par pays de ted_api.sync empêche en plus toute synchronisation
+concurrente d'un même pays (API, daemon, leader sortant).
+"""
+
+import os
+import socket
+from collections.abc import Awaitable, Callable
+
+import structlog
+
+from ted_api.database import LEADER_LOCK_NAMESPACE, AdvisoryLock, TenderDatabase
+
+logger = structlog.get_logger(__name__)
+
+# Nom de l'élection des synchronisations planifiées
+SCHEDULER_ELECTION = "ted_sync_scheduler"
+
+
+def replica_id() -> str:
+    """Identifiant de la réplique courante (hôte:pid) pour les logs."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class LeaderElector:
+    """
+    Élection de leader par verrou consultatif PostgreSQL.
+
+    campaign() est appelé périodiquement (job APScheduler) : il tente de
+    prendre le verrou, ou vérifie qu'il est toujours tenu.
+
+    Attributes:
+        name: Nom de l'élection (clé du verrou)
+        identity: Identifiant de la réplique
+    """
+
+    def __init__(
+        self,
+        db: TenderDatabase,
+        name: str = SCHEDULER_ELECTION,
+        on_elected: Callable[[], Awaitable[None]] | None = None,
+    ) -> None:
+        """
+        Initialise l'élection.
+
+        Args:
+            db: Base de données portant le verrou
+            name: Nom de l'élection
+            on_elected: Coroutine appelée à chaque prise de leadership
+        """
+        self.db = db
+        self.name = name
+        self.identity = replica_id()
+        self._on_elected = on_elected
+        self._lock: AdvisoryLock | None = None
+        self._log = logger.bind(component="LeaderElector", election=name, replica=self.identity)
+
+    @property
+    def is_leader(self) -> bool:
+        """True si cette réplique détient le verrou d'élection."""
+        return self._lock is not None
+
+    async def campaign(self) -> bool:
+        """
+        Tente de devenir (ou de rester) leader.
+
+        Returns:
+            True si cette réplique est leader à l'issue du tour
+        """
+        if self._lock is not None:
+            if await self._lock.is_held():
+                return True
+            self._log.warning("Leadership lost (connection closed)")
+            await self._discard()
+
+        try:
+            self._lock = await self.db.try_advisory_lock(LEADER_LOCK_NAMESPACE, self.name)
+        except Exception as e:
+            self._log.error("Leader election failed", error=str(e))
+            return False
+
+        if self._lock is None:
+            return False
+
+        self._log.info("Elected leader")
+        if self._on_elected is not None:
+            try:
+                await self._on_elected()
+            except Exception as e:
+                self._log.error("Leader election callback failed", error=str(e))
+        return True
+
+    async def resign(self) -> None:
+        """Libère le leadership (arrêt propre : bascule immédiate)."""
+        if self._lock is None:
+            return
+        lock, self._lock = self._lock, None
+        try:
+            await lock.release()
+            self._log.info("Leadership released")
+        except Exception as e:
+            self._log.warning("Failed to release leadership", error=str(e))
+
+    async def _discard(self) -> None:
+        """Oublie un verrou dont la connexion est morte."""
+        lock, self._lock = self._lock, None
+        if lock is None:
+            return
+        try:
+            await lock.release()
+        except Exception:
+            # Connexion déjà fermée : le verrou est libéré côté serveur
+            pass
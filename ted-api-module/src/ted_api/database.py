@@ -5,19 +5,500 @@ Utilise SQLAlchemy async avec asyncpg pour PostgreSQL.
 Base de données partagée avec le projet veille-boamp.
 """
 
+import asyncio
 import json
-from datetime import datetime
-from typing import Any
+import re
+import time
+from collections.abc import AsyncIterator, Iterable
+from contextlib import AsyncExitStack, asynccontextmanager
+from datetime import UTC, date, datetime, timedelta
+from typing import Any, Literal, NamedTuple
 
 import structlog
+from sqlalchemy import exc as sa_exc
 from sqlalchemy import text
-from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, create_async_engine
 
 from ted_api.config import Settings
-from ted_api.models import PaginatedResponse, Tender, TenderFilter
+from ted_api.metrics import (
+    DB_POOL_CAPACITY,
+    DB_POOL_CHECKED_OUT,
+    DB_POOL_CHECKOUT_TIMEOUTS,
+    DB_POOL_CHECKOUT_WAIT,
+    DB_POOL_WAITING,
+    DB_QUERY_LATENCY,
+    DB_REPLICA_AVAILABLE,
+    DB_REPLICA_LAG,
+    observe_query,
+)
+from ted_api.models import (
+    DERIVED_TENDER_FIELDS,
+    TENDER_SOURCES,
+    BackfillCheckpoint,
+    BoampTender,
+    PaginatedResponse,
+    SearchFilter,
+    SearchTender,
+    SyncCheckpoint,
+    SyncPhase,
+    SyncReport,
+    SyncRun,
+    Tender,
+    TenderDuplicate,
+    TenderFilter,
+    TenderFingerprint,
+)
 
 logger = structlog.get_logger(__name__)
 
+# Champs calculés de Tender évalués en SQL par rapport à :reference_time, avec
+# la logique Python (deadline naive UTC, floor des jours). formatted_value
+# reste formaté en Python : to_char arrondit le NUMERIC à la demi-unité
+# supérieure, là où "{:,.2f}" arrondit le float, et son masque est borné.
+DERIVED_COLUMNS_SQL = """
+    CASE WHEN deadline IS NULL THEN NULL
+        ELSE FLOOR(EXTRACT(EPOCH FROM (
+            (deadline AT TIME ZONE 'UTC') - CAST(:reference_time AS TIMESTAMP)
+        )) / 86400)::int
+    END AS days_until_deadline,
+    COALESCE(
+        (deadline AT TIME ZONE 'UTC') < CAST(:reference_time AS TIMESTAMP), FALSE
+    ) AS is_expired
+"""
+
+
+# Registre des migrations appliquées, créé par apply_migrations avant de le lire
+SCHEMA_MIGRATIONS_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        version INTEGER PRIMARY KEY,
+        description TEXT NOT NULL,
+        applied_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+    )
+"""
+
+# Tables propres au module, créées par la migration 0. Chaque instruction
+# est exécutée séparément (asyncpg n'accepte qu'une instruction par requête
+# préparée). Les changements ultérieurs de ces tables passent par de
+# nouvelles migrations.
+MODULE_SCHEMA_SQL: tuple[str, ...] = (
+    """
+    CREATE TABLE IF NOT EXISTS sync_runs (
+        id BIGSERIAL PRIMARY KEY,
+        country VARCHAR(10) NOT NULL,
+        trigger VARCHAR(20) NOT NULL DEFAULT 'manual',
+        status VARCHAR(20) NOT NULL DEFAULT 'running',
+        started_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+        finished_at TIMESTAMPTZ,
+        elapsed_seconds DOUBLE PRECISION,
+        pages INTEGER NOT NULL DEFAULT 0,
+        api_calls INTEGER NOT NULL DEFAULT 0,
+        fetched INTEGER NOT NULL DEFAULT 0,
+        inserted INTEGER NOT NULL DEFAULT 0,
+        updated INTEGER NOT NULL DEFAULT 0,
+        phases JSONB NOT NULL DEFAULT '[]'::jsonb,
+        error_message TEXT,
+        expected INTEGER,
+        progress_at TIMESTAMPTZ
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_sync_runs_started ON sync_runs(started_at DESC)",
+    """
+    CREATE INDEX IF NOT EXISTS idx_sync_runs_country
+        ON sync_runs(country, started_at DESC)
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS sync_checkpoints (
+        fingerprint VARCHAR(64) PRIMARY KEY,
+        country VARCHAR(10) NOT NULL,
+        query TEXT NOT NULL,
+        last_page INTEGER NOT NULL DEFAULT 0,
+        fetched INTEGER NOT NULL DEFAULT 0,
+        run_id BIGINT,
+        iteration_token TEXT,
+        updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS backfill_checkpoints (
+        country VARCHAR(10) NOT NULL,
+        window_start DATE NOT NULL,
+        window_end DATE NOT NULL,
+        status VARCHAR(20) NOT NULL DEFAULT 'pending',
+        last_page INTEGER NOT NULL DEFAULT 0,
+        fetched INTEGER NOT NULL DEFAULT 0,
+        inserted INTEGER NOT NULL DEFAULT 0,
+        updated INTEGER NOT NULL DEFAULT 0,
+        error_message TEXT,
+        iteration_token TEXT,
+        updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+        PRIMARY KEY (country, window_start, window_end)
+    )
+    """,
+    # Déduplication entre sources (ted_api.dedup)
+    """
+    CREATE TABLE IF NOT EXISTS tender_fingerprints (
+        source VARCHAR(10) NOT NULL,
+        notice_id VARCHAR(100) NOT NULL,
+        blocking_key TEXT NOT NULL,
+        signature INTEGER[] NOT NULL,
+        updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+        PRIMARY KEY (source, notice_id)
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_tender_fingerprints_block
+        ON tender_fingerprints(blocking_key)
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS tender_duplicates (
+        source VARCHAR(10) NOT NULL,
+        notice_id VARCHAR(100) NOT NULL,
+        duplicate_source VARCHAR(10) NOT NULL,
+        duplicate_notice_id VARCHAR(100) NOT NULL,
+        similarity REAL NOT NULL,
+        detected_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+        PRIMARY KEY (source, notice_id, duplicate_source, duplicate_notice_id)
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_tender_duplicates_reverse
+        ON tender_duplicates(duplicate_source, duplicate_notice_id)
+    """,
+)
+
+# Tables partagées (init.sql) lues par la vue de recherche unifiée
+SEARCH_SOURCE_TABLES: tuple[str, ...] = ("ted_tenders", "tender_cache", "place_tenders")
+
+# Vue de recherche toutes sources : chaque branche garde ses index (les filtres
+# et l'ORDER BY publication_date DESC ... LIMIT sont poussés dans les branches,
+# et une branche dont la source est exclue n'est pas lue). tender_cache ne
+# fournit que BOAMP : les avis TED viennent de ted_tenders, PLACE de
+# place_tenders. to_jsonb accepte cpv_codes en JSONB comme en TEXT[].
+TENDER_SEARCH_VIEW_SQL = """
+    CREATE OR REPLACE VIEW tender_search AS
+    SELECT notice_id::text AS id, 'TED'::text AS source, title, description,
+           buyer_name::text AS buyer_name, buyer_country::text AS location,
+           publication_date, deadline, procedure_type::text AS procedure_type,
+           to_jsonb(cpv_codes) AS cpv_codes, estimated_value, url,
+           FALSE AS is_joue
+    FROM ted_tenders
+    UNION ALL
+    SELECT id::text, 'BOAMP'::text, title, description,
+           buyer_name::text, COALESCE(location, buyer_department)::text,
+           publication_date, deadline_date, procedure_type::text,
+           CASE WHEN cpv IS NULL THEN '[]'::jsonb ELSE jsonb_build_array(cpv) END,
+           NULL::numeric, boamp_url, COALESCE(is_joue, FALSE)
+    FROM tender_cache
+    WHERE source = 'BOAMP'
+    UNION ALL
+    SELECT id::text, 'PLACE'::text, titre, NULL::text,
+           acheteur::text, lieu::text,
+           COALESCE(date_publication, created_at), date_limite,
+           COALESCE(type_procedure, procedure)::text,
+           '[]'::jsonb, NULL::numeric, url, FALSE
+    FROM place_tenders
+"""
+
+# Index de liste : filtre pays puis ORDER BY publication_date DESC (get_tenders,
+# iter_tenders) lus dans l'ordre de l'index, LIMIT sans tri complet
+TED_LISTING_INDEX_SQL = """
+    CREATE INDEX IF NOT EXISTS idx_ted_country_publication
+        ON ted_tenders(buyer_country, publication_date DESC, notice_id)
+"""
+
+# Index partiels des notices datées : les filtres deadline >= ... excluent
+# les notices sans deadline (now() n'est pas autorisé dans un prédicat
+# d'index). Pays + deadline : liste et comptage des notices ouvertes d'un
+# pays (days_remaining) ; deadline seule : get_expiring_tenders.
+TED_OPEN_INDEX_SQL = """
+    CREATE INDEX IF NOT EXISTS idx_ted_open_country_deadline
+        ON ted_tenders(buyer_country, deadline)
+        WHERE deadline IS NOT NULL
+"""
+TED_DEADLINE_INDEX_SQL = """
+    CREATE INDEX IF NOT EXISTS idx_ted_open_deadline
+        ON ted_tenders(deadline)
+        WHERE deadline IS NOT NULL
+"""
+
+# Index courants de ted_tenders (init.sql), recréés sur la table partitionnée
+TED_TENDERS_INDEX_SQL: tuple[str, ...] = (
+    TED_LISTING_INDEX_SQL,
+    TED_OPEN_INDEX_SQL,
+    TED_DEADLINE_INDEX_SQL,
+    "CREATE INDEX IF NOT EXISTS idx_ted_publication ON ted_tenders(publication_date DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_ted_cpv ON ted_tenders USING gin(cpv_codes)",
+)
+
+# Colonnes de ted_tenders (init.sql), copiées telles quelles vers l'archive
+TED_TENDERS_COLUMNS: tuple[str, ...] = (
+    "notice_id", "title", "description", "buyer_name", "buyer_country",
+    "estimated_value", "currency", "deadline", "publication_date", "cpv_codes",
+    "procedure_type", "place_of_performance", "url", "created_at", "updated_at",
+)
+
+# Colonnes écrites par upsert_tenders (paramètres de _tender_to_row)
+TED_UPSERT_COLUMNS = TED_TENDERS_COLUMNS[:-2]
+
+# Archive des notices expirées : mêmes colonnes (et types, cpv_codes compris)
+# que ted_tenders, plus archived_at. Table en ajout seul : pages pleines
+# (fillfactor 100) et seuil TOAST abaissé pour compresser (pglz) les textes
+# longs dès 128 octets par ligne.
+TED_ARCHIVE_TABLE = "ted_tenders_archive"
+TED_ARCHIVE_SCHEMA_SQL: tuple[str, ...] = (
+    """
+    CREATE TABLE IF NOT EXISTS ted_tenders_archive
+        (LIKE ted_tenders INCLUDING DEFAULTS)
+        WITH (fillfactor = 100, toast_tuple_target = 128)
+    """,
+    """
+    ALTER TABLE ted_tenders_archive
+        ADD COLUMN IF NOT EXISTS archived_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+    """,
+    """
+    CREATE UNIQUE INDEX IF NOT EXISTS idx_ted_archive_notice
+        ON ted_tenders_archive(notice_id)
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_ted_archive_publication
+        ON ted_tenders_archive(publication_date DESC)
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_ted_archive_country
+        ON ted_tenders_archive(buyer_country)
+    """,
+)
+
+
+class SchemaMigration(NamedTuple):
+    """
+    Migration versionnée du schéma.
+
+    Les instructions doivent être idempotentes (IF NOT EXISTS, IF EXISTS) :
+    une migration interrompue est rejouée entièrement au démarrage suivant.
+    """
+
+    version: int
+    description: str
+    statements: tuple[str, ...]
+    # Instructions d'index (CREATE/DROP INDEX) exécutées CONCURRENTLY, hors
+    # transaction : les écritures sur la table ne sont pas bloquées
+    concurrent: bool = False
+
+
+# Migrations appliquées dans l'ordre au démarrage (apply_migrations) et
+# enregistrées dans schema_migrations : les bases existantes reçoivent les
+# changements que init.sql n'apporte qu'aux volumes neufs. Ne jamais
+# modifier une migration publiée : en ajouter une.
+SCHEMA_MIGRATIONS: tuple[SchemaMigration, ...] = (
+    SchemaMigration(
+        0,
+        "module tables and ted_tenders archive",
+        MODULE_SCHEMA_SQL + TED_ARCHIVE_SCHEMA_SQL,
+    ),
+    SchemaMigration(
+        1,
+        "ted_tenders indexes matched to listing and expiring queries",
+        (
+            TED_LISTING_INDEX_SQL,
+            TED_OPEN_INDEX_SQL,
+            TED_DEADLINE_INDEX_SQL,
+            # Préfixe de idx_ted_country_publication
+            "DROP INDEX IF EXISTS idx_ted_country",
+            # Remplacé par l'index partiel idx_ted_open_deadline
+            "DROP INDEX IF EXISTS idx_ted_deadline",
+        ),
+        concurrent=True,
+    ),
+    SchemaMigration(
+        2,
+        "sync progress and TED iteration token columns",
+        (
+            "ALTER TABLE sync_runs ADD COLUMN IF NOT EXISTS expected INTEGER",
+            "ALTER TABLE sync_runs ADD COLUMN IF NOT EXISTS progress_at TIMESTAMPTZ",
+            "ALTER TABLE sync_checkpoints ADD COLUMN IF NOT EXISTS iteration_token TEXT",
+            "ALTER TABLE backfill_checkpoints ADD COLUMN IF NOT EXISTS iteration_token TEXT",
+        ),
+    ),
+    SchemaMigration(
+        3,
+        "ted_tenders change sequence",
+        # Version des données de ted_tenders (voir TenderDatabase._tenders_changed)
+        ("CREATE SEQUENCE IF NOT EXISTS ted_tenders_changes",),
+    ),
+)
+
+# Délai maximal d'attente d'un verrou de table par une migration
+# transactionnelle : au-delà elle échoue (rejouée au prochain démarrage)
+# au lieu de bloquer les requêtes de l'API mises en file derrière elle
+MIGRATION_LOCK_TIMEOUT = "5s"
+
+_INDEX_DDL_RE = re.compile(r"^(\s*)(CREATE\s+(?:UNIQUE\s+)?INDEX|DROP\s+INDEX)\s", re.IGNORECASE)
+_INDEX_NAME_RE = re.compile(
+    r"^\s*CREATE\s+(?:UNIQUE\s+)?INDEX\s+(?:CONCURRENTLY\s+)?(?:IF\s+NOT\s+EXISTS\s+)?(\w+)",
+    re.IGNORECASE,
+)
+
+
+def concurrent_index_sql(statement: str) -> str:
+    """Réécrit un CREATE INDEX / DROP INDEX en version CONCURRENTLY."""
+    return _INDEX_DDL_RE.sub(r"\1\2 CONCURRENTLY ", statement, count=1)
+
+
+def created_index_name(statement: str) -> str | None:
+    """Nom de l'index créé par une instruction CREATE INDEX (sinon None)."""
+    match = _INDEX_NAME_RE.match(statement)
+    return match[1] if match else None
+
+
+# Partitions mensuelles de ted_tenders (publication_date, mois UTC) et
+# partitions détachées conservées à l'expiration (mode detach)
+TED_PARTITION_PREFIX = "ted_tenders_p"
+TED_ARCHIVE_PREFIX = "ted_tenders_archive_"
+_TED_PARTITION_RE = re.compile(rf"^{TED_PARTITION_PREFIX}(\d{{4}})_(\d{{2}})$")
+
+
+def month_start(value: date | datetime) -> date:
+    """Premier jour du mois (UTC pour un datetime ; naive = UTC)."""
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        value = value.astimezone(UTC)
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, count: int) -> date:
+    """Premier jour du mois décalé de `count` mois."""
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def ted_partition_name(month: date) -> str:
+    """Nom de la partition mensuelle de ted_tenders (ex: ted_tenders_p2024_01)."""
+    return f"{TED_PARTITION_PREFIX}{month.year:04d}_{month.month:02d}"
+
+
+# Clé du verrou consultatif sérialisant la création du schéma entre workers
+SCHEMA_LOCK_KEY = 7_310_001
+
+# Espace de clés des verrous consultatifs de synchronisation (un par pays)
+SYNC_LOCK_NAMESPACE = 7_310_002
+
+# Espace de clés des verrous d'élection de leader (ted_api.coordination)
+LEADER_LOCK_NAMESPACE = 7_310_003
+
+# Espace de clés du verrou des migrations de schéma (apply_migrations)
+MIGRATION_LOCK_NAMESPACE = 7_310_004
+
+# Espace de clés des verrous par notice (upsert dans ted_tenders partitionnée)
+NOTICE_LOCK_NAMESPACE = 7_310_005
+
+# Délai entre deux tentatives d'un verrou attendu (advisory_lock), en secondes
+ADVISORY_LOCK_POLL_INTERVAL = 1.0
+
+
+class AdvisoryLock:
+    """
+    Verrou consultatif PostgreSQL de session, tenu sur une connexion dédiée.
+
+    Le verrou est libéré par release(), ou automatiquement par PostgreSQL
+    si le processus meurt (fin de session).
+    """
+
+    def __init__(
+        self,
+        conn: AsyncConnection,
+        stack: AsyncExitStack,
+        namespace: int,
+        key: str,
+    ) -> None:
+        self._conn = conn
+        self._stack = stack
+        self.namespace = namespace
+        self.key = key
+
+    async def is_held(self) -> bool:
+        """
+        Vérifie que la session portant le verrou est toujours vivante.
+
+        Si la connexion a été coupée, PostgreSQL a déjà libéré le verrou.
+        """
+        try:
+            await self._conn.execute(text("SELECT 1"))
+            await self._conn.commit()
+        except Exception:
+            return False
+        return True
+
+    async def release(self) -> None:
+        """Libère le verrou et rend la connexion au pool."""
+        try:
+            await self._conn.execute(
+                text("SELECT pg_advisory_unlock(:namespace, hashtext(:key))"),
+                {"namespace": self.namespace, "key": self.key},
+            )
+            await self._conn.commit()
+        finally:
+            await self._stack.aclose()
+
+
+# Colonnes de tender_cache écrites par l'ingestion BOAMP, dans l'ordre du COPY
+TENDER_CACHE_COLUMNS: tuple[str, ...] = (
+    "id",
+    "title",
+    "description",
+    "buyer_name",
+    "buyer_department",
+    "publication_date",
+    "deadline_date",
+    "procedure_type",
+    "sectors",
+    "boamp_url",
+    "cpv",
+    "market_nature",
+    "amount_range",
+    "is_joue",
+    "is_defense_equipment",
+    "source",
+    "raw_data",
+    "expires_at",
+)
+
+
+# Valeurs historiques du pool, utilisées si aucune option n'est fournie
+DEFAULT_ENGINE_OPTIONS: dict[str, Any] = {
+    "pool_size": 5,
+    "max_overflow": 10,
+}
+
+# Retard du réplica (secondes) : 0 s'il a rejoué tout le WAL reçu (un primaire
+# sans écriture ne fait pas vieillir pg_last_xact_replay_timestamp), 0 aussi
+# pour un serveur qui n'est pas en réplication
+REPLICA_LAG_SQL = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(
+            EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0
+        )
+    END
+"""
+
+# Durée maximale du contrôle du réplica : un hôte injoignable ne doit pas
+# retenir la requête qui déclenche le contrôle
+REPLICA_CHECK_TIMEOUT = 2.0
+
+# Séquence avancée après chaque écriture validée dans ted_tenders : version
+# des données contrôlée par les index en mémoire des autres processus
+TED_CHANGES_SEQUENCE = "ted_tenders_changes"
+
+# Date de modification d'une notice (ETag) : updated_at, ou à défaut la
+# création pour les lignes antérieures à la colonne
+TENDER_VERSION_SQL = "COALESCE(updated_at, created_at, TIMESTAMPTZ 'epoch')"
+
+# Filtre cpv de TenderFilter (_build_where) : un code complet (8 chiffres,
+# sans chiffre de contrôle) est cherché par appartenance au tableau JSONB,
+# une valeur plus courte (division, groupe, classe) par préfixe
+CPV_CODE_LENGTH = 8
+
 
 class TenderDatabase:
     """
@@ -27,17 +508,68 @@ class TenderDatabase:
     Compatible avec la base de données partagée du projet veille-boamp.
     """
 
-    def __init__(self, database_url: str) -> None:
+    def __init__(
+        self,
+        database_url: str,
+        engine_options: dict[str, Any] | None = None,
+        replica_url: str | None = None,
+        replica_max_lag: float = 30.0,
+        replica_check_interval: float = 5.0,
+    ) -> None:
         """
         Initialise la connexion à la base de données.
 
         Args:
             database_url: URL de connexion PostgreSQL (format asyncpg)
+            engine_options: Options du pool passées à create_async_engine
+                (voir Settings.database_engine_options)
+            replica_url: URL d'un réplica en lecture (optionnel) ; les
+                lectures sans exigence de fraîcheur y sont routées
+            replica_max_lag: Retard de réplication toléré (secondes)
+            replica_check_interval: Intervalle de contrôle du réplica (secondes)
         """
         self.database_url = database_url
+        self.engine_options = {**DEFAULT_ENGINE_OPTIONS, **(engine_options or {})}
         self._engine: AsyncEngine | None = None
         self._log = logger.bind(component="TenderDatabase")
 
+        # Réplica en lecture : état du dernier contrôle (disponible et à jour)
+        self.replica_url = replica_url
+        self.replica_max_lag = replica_max_lag
+        self.replica_check_interval = replica_check_interval
+        self._replica_engine: AsyncEngine | None = None
+        self._replica_available = False
+        self._replica_lag: float | None = None
+        self._replica_error: str | None = None
+        self._replica_checked_at: float | None = None
+
+        # Disposition partitionnée de ted_tenders (détectée par init_schema)
+        # et mois dont la partition existe
+        self._ted_partitioned = False
+        self._ted_partitions: set[date] = set()
+
+        # Écritures dans ted_tenders validées par ce processus
+        self._tenders_version = 0
+
+        # Statistiques de checkout du pool
+        self._checkouts = 0
+        self._checkout_wait_total = 0.0
+        self._checkout_wait_max = 0.0
+        self._checkout_timeouts = 0
+        self._waiting = 0
+        # Jauges ted_db_pool_* alimentées par ce pool (enable_pool_metrics)
+        self._pool_metrics = False
+
+    @property
+    def ted_partitioned(self) -> bool:
+        """ted_tenders est partitionnée par mois de publication."""
+        return self._ted_partitioned
+
+    @property
+    def tenders_version(self) -> int:
+        """Nombre d'écritures dans ted_tenders validées par ce processus."""
+        return self._tenders_version
+
     @property
     def engine(self) -> AsyncEngine:
         """Retourne le moteur SQLAlchemy (création lazy)."""
@@ -45,18 +577,247 @@ class TenderDatabase:
             self._engine = create_async_engine(
                 self.database_url,
                 echo=False,
-                pool_size=5,
-                max_overflow=10,
+                **self.engine_options,
+            )
+            self._log.info(
+                "Database engine created",
+                pool_size=self.engine_options.get("pool_size"),
+                max_overflow=self.engine_options.get("max_overflow"),
             )
-            self._log.info("Database engine created")
         return self._engine
 
+    @property
+    def replica_engine(self) -> AsyncEngine | None:
+        """Moteur du réplica en lecture (création lazy, None si non configuré)."""
+        if self.replica_url is None:
+            return None
+        if self._replica_engine is None:
+            self._replica_engine = create_async_engine(
+                self.replica_url,
+                echo=False,
+                **self.engine_options,
+            )
+            self._log.info("Read replica engine created")
+        return self._replica_engine
+
+    async def _use_replica(self) -> bool:
+        """
+        Indique si les lectures peuvent aller au réplica.
+
+        Le réplica est contrôlé (joignable, retard <= replica_max_lag) au plus
+        une fois par replica_check_interval ; entre deux contrôles, le
+        résultat du dernier est réutilisé sans requête.
+        """
+        if self.replica_url is None:
+            return False
+        now = time.monotonic()
+        if (
+            self._replica_checked_at is not None
+            and now - self._replica_checked_at < self.replica_check_interval
+        ):
+            return self._replica_available
+        # Marqué avant le contrôle : les requêtes concurrentes ne le relancent pas
+        self._replica_checked_at = now
+
+        try:
+            lag = await asyncio.wait_for(self._replica_lag_seconds(), REPLICA_CHECK_TIMEOUT)
+        except Exception as e:
+            self._replica_failed(e)
+            return False
+
+        available = lag <= self.replica_max_lag
+        if available != self._replica_available:
+            if available:
+                self._log.info("Read replica in use", lag=round(lag, 3))
+            else:
+                self._log.warning(
+                    "Read replica lagging, reading from primary",
+                    lag=round(lag, 3),
+                    max_lag=self.replica_max_lag,
+                )
+        self._set_replica_state(available, lag)
+        return available
+
+    async def _replica_lag_seconds(self) -> float:
+        """Retard de réplication mesuré sur le réplica (secondes)."""
+        engine = self.replica_engine
+        if engine is None:
+            raise RuntimeError("Read replica not configured")
+        async with engine.connect() as conn:
+            result = await conn.execute(text(REPLICA_LAG_SQL))
+            return float(result.scalar() or 0.0)
+
+    def _set_replica_state(self, available: bool, lag: float | None) -> None:
+        """Enregistre le résultat d'un contrôle du réplica."""
+        self._replica_available = available
+        self._replica_lag = lag
+        self._replica_error = None
+        DB_REPLICA_AVAILABLE.set(1 if available else 0)
+        if lag is not None:
+            DB_REPLICA_LAG.set(lag)
+
+    def _replica_failed(self, error: Exception) -> None:
+        """Réplica injoignable : lectures sur le primaire jusqu'au prochain contrôle."""
+        if self._replica_error is None:
+            self._log.warning("Read replica unavailable, reading from primary", error=str(error))
+        self._set_replica_state(False, None)
+        self._replica_error = str(error) or type(error).__name__
+        self._replica_checked_at = time.monotonic()
+
+    @asynccontextmanager
+    async def _connect(self, read_only: bool = False) -> AsyncIterator[AsyncConnection]:
+        """
+        Emprunte une connexion au pool en mesurant le temps d'attente.
+
+        Tous les accès passent par ici (ou par _begin) pour que pool_status()
+        reflète l'utilisation réelle du pool.
+
+        Args:
+            read_only: Lecture sans exigence de fraîcheur : servie par le
+                réplica s'il est disponible et à jour, sinon par le primaire.
+                Les écritures et les lectures qui doivent voir une écriture
+                récente (lire-ses-écritures) restent sur le primaire.
+
+        Yields:
+            Connexion SQLAlchemy async
+        """
+        engine = self.engine
+        replica = self.replica_engine if read_only else None
+        if replica is not None and await self._use_replica():
+            engine = replica
+
+        self._set_waiting(1)
+        start = time.perf_counter()
+        try:
+            try:
+                conn = await engine.connect().start()
+            except Exception as e:
+                if engine is self.engine:
+                    raise
+                # Réplica tombé depuis le dernier contrôle : primaire
+                self._replica_failed(e)
+                engine = self.engine
+                conn = await engine.connect().start()
+        except sa_exc.TimeoutError:
+            self._checkout_timeouts += 1
+            DB_POOL_CHECKOUT_TIMEOUTS.inc()
+            self._log.warning(
+                "Database pool checkout timed out",
+                waited=round(time.perf_counter() - start, 3),
+                **self.pool_status(),
+            )
+            raise
+        finally:
+            self._set_waiting(-1)
+
+        waited = time.perf_counter() - start
+        DB_POOL_CHECKOUT_WAIT.observe(waited)
+        self._checkouts += 1
+        self._checkout_wait_total += waited
+        self._checkout_wait_max = max(self._checkout_wait_max, waited)
+
+        # Jauge du pool primaire seulement (capacité et checked_out de pool_status)
+        tracked = self._pool_metrics and engine is self._engine
+        if tracked:
+            DB_POOL_CHECKED_OUT.inc()
+        try:
+            yield conn
+        finally:
+            try:
+                await conn.close()
+            finally:
+                if tracked:
+                    DB_POOL_CHECKED_OUT.dec()
+
+    def _set_waiting(self, delta: int) -> None:
+        """Met à jour le nombre de coroutines en attente d'une connexion."""
+        self._waiting += delta
+        if self._pool_metrics:
+            DB_POOL_WAITING.inc(delta)
+
+    @asynccontextmanager
+    async def _begin(self) -> AsyncIterator[AsyncConnection]:
+        """Comme _connect, dans une transaction validée en sortie de bloc."""
+        async with self._connect() as conn, conn.begin():
+            yield conn
+
+    def enable_pool_metrics(self) -> None:
+        """
+        Publie l'état de ce pool dans les jauges ted_db_pool_*.
+
+        Les jauges sont mises à jour à chaque checkout et checkin plutôt que
+        lues au scrape : avec PROMETHEUS_MULTIPROC_DIR, elles sont écrites
+        par chaque worker et sommées sur les processus vivants (livesum).
+        """
+        status = self.pool_status()
+        self._pool_metrics = True
+        DB_POOL_CAPACITY.set(status["capacity"])
+        DB_POOL_CHECKED_OUT.set(status["checked_out"])
+        DB_POOL_WAITING.set(status["waiting"])
+
+    def pool_status(self) -> dict[str, Any]:
+        """
+        Retourne l'état et l'utilisation du pool de connexions.
+
+        Returns:
+            Dict avec taille, connexions utilisées, attentes et temps de checkout
+        """
+        pool_size = self.engine_options.get("pool_size", 0)
+        capacity = pool_size + self.engine_options.get("max_overflow", 0)
+        checked_out = 0
+        idle = 0
+        if self._engine is not None:
+            pool = self._engine.pool
+            checked_out = getattr(pool, "checkedout", lambda: 0)()
+            idle = getattr(pool, "checkedin", lambda: 0)()
+
+        return {
+            "pool_size": pool_size,
+            "capacity": capacity,
+            "checked_out": checked_out,
+            "idle": idle,
+            "waiting": self._waiting,
+            "utilization": round(checked_out / capacity, 3) if capacity else 0.0,
+            "checkouts": self._checkouts,
+            "checkout_timeouts": self._checkout_timeouts,
+            "checkout_wait_avg": (
+                self._checkout_wait_total / self._checkouts if self._checkouts else 0.0
+            ),
+            "checkout_wait_max": self._checkout_wait_max,
+            **self._replica_status(),
+        }
+
+    def _replica_status(self) -> dict[str, Any]:
+        """État du réplica en lecture pour pool_status (vide si non configuré)."""
+        if self.replica_url is None:
+            return {}
+        checked_out = 0
+        if self._replica_engine is not None:
+            checked_out = getattr(self._replica_engine.pool, "checkedout", lambda: 0)()
+        return {
+            "replica": {
+                "available": self._replica_available,
+                "lag": self._replica_lag,
+                "error": self._replica_error,
+                "checked_out": checked_out,
+            }
+        }
+
     async def init_schema(self) -> None:
         """
-        Vérifie que la table ted_tenders existe.
-        Le schéma est créé par init.sql au démarrage de PostgreSQL.
+        Vérifie que la table ted_tenders existe et applique les migrations.
+
+        Le schéma partagé est créé par init.sql au démarrage de PostgreSQL;
+        les tables propres au module (sync_runs, ted_tenders_archive) et
+        leurs évolutions sont créées par les migrations versionnées
+        manquantes (apply_migrations).
         """
-        async with self.engine.begin() as conn:
+        async with self._begin() as conn:
+            # Plusieurs workers démarrent en même temps : un seul crée la vue
+            await conn.execute(
+                text("SELECT pg_advisory_xact_lock(:key)"), {"key": SCHEMA_LOCK_KEY}
+            )
+
             # Vérifier que la table existe
             result = await conn.execute(
                 text("""
@@ -73,188 +834,894 @@ class TenderDatabase:
             else:
                 self._log.info("Database schema verified")
 
-    async def close(self) -> None:
-        """Ferme la connexion à la base de données."""
-        if self._engine is not None:
-            await self._engine.dispose()
-            self._engine = None
-            self._log.info("Database connection closed")
+            await self._create_search_view(conn)
+            await self._load_ted_partitions(conn)
 
-    async def upsert_tenders(self, tenders: list[Tender]) -> tuple[int, int]:
+        if exists:
+            await self.apply_migrations()
+
+    async def apply_migrations(self) -> list[int]:
         """
-        Insère ou met à jour des appels d'offres.
+        Applique les migrations de SCHEMA_MIGRATIONS pas encore enregistrées.
 
-        Args:
-            tenders: Liste des Tender à insérer/mettre à jour
+        Appelé par init_schema après sa transaction. Un seul processus migre
+        à la fois (verrou consultatif de session) : les autres workers
+        attendent la fin de ses migrations, puis ne rejouent que celles qui
+        manquent encore. Aucun worker ne sert donc de requête sur un schéma
+        incomplet (séquence ted_tenders_changes, tables du module). Une
+        migration en échec est journalisée et interrompt la série sans
+        empêcher le démarrage ; elle est rejouée au démarrage suivant.
 
         Returns:
-            Tuple (nombre insérés, nombre mis à jour)
+            Versions appliquées
         """
-        if not tenders:
-            return 0, 0
-
-        inserted = 0
-        updated = 0
-
-        async with self.engine.begin() as conn:
-            for tender in tenders:
-                tender_data = self._tender_to_row(tender)
+        lock = await self.try_advisory_lock(MIGRATION_LOCK_NAMESPACE, "schema")
+        if lock is None:
+            self._log.info("Waiting for schema migrations in another process")
+            lock = await self.advisory_lock(MIGRATION_LOCK_NAMESPACE, "schema")
 
-                # Utiliser ON CONFLICT pour upsert
-                result = await conn.execute(
-                    text("""
-                        INSERT INTO ted_tenders (
-                            notice_id, title, description, buyer_name,
-                            buyer_country, estimated_value, currency, deadline,
-                            publication_date, cpv_codes, procedure_type,
-                            place_of_performance, url
-                        ) VALUES (
-                            :notice_id, :title, :description, :buyer_name,
-                            :buyer_country, :estimated_value, :currency, :deadline,
-                            :publication_date, :cpv_codes, :procedure_type,
-                            :place_of_performance, :url
-                        )
-                        ON CONFLICT (notice_id) DO UPDATE SET
-                            title = EXCLUDED.title,
-                            description = EXCLUDED.description,
-                            buyer_name = EXCLUDED.buyer_name,
-                            buyer_country = EXCLUDED.buyer_country,
-                            estimated_value = EXCLUDED.estimated_value,
-                            currency = EXCLUDED.currency,
-                            deadline = EXCLUDED.deadline,
-                            publication_date = EXCLUDED.publication_date,
-                            cpv_codes = EXCLUDED.cpv_codes,
-                            procedure_type = EXCLUDED.procedure_type,
-                            place_of_performance = EXCLUDED.place_of_performance,
-                            url = EXCLUDED.url,
-                            updated_at = NOW()
-                        RETURNING (xmax = 0) AS is_insert
-                    """),
-                    tender_data,
+        applied: list[int] = []
+        try:
+            async with self._connect() as conn:
+                await conn.execute(text(SCHEMA_MIGRATIONS_TABLE_SQL))
+                await conn.commit()
+                result = await conn.execute(text("SELECT version FROM schema_migrations"))
+                done = set(result.scalars().all())
+
+            for migration in SCHEMA_MIGRATIONS:
+                if migration.version in done:
+                    continue
+                start = time.perf_counter()
+                # CREATE INDEX CONCURRENTLY n'est pas supporté sur une table
+                # partitionnée : transaction (index créés partition par partition)
+                concurrent = migration.concurrent and not self._ted_partitioned
+                try:
+                    if concurrent:
+                        await self._run_concurrent_migration(migration)
+                    else:
+                        await self._run_transactional_migration(migration)
+                except Exception as e:
+                    self._log.error(
+                        "Schema migration failed",
+                        version=migration.version,
+                        description=migration.description,
+                        error=str(e),
+                    )
+                    break
+                applied.append(migration.version)
+                self._log.info(
+                    "Schema migration applied",
+                    version=migration.version,
+                    description=migration.description,
+                    concurrent=concurrent,
+                    elapsed=round(time.perf_counter() - start, 3),
                 )
-                row = result.fetchone()
-                if row and row[0]:
-                    inserted += 1
-                else:
-                    updated += 1
+        finally:
+            await lock.release()
+        return applied
+
+    async def _run_transactional_migration(self, migration: SchemaMigration) -> None:
+        """Migration et son enregistrement dans une transaction (lock_timeout borné)."""
+        async with self._begin() as conn:
+            await conn.execute(text(f"SET LOCAL lock_timeout = '{MIGRATION_LOCK_TIMEOUT}'"))
+            for statement in migration.statements:
+                await conn.execute(text(statement))
+            await self._record_migration(conn, migration)
+
+    async def _run_concurrent_migration(self, migration: SchemaMigration) -> None:
+        """
+        Migration hors transaction, index créés et supprimés CONCURRENTLY.
 
-        self._log.info(
-            "Tenders upserted",
-            inserted=inserted,
-            updated=updated,
-            total=len(tenders),
+        Un CREATE INDEX CONCURRENTLY interrompu laisse un index invalide que
+        IF NOT EXISTS ignorerait : il est supprimé avant d'être recréé.
+        """
+        async with self._connect() as conn:
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            for statement in migration.statements:
+                name = created_index_name(statement)
+                if name is not None:
+                    await self._drop_invalid_index(conn, name)
+                await conn.execute(text(concurrent_index_sql(statement)))
+            await self._record_migration(conn, migration)
+
+    async def _drop_invalid_index(self, conn: AsyncConnection, name: str) -> None:
+        """Supprime l'index `name` s'il existe mais est invalide."""
+        result = await conn.execute(
+            text("SELECT NOT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:name)"),
+            {"name": name},
+        )
+        if result.scalar():
+            self._log.warning("Dropping invalid index left by an interrupted build", index=name)
+            await conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+
+    @staticmethod
+    async def _record_migration(conn: AsyncConnection, migration: SchemaMigration) -> None:
+        """Enregistre une migration appliquée."""
+        await conn.execute(
+            text("""
+                INSERT INTO schema_migrations (version, description)
+                VALUES (:version, :description)
+                ON CONFLICT (version) DO NOTHING
+            """),
+            {"version": migration.version, "description": migration.description},
         )
 
-        return inserted, updated
-
-    async def get_tenders(
-        self,
-        filters: TenderFilter | None = None,
-        page: int = 1,
-        limit: int = 20,
-    ) -> PaginatedResponse[Tender]:
+    async def _create_search_view(self, conn: AsyncConnection) -> None:
+        """Crée la vue de recherche unifiée, si toutes les tables sources existent."""
+        result = await conn.execute(
+            text("""
+                SELECT name FROM unnest(CAST(:tables AS text[])) AS name
+                WHERE to_regclass(name) IS NULL
+            """),
+            {"tables": list(SEARCH_SOURCE_TABLES)},
+        )
+        missing = result.scalars().all()
+        if missing:
+            self._log.warning("Unified search view not created", missing_tables=missing)
+        else:
+            await conn.execute(text(TENDER_SEARCH_VIEW_SQL))
+
+    async def _load_ted_partitions(self, conn: AsyncConnection) -> None:
+        """Détecte la disposition partitionnée de ted_tenders et ses partitions."""
+        result = await conn.execute(
+            text("""
+                SELECT c.relname
+                FROM pg_partitioned_table p
+                JOIN pg_inherits i ON i.inhparent = p.partrelid
+                JOIN pg_class c ON c.oid = i.inhrelid
+                WHERE p.partrelid = to_regclass('ted_tenders')
+            """)
+        )
+        names = result.scalars().all()
+        result = await conn.execute(
+            text("""
+                SELECT EXISTS (
+                    SELECT 1 FROM pg_partitioned_table
+                    WHERE partrelid = to_regclass('ted_tenders')
+                )
+            """)
+        )
+        self._ted_partitioned = bool(result.scalar())
+        self._ted_partitions = set()
+        for name in names:
+            match = _TED_PARTITION_RE.match(name)
+            if match:
+                self._ted_partitions.add(date(int(match[1]), int(match[2]), 1))
+
+    async def partition_ted_tenders(self, months_ahead: int = 3) -> int:
         """
-        Récupère les appels d'offres avec filtres et pagination.
+        Convertit ted_tenders en table partitionnée par mois de publication.
+
+        Opération ponctuelle (python run.py --partition), exécutée en une
+        transaction sous verrou exclusif : les lignes sont copiées dans des
+        partitions mensuelles (mois présents + months_ahead mois à venir),
+        puis index, trigger updated_at et vue tender_search sont recréés.
+        La clé primaire devient (notice_id, publication_date) : une table
+        partitionnée n'accepte que des contraintes d'unicité incluant la clé
+        de partitionnement. Sans effet si la table est déjà partitionnée.
 
         Args:
-            filters: Filtres optionnels
-            page: Numéro de page (1-indexed)
-            limit: Nombre de résultats par page
+            months_ahead: Mois futurs dont la partition est créée d'avance
 
         Returns:
-            PaginatedResponse avec les Tender trouvés
+            Nombre de partitions créées
         """
-        if filters is None:
-            filters = TenderFilter()
+        async with self._begin() as conn:
+            await conn.execute(
+                text("SELECT pg_advisory_xact_lock(:key)"), {"key": SCHEMA_LOCK_KEY}
+            )
+            await self._load_ted_partitions(conn)
+            if self._ted_partitioned:
+                self._log.info("ted_tenders already partitioned")
+                return 0
+
+            await conn.execute(text("LOCK TABLE ted_tenders IN ACCESS EXCLUSIVE MODE"))
+            await conn.execute(text("DROP VIEW IF EXISTS tender_search"))
+            await conn.execute(text("ALTER TABLE ted_tenders RENAME TO ted_tenders_unpartitioned"))
+            await conn.execute(
+                text("""
+                    CREATE TABLE ted_tenders
+                        (LIKE ted_tenders_unpartitioned INCLUDING DEFAULTS)
+                        PARTITION BY RANGE (publication_date)
+                """)
+            )
 
-        # Construire la requête WHERE
-        where_clauses: list[str] = []
-        params: dict[str, Any] = {}
+            result = await conn.execute(
+                text("""
+                    SELECT DISTINCT CAST(
+                        date_trunc('month', publication_date AT TIME ZONE 'UTC') AS date
+                    )
+                    FROM ted_tenders_unpartitioned
+                """)
+            )
+            current = month_start(datetime.now(UTC))
+            months = set(result.scalars().all())
+            months.update(add_months(current, offset) for offset in range(months_ahead + 1))
+            for month in sorted(months):
+                await conn.execute(text(self._create_ted_partition_sql(month)))
 
-        if filters.country:
-            where_clauses.append("buyer_country = :country")
-            params["country"] = filters.country
+            result = await conn.execute(
+                text("INSERT INTO ted_tenders SELECT * FROM ted_tenders_unpartitioned")
+            )
+            rows = result.rowcount
+            await conn.execute(text("DROP TABLE ted_tenders_unpartitioned"))
+            await conn.execute(
+                text("ALTER TABLE ted_tenders ADD PRIMARY KEY (notice_id, publication_date)")
+            )
+            for statement in TED_TENDERS_INDEX_SQL:
+                await conn.execute(text(statement))
 
-        if filters.cpv:
-            # Recherche dans le tableau JSONB de CPV codes
-            where_clauses.append("cpv_codes @> :cpv::jsonb")
-            params["cpv"] = json.dumps([filters.cpv])
+            result = await conn.execute(
+                text("SELECT to_regproc('update_updated_at_column') IS NOT NULL")
+            )
+            if result.scalar():
+                await conn.execute(
+                    text("""
+                        CREATE TRIGGER update_ted_tenders_updated_at
+                        BEFORE UPDATE ON ted_tenders
+                        FOR EACH ROW EXECUTE FUNCTION update_updated_at_column()
+                    """)
+                )
+            await self._create_search_view(conn)
+
+        self._ted_partitioned = True
+        self._ted_partitions = months
+        self._log.info("ted_tenders partitioned", partitions=len(months), rows=rows)
+        return len(months)
+
+    @staticmethod
+    def _create_ted_partition_sql(month: date) -> str:
+        """DDL de la partition d'un mois (bornes en UTC, fin exclue)."""
+        return f"""
+            CREATE TABLE IF NOT EXISTS {ted_partition_name(month)}
+                PARTITION OF ted_tenders
+                FOR VALUES FROM ('{month.isoformat()} 00:00:00+00')
+                TO ('{add_months(month, 1).isoformat()} 00:00:00+00')
+        """
 
-        if filters.min_value is not None:
-            where_clauses.append("estimated_value >= :min_value")
-            params["min_value"] = filters.min_value
+    async def ensure_ted_partitions(self, months: Iterable[date]) -> int:
+        """
+        Crée les partitions mensuelles manquantes de ted_tenders.
 
-        if filters.max_value is not None:
-            where_clauses.append("estimated_value <= :max_value")
-            params["max_value"] = filters.max_value
+        Les mois déjà connus ne coûtent aucune requête : appelé avant chaque
+        upsert, et d'avance pour les mois à venir (maintenance planifiée).
 
-        if filters.days_remaining is not None:
-            where_clauses.append("deadline >= CURRENT_DATE")
+        Args:
+            months: Premiers jours des mois à couvrir
 
-        if filters.search_text:
-            where_clauses.append(
-                "(title ILIKE :search OR description ILIKE :search)"
+        Returns:
+            Nombre de partitions créées
+        """
+        if not self._ted_partitioned:
+            return 0
+        missing = sorted({month_start(m) for m in months} - self._ted_partitions)
+        if not missing:
+            return 0
+
+        created = 0
+        async with self._begin() as conn:
+            # Création concurrente entre workers
+            await conn.execute(
+                text("SELECT pg_advisory_xact_lock(:key)"), {"key": SCHEMA_LOCK_KEY}
             )
-            params["search"] = f"%{filters.search_text}%"
-
-        # Construire la clause WHERE
-        where_sql = ""
-        if where_clauses:
-            where_sql = "WHERE " + " AND ".join(where_clauses)
-
-        # Compter le total
-        count_sql = f"SELECT COUNT(*) FROM ted_tenders {where_sql}"
+            for month in missing:
+                result = await conn.execute(
+                    text("SELECT to_regclass(:name) IS NULL"),
+                    {"name": ted_partition_name(month)},
+                )
+                if result.scalar():
+                    await conn.execute(text(self._create_ted_partition_sql(month)))
+                    created += 1
+        self._ted_partitions.update(missing)
+        if created:
+            self._log.info("ted_tenders partitions created", count=created)
+        return created
+
+    async def expire_ted_partitions(
+        self,
+        retention_months: int,
+        mode: Literal["drop", "detach", "archive"] = "drop",
+        today: date | None = None,
+    ) -> int:
+        """
+        Retire les partitions entièrement expirées de ted_tenders.
 
-        async with self.engine.connect() as conn:
-            result = await conn.execute(text(count_sql), params)
-            total = result.scalar() or 0
+        Une partition est retirée en bloc (DROP ou DETACH, sans DELETE ligne
+        à ligne ni VACUUM) si son mois de publication se termine avant la
+        fenêtre de rétention et qu'aucune de ses notices n'est encore ouverte
+        (deadline future). Les notices sans deadline partent avec leur mois.
 
-            # Récupérer les résultats
-            offset = (page - 1) * limit
-            select_sql = f"""
-                SELECT * FROM ted_tenders
-                {where_sql}
-                ORDER BY publication_date DESC, deadline ASC
-                LIMIT :limit OFFSET :offset
-            """
-            params["limit"] = limit
-            params["offset"] = offset
+        Args:
+            retention_months: Mois de publication conservés avant le mois courant
+            mode: drop (suppression), detach (renommée en
+                ted_tenders_archive_AAAA_MM) ou archive (copiée dans
+                ted_tenders_archive puis supprimée)
+            today: Date de référence (défaut: aujourd'hui, UTC)
 
-            result = await conn.execute(text(select_sql), params)
-            rows = result.fetchall()
+        Returns:
+            Nombre de notices retirées
+        """
+        if not self._ted_partitioned:
+            return 0
+        if today is None:
+            today = datetime.now(UTC).date()
+        cutoff = add_months(month_start(today), -retention_months)
+
+        removed = 0
+        async with self._begin() as conn:
+            await conn.execute(
+                text("SELECT pg_advisory_xact_lock(:key)"), {"key": SCHEMA_LOCK_KEY}
+            )
+            await self._load_ted_partitions(conn)
+            for month in sorted(m for m in self._ted_partitions if add_months(m, 1) <= cutoff):
+                name = ted_partition_name(month)
+                result = await conn.execute(
+                    text(f"""
+                        SELECT COUNT(*), COUNT(*) FILTER (WHERE deadline >= :today)
+                        FROM {name}
+                    """),
+                    {"today": today},
+                )
+                rows, open_rows = result.one()
+                if open_rows:
+                    continue
+                await conn.execute(text(f"ALTER TABLE ted_tenders DETACH PARTITION {name}"))
+                if mode == "detach":
+                    archive = f"{TED_ARCHIVE_PREFIX}{month.year:04d}_{month.month:02d}"
+                    await conn.execute(text(f"ALTER TABLE {name} RENAME TO {archive}"))
+                else:
+                    if mode == "archive":
+                        await conn.execute(text(self._archive_insert_sql(name)))
+                    await conn.execute(text(f"DROP TABLE {name}"))
+                self._ted_partitions.discard(month)
+                removed += rows
+                self._log.info(
+                    "ted_tenders partition expired",
+                    partition=name,
+                    rows=rows,
+                    mode=mode,
+                )
+        if removed > 0:
+            await self._tenders_changed()
+        return removed
 
-            tenders = [self._row_to_tender(row) for row in rows]
+    @staticmethod
+    def _archive_insert_sql(source: str) -> str:
+        """
+        Copie des lignes de `source` dans ted_tenders_archive.
 
-        return PaginatedResponse(
-            total=total,
-            page=page,
-            limit=limit,
-            items=tenders,
+        Une notice archivée à nouveau (deadline prolongée puis expirée)
+        remplace sa version précédente. Une notice présente plusieurs fois
+        dans `source` (partition d'avant l'unicité de notice_id) n'est
+        copiée qu'une fois, dans sa version la plus récente : ON CONFLICT
+        ne peut pas modifier deux fois la même ligne.
+        """
+        columns = ", ".join(TED_TENDERS_COLUMNS)
+        updates = ", ".join(
+            f"{column} = EXCLUDED.{column}" for column in TED_TENDERS_COLUMNS[1:]
         )
+        return f"""
+            INSERT INTO {TED_ARCHIVE_TABLE} ({columns}, archived_at)
+            SELECT DISTINCT ON (notice_id) {columns}, NOW() FROM {source}
+            ORDER BY notice_id, updated_at DESC NULLS LAST
+            ON CONFLICT (notice_id) DO UPDATE SET {updates}, archived_at = NOW()
+        """
 
-    async def get_tender_by_id(self, notice_id: str) -> Tender | None:
+    @observe_query
+    async def archive_expired_tenders(
+        self,
+        batch_size: int = 1000,
+        partition_retention_months: int = 6,
+    ) -> int:
         """
-        Récupère un appel d'offres par son ID.
+        Déplace les appels d'offres expirés vers ted_tenders_archive.
+
+        Table non partitionnée : lots de batch_size notices déplacées
+        (DELETE ... RETURNING puis INSERT dans la même requête), chacun dans
+        sa propre transaction pour garder des verrous courts ; les lignes
+        verrouillées par une synchronisation en cours sont laissées au
+        prochain passage. Table partitionnée : les partitions entièrement
+        expirées sont d'abord copiées puis supprimées en bloc
+        (expire_ted_partitions, mode archive), puis les notices expirées des
+        partitions conservées sont déplacées par lots.
 
         Args:
-            notice_id: Identifiant de la notice
+            batch_size: Notices déplacées par transaction
+            partition_retention_months: Table partitionnée : mois de
+                publication conservés avant le mois courant
 
         Returns:
-            Tender ou None si non trouvé
+            Nombre de notices archivées
         """
-        async with self.engine.connect() as conn:
-            result = await conn.execute(
-                text("SELECT * FROM ted_tenders WHERE notice_id = :id"),
-                {"id": notice_id},
+        archived = 0
+        if self._ted_partitioned:
+            archived = await self.expire_ted_partitions(
+                partition_retention_months, mode="archive"
             )
-            row = result.fetchone()
-
-            if row is None:
-                return None
-
-            return self._row_to_tender(row)
 
-    async def get_new_tenders_since(self, since: datetime) -> list[Tender]:
+        sql = f"""
+            WITH expired AS (
+                SELECT notice_id, publication_date FROM ted_tenders
+                WHERE deadline IS NOT NULL AND deadline < CURRENT_DATE
+                ORDER BY deadline
+                LIMIT :batch_size
+                FOR UPDATE SKIP LOCKED
+            ), moved AS (
+                DELETE FROM ted_tenders t
+                USING expired e
+                WHERE t.notice_id = e.notice_id
+                AND t.publication_date = e.publication_date
+                RETURNING t.*
+            ), archived AS (
+                {self._archive_insert_sql("moved")}
+                RETURNING 1
+            )
+            SELECT COUNT(*) FROM archived
+        """
+        batched = 0
+        while True:
+            async with self._begin() as conn:
+                result = await conn.execute(text(sql), {"batch_size": batch_size})
+                moved = result.scalar() or 0
+            batched += moved
+            if moved < batch_size:
+                break
+
+        if batched > 0:
+            self._log.info("Expired tenders archived", count=batched)
+            await self._tenders_changed()
+        return archived + batched
+
+    @observe_query
+    async def get_archived_tenders(
+        self,
+        filters: TenderFilter | None = None,
+        page: int = 1,
+        limit: int = 20,
+    ) -> PaginatedResponse[Tender]:
+        """
+        Recherche dans les appels d'offres archivés (requêtes historiques).
+
+        Mêmes filtres que get_tenders ; days_remaining n'a pas de sens pour
+        des notices expirées et ne renvoie rien.
+
+        Args:
+            filters: Filtres optionnels (pays, CPV, montants, texte, publication)
+            page: Numéro de page (1-indexed)
+            limit: Nombre de résultats par page
+
+        Returns:
+            PaginatedResponse avec les Tender archivés
+        """
+        where_sql, params = self._build_where(filters)
+
+        async with self._connect(read_only=True) as conn:
+            result = await conn.execute(
+                text(f"SELECT COUNT(*) FROM {TED_ARCHIVE_TABLE} {where_sql}"), params
+            )
+            total = result.scalar() or 0
+
+            params["limit"] = limit
+            params["offset"] = (page - 1) * limit
+            result = await conn.execute(
+                text(f"""
+                    SELECT * FROM {TED_ARCHIVE_TABLE}
+                    {where_sql}
+                    ORDER BY publication_date DESC, notice_id
+                    LIMIT :limit OFFSET :offset
+                """),
+                params,
+            )
+            items = [self._row_to_tender(row) for row in result.fetchall()]
+
+        return PaginatedResponse(total=total, page=page, limit=limit, items=items)
+
+    @observe_query
+    async def get_archived_tender(self, notice_id: str) -> Tender | None:
+        """
+        Récupère un appel d'offres archivé par son ID.
+
+        Args:
+            notice_id: Identifiant de la notice
+
+        Returns:
+            Tender ou None si non archivé
+        """
+        async with self._connect(read_only=True) as conn:
+            result = await conn.execute(
+                text(f"SELECT * FROM {TED_ARCHIVE_TABLE} WHERE notice_id = :id"),
+                {"id": notice_id},
+            )
+            row = result.fetchone()
+        return self._row_to_tender(row) if row is not None else None
+
+    async def close(self) -> None:
+        """Ferme la connexion à la base de données."""
+        if self._replica_engine is not None:
+            await self._replica_engine.dispose()
+            self._replica_engine = None
+        if self._engine is not None:
+            await self._engine.dispose()
+            self._engine = None
+            self._log.info("Database connection closed")
+        if self._pool_metrics:
+            self._pool_metrics = False
+            DB_POOL_CAPACITY.set(0)
+
+    @observe_query
+    async def upsert_tenders(self, tenders: list[Tender]) -> tuple[int, int]:
+        """
+        Insère ou met à jour des appels d'offres.
+
+        Args:
+            tenders: Liste des Tender à insérer/mettre à jour
+
+        Returns:
+            Tuple (nombre insérés, nombre mis à jour)
+        """
+        if not tenders:
+            return 0, 0
+
+        inserted = 0
+        updated = 0
+
+        sql = self._upsert_sql(self._ted_partitioned)
+        if self._ted_partitioned:
+            await self.ensure_ted_partitions(t.publication_date for t in tenders)
+            # Ordre fixe des verrous par notice entre transactions concurrentes
+            tenders = sorted(tenders, key=lambda t: t.notice_id)
+
+        async with self._connect() as conn:
+            async with conn.begin():
+                if self._ted_partitioned:
+                    # Verrous pris avant les upserts : chaque requête suivante voit
+                    # les lignes validées par une transaction concurrente
+                    await conn.execute(
+                        text("""
+                            SELECT pg_advisory_xact_lock(:namespace, hashtext(notice_id))
+                            FROM unnest(CAST(:notice_ids AS TEXT[])) AS notice_id
+                        """),
+                        {
+                            "namespace": NOTICE_LOCK_NAMESPACE,
+                            "notice_ids": list(dict.fromkeys(t.notice_id for t in tenders)),
+                        },
+                    )
+                for tender in tenders:
+                    result = await conn.execute(text(sql), self._tender_to_row(tender))
+                    row = result.fetchone()
+                    if row and row[0]:
+                        inserted += 1
+                    else:
+                        updated += 1
+            # Même connexion, après le commit : un seul emprunt au pool
+            await self._tenders_changed(conn)
+
+        self._log.info(
+            "Tenders upserted",
+            inserted=inserted,
+            updated=updated,
+            total=len(tenders),
+        )
+
+        return inserted, updated
+
+    @staticmethod
+    def _upsert_sql(partitioned: bool) -> str:
+        """
+        Upsert d'une notice dans ted_tenders (colonne is_insert retournée).
+
+        Table partitionnée : la clé primaire (notice_id, publication_date)
+        n'assure pas l'unicité de notice_id. Une notice dont la date de
+        publication change (date absente de TED remplacée par la date de
+        synchronisation) est retirée de son ancienne partition dans la même
+        requête, en gardant son created_at. xmax n'étant pas lisible via la
+        table mère, une insertion est une notice absente avant la requête.
+        """
+        columns = ", ".join(TED_UPSERT_COLUMNS)
+        values = ", ".join(f":{column}" for column in TED_UPSERT_COLUMNS)
+        updates = ", ".join(
+            f"{column} = EXCLUDED.{column}" for column in TED_UPSERT_COLUMNS[1:]
+        )
+        if not partitioned:
+            return f"""
+                INSERT INTO ted_tenders ({columns}) VALUES ({values})
+                ON CONFLICT (notice_id) DO UPDATE SET {updates}, updated_at = NOW()
+                RETURNING (xmax = 0) AS is_insert
+            """
+        return f"""
+            WITH moved AS (
+                DELETE FROM ted_tenders
+                WHERE notice_id = :notice_id
+                AND publication_date <> :publication_date
+                RETURNING created_at
+            ), existing AS (
+                SELECT 1 FROM ted_tenders
+                WHERE notice_id = :notice_id
+                AND publication_date = :publication_date
+            )
+            INSERT INTO ted_tenders ({columns}, created_at)
+            VALUES ({values}, COALESCE((SELECT MIN(created_at) FROM moved), NOW()))
+            ON CONFLICT (notice_id, publication_date) DO UPDATE SET
+                {updates}, updated_at = NOW()
+            RETURNING (
+                NOT EXISTS (SELECT 1 FROM moved) AND NOT EXISTS (SELECT 1 FROM existing)
+            ) AS is_insert
+        """
+
+    @observe_query
+    async def upsert_tender_cache(self, tenders: list[BoampTender]) -> tuple[int, int]:
+        """
+        Insère ou met à jour un lot d'avis dans tender_cache via COPY.
+
+        Le lot est copié (protocole COPY binaire d'asyncpg) dans une table
+        temporaire, puis fusionné en une seule instruction INSERT ... ON
+        CONFLICT : une requête par lot au lieu d'une par ligne.
+
+        Args:
+            tenders: Avis à écrire (dédupliqués par identifiant, le dernier gagne)
+
+        Returns:
+            Tuple (nombre insérés, nombre mis à jour)
+        """
+        if not tenders:
+            return 0, 0
+
+        # ON CONFLICT ne peut pas modifier deux fois la même ligne
+        unique = {tender.id: tender for tender in tenders}
+        records = [
+            tuple(
+                json.dumps(row["raw_data"], ensure_ascii=False)
+                if column == "raw_data"
+                else row[column]
+                for column in TENDER_CACHE_COLUMNS
+            )
+            for row in (tender.model_dump() for tender in unique.values())
+        ]
+        columns = ", ".join(TENDER_CACHE_COLUMNS)
+        updates = ", ".join(
+            f"{column} = EXCLUDED.{column}" for column in TENDER_CACHE_COLUMNS if column != "id"
+        )
+
+        async with self._begin() as conn:
+            await conn.execute(
+                text("""
+                    CREATE TEMP TABLE tender_cache_stage
+                        (LIKE tender_cache INCLUDING DEFAULTS) ON COMMIT DROP
+                """)
+            )
+            raw = await conn.get_raw_connection()
+            driver = raw.driver_connection
+            if driver is None:
+                raise RuntimeError("asyncpg connection unavailable for COPY")
+            await driver.copy_records_to_table(
+                "tender_cache_stage", records=records, columns=TENDER_CACHE_COLUMNS
+            )
+            result = await conn.execute(
+                text(f"""
+                    WITH upserted AS (
+                        INSERT INTO tender_cache ({columns})
+                        SELECT {columns} FROM tender_cache_stage
+                        ON CONFLICT (id) DO UPDATE SET {updates}, updated_at = NOW()
+                        RETURNING (xmax = 0) AS is_insert
+                    )
+                    SELECT COUNT(*) FILTER (WHERE is_insert),
+                           COUNT(*) FILTER (WHERE NOT is_insert)
+                    FROM upserted
+                """)
+            )
+            inserted, updated = result.one()
+
+        self._log.info(
+            "Tender cache upserted",
+            inserted=inserted,
+            updated=updated,
+            total=len(records),
+        )
+        return inserted, updated
+
+    @observe_query
+    async def get_tenders(
+        self,
+        filters: TenderFilter | None = None,
+        page: int = 1,
+        limit: int = 20,
+        reference_time: datetime | None = None,
+    ) -> PaginatedResponse[Tender]:
+        """
+        Récupère les appels d'offres avec filtres et pagination.
+
+        Args:
+            filters: Filtres optionnels
+            page: Numéro de page (1-indexed)
+            limit: Nombre de résultats par page
+            reference_time: Si fourni, les champs dérivés days_until_deadline
+                et is_expired sont calculés en SQL par rapport à cette heure
+                et portés par chaque ligne
+
+        Returns:
+            PaginatedResponse avec les Tender trouvés
+        """
+        where_sql, params = self._build_where(filters)
+
+        # Compter le total
+        count_sql = f"SELECT COUNT(*) FROM ted_tenders {where_sql}"
+
+        async with self._connect(read_only=True) as conn:
+            result = await conn.execute(text(count_sql), params)
+            total = result.scalar() or 0
+
+            # Récupérer les résultats
+            offset = (page - 1) * limit
+            select_sql = f"""
+                SELECT {self._select_columns(reference_time)} FROM ted_tenders
+                {where_sql}
+                ORDER BY publication_date DESC, deadline ASC
+                LIMIT :limit OFFSET :offset
+            """
+            params["limit"] = limit
+            params["offset"] = offset
+            if reference_time is not None:
+                params["reference_time"] = reference_time
+
+            result = await conn.execute(text(select_sql), params)
+            rows = result.fetchall()
+
+            tenders = [self._row_to_tender(row) for row in rows]
+
+        return PaginatedResponse(
+            total=total,
+            page=page,
+            limit=limit,
+            items=tenders,
+        )
+
+    @observe_query
+    async def search_tenders(
+        self,
+        filters: SearchFilter | None = None,
+        page: int = 1,
+        limit: int = 20,
+    ) -> PaginatedResponse[SearchTender]:
+        """
+        Recherche les avis de toutes les sources (vue tender_search).
+
+        Une seule requête (plus le comptage) au lieu d'une par source, triée
+        par date de publication.
+
+        Args:
+            filters: Filtres optionnels (sources, CPV, texte, déduplication JOUE)
+            page: Numéro de page (1-indexed)
+            limit: Nombre de résultats par page
+
+        Returns:
+            PaginatedResponse avec les SearchTender trouvés
+        """
+        where_sql, params = self._build_search_where(filters)
+
+        async with self._connect(read_only=True) as conn:
+            result = await conn.execute(
+                text(f"SELECT COUNT(*) FROM tender_search {where_sql}"), params
+            )
+            total = result.scalar() or 0
+
+            params["limit"] = limit
+            params["offset"] = (page - 1) * limit
+            result = await conn.execute(
+                text(f"""
+                    SELECT * FROM tender_search
+                    {where_sql}
+                    ORDER BY publication_date DESC, id
+                    LIMIT :limit OFFSET :offset
+                """),
+                params,
+            )
+            items = [self._row_to_search_tender(row) for row in result.fetchall()]
+
+        return PaginatedResponse(total=total, page=page, limit=limit, items=items)
+
+    async def iter_tenders(
+        self,
+        filters: TenderFilter | None = None,
+        batch_size: int = 1000,
+        reference_time: datetime | None = None,
+    ) -> AsyncIterator[list[Tender]]:
+        """
+        Parcourt tous les appels d'offres filtrés, par lots.
+
+        Utilise un curseur serveur: la mémoire reste constante quelle que
+        soit la taille du résultat (pas de COUNT ni d'OFFSET).
+
+        Args:
+            filters: Filtres optionnels
+            batch_size: Nombre de lignes par lot
+            reference_time: Heure de référence des champs dérivés calculés en SQL
+
+        Yields:
+            Lots de Tender (au plus batch_size éléments)
+        """
+        where_sql, params = self._build_where(filters)
+        if reference_time is not None:
+            params["reference_time"] = reference_time
+
+        sql = f"""
+            SELECT {self._select_columns(reference_time)} FROM ted_tenders
+            {where_sql}
+            ORDER BY publication_date DESC, notice_id
+        """
+        async for rows in self._stream_rows(
+            "iter_tenders", sql, params, batch_size, read_only=True
+        ):
+            yield [self._row_to_tender(row) for row in rows]
+
+    @observe_query
+    async def get_tender_by_id(self, notice_id: str) -> Tender | None:
+        """
+        Récupère un appel d'offres par son ID.
+
+        Args:
+            notice_id: Identifiant de la notice
+
+        Returns:
+            Tender ou None si non trouvé
+        """
+        async with self._connect(read_only=True) as conn:
+            result = await conn.execute(
+                text("SELECT * FROM ted_tenders WHERE notice_id = :id"),
+                {"id": notice_id},
+            )
+            row = result.fetchone()
+
+            if row is None:
+                return None
+
+            return self._row_to_tender(row)
+
+    @observe_query
+    async def get_tender_with_version(self, notice_id: str) -> tuple[Tender, datetime] | None:
+        """
+        Récupère un appel d'offres et sa date de modification, lus dans la même ligne.
+
+        Args:
+            notice_id: Identifiant de la notice
+
+        Returns:
+            Tuple (Tender, date de modification) ou None si non trouvé
+        """
+        async with self._connect(read_only=True) as conn:
+            result = await conn.execute(
+                text(f"""
+                    SELECT *, {TENDER_VERSION_SQL} AS version_at
+                    FROM ted_tenders WHERE notice_id = :id
+                """),
+                {"id": notice_id},
+            )
+            row = result.fetchone()
+
+        if row is None:
+            return None
+        return self._row_to_tender(row), row.version_at
+
+    @observe_query
+    async def get_tender_updated_at(self, notice_id: str) -> datetime | None:
+        """
+        Date de modification d'un appel d'offres, sans lire la ligne complète.
+
+        Lecture sur le primaire : la valeur sert de référence aux ETag.
+
+        Args:
+            notice_id: Identifiant de la notice
+
+        Returns:
+            Date de modification ou None si non trouvé
+        """
+        async with self._connect() as conn:
+            result = await conn.execute(
+                text(f"SELECT {TENDER_VERSION_SQL} FROM ted_tenders WHERE notice_id = :id"),
+                {"id": notice_id},
+            )
+            return result.scalar()
+
+    async def get_new_tenders_since(self, since: datetime) -> list[Tender]:
         """
         Récupère les nouvelles notices depuis une date.
 
@@ -264,7 +1731,7 @@ class TenderDatabase:
         Returns:
             Liste des nouvelles Tender
         """
-        async with self.engine.connect() as conn:
+        async with self._connect() as conn:
             result = await conn.execute(
                 text("""
                     SELECT * FROM ted_tenders
@@ -275,41 +1742,154 @@ class TenderDatabase:
             )
             rows = result.fetchall()
 
-            return [self._row_to_tender(row) for row in rows]
+        return [self._row_to_tender(row) for row in rows]
 
-    async def get_expiring_tenders(self, days: int = 7) -> list[Tender]:
+    async def get_expiring_tenders(
+        self,
+        days: int = 7,
+        reference_time: datetime | None = None,
+    ) -> list[Tender]:
         """
         Récupère les appels d'offres qui expirent bientôt.
 
         Args:
             days: Nombre de jours avant expiration
+            reference_time: Heure de référence des champs dérivés calculés en SQL
 
         Returns:
             Liste des Tender expirant bientôt
         """
-        async with self.engine.connect() as conn:
+        params: dict[str, Any] = {"days": days}
+        if reference_time is not None:
+            params["reference_time"] = reference_time
+
+        async with self._connect(read_only=True) as conn:
             result = await conn.execute(
-                text("""
-                    SELECT * FROM ted_tenders
+                text(f"""
+                    SELECT {self._select_columns(reference_time)} FROM ted_tenders
                     WHERE deadline IS NOT NULL
                     AND deadline >= CURRENT_DATE
                     AND deadline <= CURRENT_DATE + :days * INTERVAL '1 day'
                     ORDER BY deadline ASC
                 """),
-                {"days": days},
+                params,
             )
             rows = result.fetchall()
 
-            return [self._row_to_tender(row) for row in rows]
+        return [self._row_to_tender(row) for row in rows]
 
-    async def delete_expired_tenders(self) -> int:
+    @observe_query
+    async def get_deadline_window(self, start: date, days: int) -> tuple[int, list[Tender]]:
+        """
+        Récupère les notices dont la deadline tombe dans une fenêtre de jours.
+
+        Lecture sur le primaire : la version (séquence ted_tenders_changes)
+        est lue avant les lignes, qui incluent donc toutes les écritures
+        qu'elle couvre (voir _tenders_changed).
+
+        Args:
+            start: Premier jour de la fenêtre (UTC)
+            days: Nombre de jours de la fenêtre
+
+        Returns:
+            Tuple (version des données, Tender par deadline croissante)
+        """
+        window_start = datetime.combine(start, datetime.min.time(), tzinfo=UTC)
+        params = {
+            "start": window_start,
+            "end": window_start + timedelta(days=days),
+        }
+        async with self._connect() as conn:
+            version = await self._read_tenders_changes(conn)
+            result = await conn.execute(
+                text("""
+                    SELECT * FROM ted_tenders
+                    WHERE deadline IS NOT NULL
+                    AND deadline >= :start
+                    AND deadline < :end
+                    ORDER BY deadline ASC, notice_id ASC
+                """),
+                params,
+            )
+            rows = result.fetchall()
+        return version, [self._row_to_tender(row) for row in rows]
+
+    @observe_query
+    async def get_tenders_changes(self) -> int:
+        """Version des données de ted_tenders, tous processus confondus."""
+        async with self._connect() as conn:
+            return await self._read_tenders_changes(conn)
+
+    @staticmethod
+    async def _read_tenders_changes(conn: AsyncConnection) -> int:
+        """Valeur courante de la séquence ted_tenders_changes (0 si jamais avancée)."""
+        result = await conn.execute(
+            text(f"""
+                SELECT CASE WHEN is_called THEN last_value ELSE 0 END
+                FROM {TED_CHANGES_SEQUENCE}
+            """)
+        )
+        return result.scalar() or 0
+
+    async def _tenders_changed(self, conn: AsyncConnection | None = None) -> None:
+        """
+        Hook d'invalidation, appelé après chaque écriture validée dans ted_tenders.
+
+        Avance la version locale (index en mémoire de ce processus) puis la
+        séquence ted_tenders_changes (autres processus). L'appel suit le
+        commit : une version lue garantit que les écritures qu'elle couvre
+        sont visibles. Best-effort : un échec est journalisé, les index se
+        reconstruisent de toute façon à échéance.
+
+        Args:
+            conn: Connexion de l'écriture, hors transaction ; sans elle, une
+                connexion est empruntée au pool
+        """
+        self._tenders_version += 1
+        try:
+            if conn is not None:
+                await self._publish_tenders_change(conn)
+            else:
+                async with self._connect() as conn:
+                    await self._publish_tenders_change(conn)
+        except Exception as e:
+            self._log.warning("Failed to publish ted_tenders change", error=str(e))
+
+    @staticmethod
+    async def _publish_tenders_change(conn: AsyncConnection) -> None:
+        """Avance la séquence ted_tenders_changes dans sa propre transaction."""
+        async with conn.begin():
+            await conn.execute(text(f"SELECT nextval('{TED_CHANGES_SEQUENCE}')"))
+
+    @observe_query
+    async def delete_expired_tenders(
+        self,
+        partition_retention_months: int = 6,
+        detach_partitions: bool = False,
+    ) -> int:
         """
         Supprime les appels d'offres expirés.
 
+        Si ted_tenders est partitionnée, les partitions entièrement expirées
+        sont d'abord retirées en bloc (voir expire_ted_partitions) ; le
+        DELETE ne porte alors que sur les partitions conservées.
+
+        Args:
+            partition_retention_months: Table partitionnée : mois de
+                publication conservés avant le mois courant
+            detach_partitions: Table partitionnée : détacher (archiver) les
+                partitions au lieu de les supprimer
+
         Returns:
             Nombre de notices supprimées
         """
-        async with self.engine.begin() as conn:
+        removed = 0
+        if self._ted_partitioned:
+            removed = await self.expire_ted_partitions(
+                partition_retention_months, mode="detach" if detach_partitions else "drop"
+            )
+
+        async with self._begin() as conn:
             result = await conn.execute(
                 text("""
                     DELETE FROM ted_tenders
@@ -317,77 +1897,552 @@ class TenderDatabase:
                     AND deadline < CURRENT_DATE
                 """)
             )
-            deleted = result.rowcount
-
-        if deleted > 0:
-            self._log.info("Expired tenders deleted", count=deleted)
+            deleted = result.rowcount
+
+        if deleted > 0:
+            self._log.info("Expired tenders deleted", count=deleted)
+            await self._tenders_changed()
+
+        return removed + deleted
+
+    @observe_query
+    async def get_stats(self) -> dict[str, Any]:
+        """
+        Récupère des statistiques sur les appels d'offres.
+
+        Returns:
+            Dictionnaire avec les stats
+        """
+        async with self._connect(read_only=True) as conn:
+            # Total
+            result = await conn.execute(
+                text("SELECT COUNT(*) FROM ted_tenders")
+            )
+            total = result.scalar() or 0
+
+            # Par pays
+            result = await conn.execute(
+                text("""
+                    SELECT buyer_country, COUNT(*) as count
+                    FROM ted_tenders
+                    GROUP BY buyer_country
+                    ORDER BY count DESC
+                    LIMIT 10
+                """)
+            )
+            by_country = {row[0]: row[1] for row in result.fetchall()}
+
+            # Actifs (deadline future)
+            result = await conn.execute(
+                text("""
+                    SELECT COUNT(*) FROM ted_tenders
+                    WHERE deadline IS NULL OR deadline >= CURRENT_DATE
+                """)
+            )
+            active = result.scalar() or 0
+
+            # Valeur totale
+            result = await conn.execute(
+                text("""
+                    SELECT SUM(estimated_value), AVG(estimated_value)
+                    FROM ted_tenders
+                    WHERE estimated_value IS NOT NULL
+                """)
+            )
+            row = result.fetchone()
+            total_value = row[0] if row else 0
+            avg_value = row[1] if row else 0
+
+        return {
+            "total": total,
+            "active": active,
+            "by_country": by_country,
+            "total_value": total_value,
+            "average_value": avg_value,
+        }
+
+    @observe_query
+    async def create_sync_run(self, country: str, trigger: str = "manual") -> int:
+        """
+        Enregistre le début d'une synchronisation.
+
+        À appeler sous le verrou du pays (acquire_sync_lock) : les exécutions
+        encore "running" pour ce pays ont été interrompues (processus arrêté)
+        et sont marquées comme telles.
+
+        Args:
+            country: Code pays synchronisé
+            trigger: Origine (manual, scheduled)
+
+        Returns:
+            Identifiant de l'exécution
+        """
+        async with self._begin() as conn:
+            await conn.execute(
+                text("""
+                    UPDATE sync_runs SET
+                        status = 'interrupted',
+                        finished_at = COALESCE(progress_at, started_at),
+                        error_message = 'Interrupted before completion'
+                    WHERE country = :country AND status = 'running'
+                """),
+                {"country": country},
+            )
+            result = await conn.execute(
+                text("""
+                    INSERT INTO sync_runs (country, trigger)
+                    VALUES (:country, :trigger)
+                    RETURNING id
+                """),
+                {"country": country, "trigger": trigger},
+            )
+            return int(result.scalar_one())
+
+    async def acquire_sync_lock(self, country: str) -> AdvisoryLock | None:
+        """
+        Tente de prendre le verrou de synchronisation d'un pays.
+
+        Le verrou est partagé par tous les workers et le daemon : une seule
+        synchronisation par pays à la fois. Il occupe une connexion du pool
+        jusqu'à sa libération.
+
+        Args:
+            country: Code pays
+
+        Returns:
+            AdvisoryLock à libérer, ou None si une synchronisation est en cours
+        """
+        return await self.try_advisory_lock(SYNC_LOCK_NAMESPACE, country)
+
+    async def advisory_lock(
+        self,
+        namespace: int,
+        key: str,
+        poll_interval: float = ADVISORY_LOCK_POLL_INTERVAL,
+    ) -> AdvisoryLock:
+        """
+        Prend un verrou consultatif de session, en attendant sa libération.
+
+        Attente par tentatives successives plutôt que pg_advisory_lock : une
+        requête bloquée garde un snapshot ouvert, que le CREATE INDEX
+        CONCURRENTLY d'une migration du détenteur attendrait indéfiniment.
+
+        Args:
+            namespace: Espace de clés (MIGRATION_LOCK_NAMESPACE)
+            key: Clé du verrou dans l'espace (hachée par hashtext)
+            poll_interval: Délai entre deux tentatives (secondes)
+
+        Returns:
+            AdvisoryLock à libérer
+        """
+        while True:
+            lock = await self.try_advisory_lock(namespace, key)
+            if lock is not None:
+                return lock
+            await asyncio.sleep(poll_interval)
+
+    async def try_advisory_lock(self, namespace: int, key: str) -> AdvisoryLock | None:
+        """
+        Tente de prendre un verrou consultatif de session sans attendre.
+
+        Args:
+            namespace: Espace de clés (SYNC_LOCK_NAMESPACE, LEADER_LOCK_NAMESPACE)
+            key: Clé du verrou dans l'espace (hachée par hashtext)
+
+        Returns:
+            AdvisoryLock à libérer, ou None si le verrou est déjà tenu
+        """
+        stack = AsyncExitStack()
+        conn = await stack.enter_async_context(self._connect())
+        try:
+            result = await conn.execute(
+                text("SELECT pg_try_advisory_lock(:namespace, hashtext(:key))"),
+                {"namespace": namespace, "key": key},
+            )
+            acquired = bool(result.scalar())
+            await conn.commit()
+        except BaseException:
+            await stack.aclose()
+            raise
+
+        if not acquired:
+            await stack.aclose()
+            return None
+        return AdvisoryLock(conn, stack, namespace, key)
+
+    @observe_query
+    async def update_sync_progress(
+        self,
+        run_id: int,
+        pages: int,
+        fetched: int,
+        inserted: int,
+        updated: int,
+        expected: int | None = None,
+        api_calls: int = 0,
+    ) -> None:
+        """
+        Met à jour la progression d'une synchronisation en cours.
+
+        Args:
+            run_id: Identifiant de l'exécution
+            pages: Pages TED récupérées
+            fetched: Notices converties
+            inserted: Notices insérées
+            updated: Notices mises à jour
+            expected: Notices attendues (annoncées par TED, bornées par max_results)
+            api_calls: Requêtes HTTP vers l'API TED
+        """
+        async with self._begin() as conn:
+            await conn.execute(
+                text("""
+                    UPDATE sync_runs SET
+                        pages = :pages,
+                        api_calls = :api_calls,
+                        fetched = :fetched,
+                        inserted = :inserted,
+                        updated = :updated,
+                        expected = COALESCE(:expected, expected),
+                        progress_at = NOW()
+                    WHERE id = :id AND status = 'running'
+                """),
+                {
+                    "id": run_id,
+                    "pages": pages,
+                    "api_calls": api_calls,
+                    "fetched": fetched,
+                    "inserted": inserted,
+                    "updated": updated,
+                    "expected": expected,
+                },
+            )
+
+    @observe_query
+    async def finish_sync_run(
+        self,
+        run_id: int,
+        report: SyncReport | None = None,
+        error: str | None = None,
+    ) -> None:
+        """
+        Enregistre la fin d'une synchronisation.
+
+        Args:
+            run_id: Identifiant de l'exécution
+            report: Rapport de la synchronisation (compteurs et phases)
+            error: Message d'erreur si la synchronisation a échoué
+        """
+        params: dict[str, Any] = {
+            "id": run_id,
+            "status": "error" if error is not None else "completed",
+            "error_message": error,
+            "elapsed_seconds": None,
+            "pages": 0,
+            "api_calls": 0,
+            "fetched": 0,
+            "inserted": 0,
+            "updated": 0,
+            "phases": "[]",
+        }
+        if report is not None:
+            params.update(
+                elapsed_seconds=report.elapsed_seconds,
+                pages=report.pages,
+                api_calls=report.api_calls,
+                fetched=report.fetched,
+                inserted=report.inserted,
+                updated=report.updated,
+                phases=json.dumps([p.model_dump() for p in report.phases]),
+            )
 
-        return deleted
+        async with self._begin() as conn:
+            await conn.execute(
+                text("""
+                    UPDATE sync_runs SET
+                        status = :status,
+                        finished_at = NOW(),
+                        elapsed_seconds = COALESCE(
+                            :elapsed_seconds,
+                            EXTRACT(EPOCH FROM NOW() - started_at)
+                        ),
+                        pages = :pages,
+                        api_calls = :api_calls,
+                        fetched = :fetched,
+                        inserted = :inserted,
+                        updated = :updated,
+                        phases = CAST(:phases AS JSONB),
+                        error_message = :error_message,
+                        progress_at = NOW()
+                    WHERE id = :id
+                """),
+                params,
+            )
 
-    async def get_stats(self) -> dict[str, Any]:
+    @observe_query
+    async def list_sync_runs(
+        self,
+        page: int = 1,
+        limit: int = 20,
+        country: str | None = None,
+        status: str | None = None,
+    ) -> PaginatedResponse[SyncRun]:
         """
-        Récupère des statistiques sur les appels d'offres.
+        Liste les synchronisations, de la plus récente à la plus ancienne.
+
+        Args:
+            page: Numéro de page (1-indexed)
+            limit: Nombre de résultats par page
+            country: Filtre optionnel sur le pays
+            status: Filtre optionnel sur le statut (completed, error, ...)
 
         Returns:
-            Dictionnaire avec les stats
+            PaginatedResponse de SyncRun
         """
-        async with self.engine.connect() as conn:
-            # Total
+        conditions = []
+        params: dict[str, Any] = {}
+        if country:
+            conditions.append("country = :country")
+            params["country"] = country
+        if status:
+            conditions.append("status = :status")
+            params["status"] = status
+        where_sql = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        async with self._connect() as conn:
             result = await conn.execute(
-                text("SELECT COUNT(*) FROM ted_tenders")
+                text(f"SELECT COUNT(*) FROM sync_runs {where_sql}"), params
             )
             total = result.scalar() or 0
 
-            # Par pays
             result = await conn.execute(
-                text("""
-                    SELECT buyer_country, COUNT(*) as count
-                    FROM ted_tenders
-                    GROUP BY buyer_country
-                    ORDER BY count DESC
-                    LIMIT 10
-                """)
+                text(f"""
+                    SELECT * FROM sync_runs
+                    {where_sql}
+                    ORDER BY started_at DESC, id DESC
+                    LIMIT :limit OFFSET :offset
+                """),
+                {**params, "limit": limit, "offset": (page - 1) * limit},
             )
-            by_country = {row[0]: row[1] for row in result.fetchall()}
+            runs = [self._row_to_sync_run(row) for row in result.fetchall()]
 
-            # Actifs (deadline future)
-            result = await conn.execute(
-                text("""
-                    SELECT COUNT(*) FROM ted_tenders
-                    WHERE deadline IS NULL OR deadline >= CURRENT_DATE
-                """)
-            )
-            active = result.scalar() or 0
+        return PaginatedResponse(total=total, page=page, limit=limit, items=runs)
 
-            # Valeur totale
+    @observe_query
+    async def get_sync_run(self, run_id: int) -> SyncRun | None:
+        """
+        Récupère une synchronisation par son identifiant.
+
+        Args:
+            run_id: Identifiant de l'exécution
+
+        Returns:
+            SyncRun ou None si non trouvée
+        """
+        async with self._connect() as conn:
             result = await conn.execute(
-                text("""
-                    SELECT SUM(estimated_value), AVG(estimated_value)
-                    FROM ted_tenders
-                    WHERE estimated_value IS NOT NULL
-                """)
+                text("SELECT * FROM sync_runs WHERE id = :id"), {"id": run_id}
             )
             row = result.fetchone()
-            total_value = row[0] if row else 0
-            avg_value = row[1] if row else 0
 
-        return {
-            "total": total,
-            "active": active,
-            "by_country": by_country,
-            "total_value": total_value,
-            "average_value": avg_value,
-        }
+        return self._row_to_sync_run(row) if row else None
 
+    @observe_query
     async def health_check(self) -> bool:
         """Vérifie la connexion à la base de données."""
         try:
-            async with self.engine.connect() as conn:
+            async with self._connect() as conn:
                 await conn.execute(text("SELECT 1"))
             return True
         except Exception:
             return False
 
+    async def _stream_rows(
+        self,
+        query: str,
+        sql: str,
+        params: dict[str, Any],
+        batch_size: int,
+        read_only: bool = False,
+    ) -> AsyncIterator[list[Any]]:
+        """
+        Exécute une requête sur un curseur serveur et produit les lignes par lots.
+
+        La latence enregistrée pour `query` ne compte que le temps passé côté
+        base (exécution et fetch des lots), pas celui du consommateur.
+
+        Args:
+            query: Nom de la requête pour les métriques
+            sql: Requête SELECT
+            params: Paramètres de la requête
+            batch_size: Nombre de lignes par lot
+            read_only: Lecture routable vers le réplica (voir _connect)
+
+        Yields:
+            Lots de lignes SQLAlchemy
+        """
+        elapsed = 0.0
+        try:
+            async with self._connect(read_only=read_only) as conn:
+                start = time.perf_counter()
+                result = await conn.stream(
+                    text(sql).execution_options(yield_per=batch_size),
+                    params,
+                )
+                partitions = result.partitions(batch_size)
+                elapsed += time.perf_counter() - start
+
+                while True:
+                    start = time.perf_counter()
+                    try:
+                        rows = await anext(partitions)
+                    except StopAsyncIteration:
+                        break
+                    finally:
+                        elapsed += time.perf_counter() - start
+                    yield list(rows)
+        finally:
+            DB_QUERY_LATENCY.labels(query).observe(elapsed)
+
+    @staticmethod
+    def _build_where(filters: TenderFilter | None) -> tuple[str, dict[str, Any]]:
+        """
+        Construit la clause WHERE correspondant à un TenderFilter.
+
+        Args:
+            filters: Filtres optionnels (None: aucun filtre, tous pays)
+
+        Returns:
+            Tuple (clause WHERE ou chaîne vide, paramètres)
+        """
+        if filters is None:
+            filters = TenderFilter(country=None)
+
+        where_clauses: list[str] = []
+        params: dict[str, Any] = {}
+
+        if filters.country:
+            where_clauses.append("buyer_country = :country")
+            params["country"] = filters.country
+
+        if filters.cpv:
+            if len(filters.cpv) >= CPV_CODE_LENGTH:
+                # Code complet : appartenance au tableau JSONB (index GIN idx_ted_cpv)
+                where_clauses.append("cpv_codes @> CAST(:cpv AS jsonb)")
+                params["cpv"] = json.dumps([filters.cpv])
+            else:
+                # Préfixe : parcours des codes de chaque ligne
+                where_clauses.append("""
+                    EXISTS (
+                        SELECT 1 FROM jsonb_array_elements_text(cpv_codes) AS code
+                        WHERE code LIKE :cpv_prefix
+                    )
+                """)
+                params["cpv_prefix"] = f"{filters.cpv}%"
+
+        if filters.min_value is not None:
+            where_clauses.append("estimated_value >= :min_value")
+            params["min_value"] = filters.min_value
+
+        if filters.max_value is not None:
+            where_clauses.append("estimated_value <= :max_value")
+            params["max_value"] = filters.max_value
+
+        if filters.days_remaining is not None:
+            where_clauses.append("deadline >= CURRENT_DATE")
+
+        if filters.search_text:
+            where_clauses.append(
+                "(title ILIKE :search OR description ILIKE :search)"
+            )
+            params["search"] = f"%{filters.search_text}%"
+
+        # Bornes sur la clé de partitionnement : élagage des partitions
+        if filters.published_from is not None:
+            where_clauses.append("publication_date >= :published_from")
+            params["published_from"] = datetime.combine(
+                filters.published_from, datetime.min.time(), tzinfo=UTC
+            )
+
+        if filters.published_to is not None:
+            where_clauses.append("publication_date < :published_before")
+            params["published_before"] = datetime.combine(
+                filters.published_to + timedelta(days=1), datetime.min.time(), tzinfo=UTC
+            )
+
+        where_sql = ""
+        if where_clauses:
+            where_sql = "WHERE " + " AND ".join(where_clauses)
+        return where_sql, params
+
+    @staticmethod
+    def _build_search_where(filters: SearchFilter | None) -> tuple[str, dict[str, Any]]:
+        """
+        Construit la clause WHERE de la vue tender_search.
+
+        Args:
+            filters: Filtres optionnels (défaut: SearchFilter())
+
+        Returns:
+            Tuple (clause WHERE ou chaîne vide, paramètres)
+        """
+        if filters is None:
+            filters = SearchFilter()
+
+        where_clauses: list[str] = []
+        params: dict[str, Any] = {}
+
+        sources = set(filters.sources)
+        if sources != set(TENDER_SOURCES):
+            where_clauses.append("source = ANY(:sources)")
+            params["sources"] = sorted(sources)
+
+        # Avis BOAMP dont un doublon TED a été détecté : la notice TED fait foi
+        if filters.dedupe and {"TED", "BOAMP"} <= sources:
+            where_clauses.append("""
+                NOT (source = 'BOAMP' AND EXISTS (
+                    SELECT 1 FROM tender_duplicates d
+                    WHERE d.source = 'BOAMP' AND d.notice_id = tender_search.id
+                        AND d.duplicate_source = 'TED'
+                ))
+            """)
+
+        if filters.cpv:
+            where_clauses.append("cpv_codes @> CAST(:cpv AS jsonb)")
+            params["cpv"] = json.dumps([filters.cpv])
+
+        if filters.days_remaining is not None:
+            where_clauses.append("deadline >= NOW() + make_interval(days => :days_remaining)")
+            params["days_remaining"] = filters.days_remaining
+
+        if filters.search_text:
+            where_clauses.append("(title ILIKE :search OR description ILIKE :search)")
+            params["search"] = f"%{filters.search_text}%"
+
+        where_sql = ""
+        if where_clauses:
+            where_sql = "WHERE " + " AND ".join(where_clauses)
+        return where_sql, params
+
+    @staticmethod
+    def _row_to_search_tender(row: Any) -> SearchTender:
+        """Convertit une ligne de tender_search en SearchTender."""
+        data = dict(row._mapping)
+        cpv_codes = data.get("cpv_codes") or []
+        if isinstance(cpv_codes, str):
+            try:
+                cpv_codes = json.loads(cpv_codes)
+            except json.JSONDecodeError:
+                cpv_codes = []
+        data["cpv_codes"] = cpv_codes
+        return SearchTender.model_validate(data)
+
+    @staticmethod
+    def _select_columns(reference_time: datetime | None) -> str:
+        """Colonnes SELECT, avec les champs dérivés si une heure est fournie."""
+        if reference_time is None:
+            return "*"
+        return f"*, {DERIVED_COLUMNS_SQL}"
+
     def _tender_to_row(self, tender: Tender) -> dict[str, Any]:
         """Convertit un Tender en dict pour insertion SQL."""
         return {
@@ -429,7 +2484,7 @@ class TenderDatabase:
             except json.JSONDecodeError:
                 cpv_codes = []
 
-        return Tender(
+        tender = Tender(
             notice_id=data["notice_id"],
             title=data["title"],
             description=data.get("description"),
@@ -445,6 +2500,322 @@ class TenderDatabase:
             url=data["url"],
         )
 
+        # Champs dérivés calculés en SQL (si présents dans la ligne)
+        if any(key in data for key in DERIVED_TENDER_FIELDS):
+            tender.set_derived_fields(data)
+
+        return tender
+
+    @observe_query
+    async def save_fingerprints(self, fingerprints: list[TenderFingerprint]) -> None:
+        """
+        Enregistre (ou remplace) les empreintes de déduplication d'un lot.
+
+        Args:
+            fingerprints: Empreintes à écrire
+        """
+        if not fingerprints:
+            return
+        async with self._begin() as conn:
+            await conn.execute(
+                text("""
+                    INSERT INTO tender_fingerprints
+                        (source, notice_id, blocking_key, signature, updated_at)
+                    VALUES (:source, :notice_id, :blocking_key, :signature, NOW())
+                    ON CONFLICT (source, notice_id) DO UPDATE SET
+                        blocking_key = EXCLUDED.blocking_key,
+                        signature = EXCLUDED.signature,
+                        updated_at = NOW()
+                """),
+                [fingerprint.model_dump() for fingerprint in fingerprints],
+            )
+
+    @observe_query
+    async def delete_fingerprints(self, source: str, notice_ids: list[str]) -> None:
+        """
+        Retire les empreintes et les doublons d'avis devenus non bloquables.
+
+        Args:
+            source: Source des avis (TED, BOAMP)
+            notice_ids: Identifiants des avis dans leur source
+        """
+        if not notice_ids:
+            return
+        params = {"source": source, "ids": notice_ids}
+        async with self._begin() as conn:
+            await conn.execute(
+                text("""
+                    DELETE FROM tender_fingerprints
+                    WHERE source = :source AND notice_id = ANY(CAST(:ids AS text[]))
+                """),
+                params,
+            )
+            await conn.execute(
+                text("""
+                    DELETE FROM tender_duplicates
+                    WHERE (source = :source AND notice_id = ANY(CAST(:ids AS text[])))
+                    OR (
+                        duplicate_source = :source
+                        AND duplicate_notice_id = ANY(CAST(:ids AS text[]))
+                    )
+                """),
+                params,
+            )
+
+    @observe_query
+    async def get_fingerprints(self, blocking_keys: set[str]) -> list[TenderFingerprint]:
+        """
+        Récupère les empreintes partageant l'une des clés de blocage.
+
+        Args:
+            blocking_keys: Clés de blocage recherchées
+
+        Returns:
+            Empreintes de toutes sources (index idx_tender_fingerprints_block)
+        """
+        if not blocking_keys:
+            return []
+        async with self._connect() as conn:
+            result = await conn.execute(
+                text("""
+                    SELECT source, notice_id, blocking_key, signature
+                    FROM tender_fingerprints
+                    WHERE blocking_key = ANY(CAST(:keys AS text[]))
+                """),
+                {"keys": sorted(blocking_keys)},
+            )
+            return [
+                TenderFingerprint.model_validate(dict(row._mapping))
+                for row in result.fetchall()
+            ]
+
+    @observe_query
+    async def save_duplicates(
+        self,
+        fingerprints: list[TenderFingerprint],
+        matches: list[tuple[TenderFingerprint, TenderFingerprint, float]],
+    ) -> None:
+        """
+        Remplace les doublons connus des avis d'un lot.
+
+        Les paires existantes de ces avis sont supprimées (titre, acheteur ou
+        date limite ont pu changer), puis chaque paire est écrite dans les
+        deux sens.
+
+        Args:
+            fingerprints: Empreintes du lot réindexé
+            matches: Paires (avis du lot, doublon, similarité)
+        """
+        if not fingerprints:
+            return
+        params = {
+            "sources": [fp.source for fp in fingerprints],
+            "ids": [fp.notice_id for fp in fingerprints],
+        }
+        rows = [
+            {
+                "source": left.source,
+                "notice_id": left.notice_id,
+                "duplicate_source": right.source,
+                "duplicate_notice_id": right.notice_id,
+                "similarity": similarity,
+            }
+            for a, b, similarity in matches
+            for left, right in ((a, b), (b, a))
+        ]
+        async with self._begin() as conn:
+            await conn.execute(
+                text("""
+                    DELETE FROM tender_duplicates
+                    WHERE (source, notice_id) IN (
+                        SELECT * FROM unnest(
+                            CAST(:sources AS text[]), CAST(:ids AS text[])
+                        )
+                    )
+                    OR (duplicate_source, duplicate_notice_id) IN (
+                        SELECT * FROM unnest(
+                            CAST(:sources AS text[]), CAST(:ids AS text[])
+                        )
+                    )
+                """),
+                params,
+            )
+            if rows:
+                await conn.execute(
+                    text("""
+                        INSERT INTO tender_duplicates
+                            (source, notice_id, duplicate_source,
+                             duplicate_notice_id, similarity)
+                        VALUES (:source, :notice_id, :duplicate_source,
+                                :duplicate_notice_id, :similarity)
+                        ON CONFLICT (source, notice_id, duplicate_source, duplicate_notice_id)
+                        DO UPDATE SET similarity = EXCLUDED.similarity, detected_at = NOW()
+                    """),
+                    rows,
+                )
+
+    @observe_query
+    async def get_duplicates(self, source: str, notice_id: str) -> list[TenderDuplicate]:
+        """
+        Récupère les doublons détectés d'un avis dans les autres sources.
+
+        Args:
+            source: Source de l'avis (TED, BOAMP)
+            notice_id: Identifiant de l'avis dans sa source
+
+        Returns:
+            Doublons, du plus similaire au moins similaire
+        """
+        async with self._connect(read_only=True) as conn:
+            result = await conn.execute(
+                text("""
+                    SELECT duplicate_source AS source, duplicate_notice_id AS notice_id,
+                           similarity, detected_at
+                    FROM tender_duplicates
+                    WHERE source = :source AND notice_id = :notice_id
+                    ORDER BY similarity DESC, duplicate_notice_id
+                """),
+                {"source": source, "notice_id": notice_id},
+            )
+            return [
+                TenderDuplicate.model_validate(dict(row._mapping))
+                for row in result.fetchall()
+            ]
+
+    @observe_query
+    async def get_sync_checkpoint(
+        self, fingerprint: str, max_age_seconds: float
+    ) -> SyncCheckpoint | None:
+        """
+        Récupère le checkpoint d'une pagination s'il est assez récent.
+
+        Args:
+            fingerprint: Empreinte de la pagination
+            max_age_seconds: Âge maximal au-delà duquel les pages ont pu bouger
+
+        Returns:
+            SyncCheckpoint ou None
+        """
+        async with self._connect() as conn:
+            result = await conn.execute(
+                text("""
+                    SELECT fingerprint, country, query, last_page, fetched, run_id,
+                           iteration_token, updated_at
+                    FROM sync_checkpoints
+                    WHERE fingerprint = :fingerprint
+                      AND updated_at >= NOW() - make_interval(secs => :max_age)
+                """),
+                {"fingerprint": fingerprint, "max_age": max_age_seconds},
+            )
+            row = result.fetchone()
+        return SyncCheckpoint(**row._mapping) if row else None
+
+    @observe_query
+    async def save_sync_checkpoint(self, checkpoint: SyncCheckpoint) -> None:
+        """
+        Enregistre la dernière page entièrement upsert d'une pagination.
+
+        Args:
+            checkpoint: Checkpoint à enregistrer
+        """
+        async with self._begin() as conn:
+            await conn.execute(
+                text("""
+                    INSERT INTO sync_checkpoints (
+                        fingerprint, country, query, last_page, fetched, run_id,
+                        iteration_token
+                    ) VALUES (
+                        :fingerprint, :country, :query, :last_page, :fetched, :run_id,
+                        :iteration_token
+                    )
+                    ON CONFLICT (fingerprint) DO UPDATE SET
+                        last_page = EXCLUDED.last_page,
+                        fetched = EXCLUDED.fetched,
+                        run_id = EXCLUDED.run_id,
+                        iteration_token = EXCLUDED.iteration_token,
+                        updated_at = NOW()
+                """),
+                checkpoint.model_dump(exclude={"updated_at"}),
+            )
+
+    @observe_query
+    async def delete_sync_checkpoint(self, fingerprint: str) -> None:
+        """
+        Supprime le checkpoint d'une pagination terminée.
+
+        Args:
+            fingerprint: Empreinte de la pagination
+        """
+        async with self._begin() as conn:
+            await conn.execute(
+                text("DELETE FROM sync_checkpoints WHERE fingerprint = :fingerprint"),
+                {"fingerprint": fingerprint},
+            )
+
+    @observe_query
+    async def get_backfill_checkpoints(self, country: str) -> list[BackfillCheckpoint]:
+        """
+        Récupère l'avancement des fenêtres de backfill d'un pays.
+
+        Args:
+            country: Code pays
+
+        Returns:
+            Liste des BackfillCheckpoint, par date de début
+        """
+        async with self._connect() as conn:
+            result = await conn.execute(
+                text("""
+                    SELECT country, window_start, window_end, status, last_page,
+                           fetched, inserted, updated, error_message, iteration_token
+                    FROM backfill_checkpoints
+                    WHERE country = :country
+                    ORDER BY window_start
+                """),
+                {"country": country},
+            )
+            return [BackfillCheckpoint(**row._mapping) for row in result.fetchall()]
+
+    @observe_query
+    async def save_backfill_checkpoint(self, checkpoint: BackfillCheckpoint) -> None:
+        """
+        Enregistre l'avancement d'une fenêtre de backfill.
+
+        Args:
+            checkpoint: Avancement de la fenêtre
+        """
+        async with self._begin() as conn:
+            await conn.execute(
+                text("""
+                    INSERT INTO backfill_checkpoints (
+                        country, window_start, window_end, status, last_page,
+                        fetched, inserted, updated, error_message, iteration_token
+                    ) VALUES (
+                        :country, :window_start, :window_end, :status, :last_page,
+                        :fetched, :inserted, :updated, :error_message, :iteration_token
+                    )
+                    ON CONFLICT (country, window_start, window_end) DO UPDATE SET
+                        status = EXCLUDED.status,
+                        last_page = EXCLUDED.last_page,
+                        fetched = EXCLUDED.fetched,
+                        inserted = EXCLUDED.inserted,
+                        updated = EXCLUDED.updated,
+                        error_message = EXCLUDED.error_message,
+                        iteration_token = EXCLUDED.iteration_token,
+                        updated_at = NOW()
+                """),
+                checkpoint.model_dump(),
+            )
+
+    @staticmethod
+    def _row_to_sync_run(row: Any) -> SyncRun:
+        """Convertit une ligne sync_runs en SyncRun."""
+        data = dict(row._mapping)
+        phases = data.pop("phases") or []
+        if isinstance(phases, str):
+            phases = json.loads(phases)
+        return SyncRun(**data, phases=[SyncPhase(**phase) for phase in phases])
+
 
 async def get_database(settings: Settings) -> TenderDatabase:
     """
@@ -456,6 +2827,12 @@ async def get_database(settings: Settings) -> TenderDatabase:
     Returns:
         TenderDatabase initialisée
     """
-    db = TenderDatabase(settings.async_database_url)
+    db = TenderDatabase(
+        settings.async_database_url,
+        engine_options=settings.database_engine_options,
+        replica_url=settings.async_database_replica_url,
+        replica_max_lag=settings.db_replica_max_lag,
+        replica_check_interval=settings.db_replica_check_interval,
+    )
     await db.init_schema()
     return db
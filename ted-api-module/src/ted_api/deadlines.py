@@ -0,0 +1,176 @@
+"""
+Index en mémoire des appels d'offres par jour de deadline.
+
+GET /api/tenders/expiring est interrogé en continu (widgets d'alerte, days
+de 1 à 30). Au lieu d'un parcours d'index et d'une validation Tender par
+appel, les notices dont la deadline tombe dans les MAX_EXPIRING_DAYS
+prochains jours sont lues en une requête et rangées par jour : toute valeur
+de days est servie en concaténant des seaux, sans requête.
+
+L'index est reconstruit à la requête suivante :
+- au changement de jour (minuit) ;
+- après une écriture dans ted_tenders (upsert, suppression, archivage) :
+  version locale de TenderDatabase pour ce processus, séquence
+  ted_tenders_changes (contrôlée au plus une fois par check_interval) pour
+  une synchronisation exécutée dans un autre processus ;
+- au-delà de max_age, si une invalidation a été perdue.
+"""
+
+import asyncio
+import time
+from datetime import UTC, date, datetime, timedelta
+
+import structlog
+
+from ted_api.database import TenderDatabase
+from ted_api.models import Tender
+
+logger = structlog.get_logger(__name__)
+
+# Horizon maximal de GET /api/tenders/expiring (paramètre days)
+MAX_EXPIRING_DAYS = 30
+
+
+def deadline_utc(deadline: datetime) -> datetime:
+    """Deadline en datetime naive UTC (convention des champs calculés de Tender)."""
+    if deadline.tzinfo is not None:
+        deadline = deadline.astimezone(UTC).replace(tzinfo=None)
+    return deadline
+
+
+class DeadlineBucketIndex:
+    """
+    Notices expirant bientôt, rangées par jour de deadline (UTC).
+
+    Les Tender sont partagés entre les requêtes : leurs champs calculés
+    (days_until_deadline, is_expired) sont évalués à la sérialisation,
+    par rapport à l'heure de la requête.
+    """
+
+    def __init__(
+        self,
+        db: TenderDatabase,
+        horizon_days: int = MAX_EXPIRING_DAYS,
+        check_interval: float = 10.0,
+        max_age: float = 3600.0,
+    ) -> None:
+        """
+        Initialise un index vide (construit à la première requête).
+
+        Args:
+            db: Base de données
+            horizon_days: Valeur maximale de days servie
+            check_interval: Intervalle de contrôle de la version de
+                ted_tenders (secondes)
+            max_age: Âge maximal de l'index avant reconstruction (secondes)
+        """
+        self.db = db
+        self.horizon_days = horizon_days
+        self.check_interval = check_interval
+        self.max_age = max_age
+        self._buckets: dict[date, list[Tender]] = {}
+        self._day: date | None = None
+        self._version: int | None = None
+        self._local_version = -1
+        self._built_at = 0.0
+        self._checked_at = 0.0
+        self._lock = asyncio.Lock()
+        self._log = logger.bind(component="DeadlineBucketIndex")
+
+    def invalidate(self) -> None:
+        """Force la reconstruction à la prochaine requête."""
+        self._day = None
+
+    async def get(self, days: int, now: datetime | None = None) -> list[Tender]:
+        """
+        Notices dont la deadline est comprise entre aujourd'hui 00:00 et J+days 00:00.
+
+        Même fenêtre que TenderDatabase.get_expiring_tenders (deadlines
+        passées du jour incluses, bornes incluses).
+
+        Args:
+            days: Nombre de jours (1 à horizon_days)
+            now: Heure de la requête, naive UTC (défaut: maintenant)
+
+        Returns:
+            Liste des Tender par deadline croissante
+        """
+        if not 1 <= days <= self.horizon_days:
+            raise ValueError(f"days must be between 1 and {self.horizon_days}")
+        if now is None:
+            now = datetime.now(UTC).replace(tzinfo=None)
+        today = now.date()
+        await self._refresh(today)
+
+        tenders: list[Tender] = []
+        for offset in range(days):
+            tenders.extend(self._buckets.get(today + timedelta(days=offset), ()))
+        # Borne haute incluse : deadlines à J+days 00:00 pile
+        last_day = today + timedelta(days=days)
+        end = datetime.combine(last_day, datetime.min.time())
+        tenders.extend(
+            t
+            for t in self._buckets.get(last_day, ())
+            if t.deadline is not None and deadline_utc(t.deadline) <= end
+        )
+        return tenders
+
+    async def _refresh(self, today: date) -> None:
+        """Reconstruit l'index s'il est périmé (une seule reconstruction concurrente)."""
+        requested = time.monotonic()
+        if not await self._is_stale(today):
+            return
+        async with self._lock:
+            # Reconstruit par une autre requête pendant l'attente du verrou
+            if self._built_at >= requested and self._day == today:
+                return
+            await self.rebuild(today)
+
+    async def _is_stale(self, today: date) -> bool:
+        """Indique si l'index doit être reconstruit."""
+        if self._day != today or self._local_version != self.db.tenders_version:
+            return True
+        now = time.monotonic()
+        if now - self._built_at >= self.max_age:
+            return True
+        if now - self._checked_at < self.check_interval:
+            return False
+        self._checked_at = now
+        try:
+            version = await self.db.get_tenders_changes()
+        except Exception as e:
+            # Index conservé : servir des données légèrement anciennes plutôt qu'une 503
+            self._log.warning("Failed to check ted_tenders version", error=str(e))
+            return False
+        return version != self._version
+
+    async def rebuild(self, today: date | None = None) -> None:
+        """
+        Relit les notices de la fenêtre et remplace les seaux.
+
+        Args:
+            today: Premier jour de la fenêtre (défaut: aujourd'hui, UTC)
+        """
+        if today is None:
+            today = datetime.now(UTC).date()
+        # Version locale lue avant la requête : une écriture concurrente
+        # déclenchera une nouvelle reconstruction
+        local_version = self.db.tenders_version
+        version, tenders = await self.db.get_deadline_window(today, self.horizon_days + 1)
+
+        buckets: dict[date, list[Tender]] = {}
+        for tender in tenders:
+            if tender.deadline is not None:
+                buckets.setdefault(deadline_utc(tender.deadline).date(), []).append(tender)
+
+        self._buckets = buckets
+        self._day = today
+        self._version = version
+        self._local_version = local_version
+        self._built_at = self._checked_at = time.monotonic()
+        self._log.info(
+            "Deadline bucket index rebuilt",
+            day=today.isoformat(),
+            tenders=len(tenders),
+            version=version,
+        )
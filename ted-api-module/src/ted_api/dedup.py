@@ -0,0 +1,247 @@
+"""
+Détection des doublons entre sources (BOAMP / TED).
+
+Les avis français au-dessus des seuils européens sont publiés au BOAMP
+(tender_cache.is_joue) et sur TED (ted_tenders). Chaque avis reçoit une
+empreinte :
+- une clé de blocage (acheteur normalisé, date limite, division CPV) : seuls
+  les avis partageant cette clé sont comparés ;
+- une signature MinHash des trigrammes de caractères du titre, qui estime
+  leur similarité de Jaccard sans recomparer les titres.
+
+Les empreintes sont stockées dans tender_fingerprints (indexée par clé de
+blocage) : chaque lot ingéré n'est comparé qu'aux avis de ses blocs, au lieu
+d'une comparaison de tous les avis deux à deux. Les paires retenues sont
+enregistrées dans tender_duplicates.
+"""
+
+import hashlib
+import random
+import re
+import unicodedata
+from datetime import UTC, datetime
+
+import structlog
+
+from ted_api.database import TenderDatabase
+from ted_api.models import BoampTender, Tender, TenderFingerprint
+
+logger = structlog.get_logger(__name__)
+
+# Fonctions de hachage de la signature MinHash (erreur d'estimation ~ 1/sqrt(n))
+MINHASH_PERMUTATIONS = 64
+
+# Premier de Mersenne 2^31 - 1 : les valeurs tiennent dans un INTEGER PostgreSQL
+MINHASH_PRIME = (1 << 31) - 1
+
+# Graine fixe : les signatures doivent être identiques entre processus
+MINHASH_SEED = 7_310_043
+
+# Taille des shingles de caractères du titre
+SHINGLE_SIZE = 3
+
+# Similarité estimée minimale pour déclarer deux avis d'un même bloc doublons
+DEDUP_SIMILARITY_THRESHOLD = 0.5
+
+# Mots vides retirés des noms d'acheteurs ("Ministère des Armées")
+_BUYER_STOPWORDS = frozenset({"de", "des", "du", "la", "le", "les", "d", "l", "et"})
+
+_rng = random.Random(MINHASH_SEED)
+_MINHASH_COEFFICIENTS: tuple[tuple[int, int], ...] = tuple(
+    (_rng.randrange(1, MINHASH_PRIME), _rng.randrange(0, MINHASH_PRIME))
+    for _ in range(MINHASH_PERMUTATIONS)
+)
+
+
+def normalize_text(value: str) -> str:
+    """Minuscules sans accents ni ponctuation, espaces simples."""
+    decomposed = unicodedata.normalize("NFKD", value)
+    ascii_text = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", ascii_text.lower()).split())
+
+
+def normalize_buyer(name: str) -> str:
+    """Nom d'acheteur normalisé, sans mots vides."""
+    return " ".join(w for w in normalize_text(name).split() if w not in _BUYER_STOPWORDS)
+
+
+def blocking_key(
+    buyer_name: str | None, deadline: datetime | None, cpv: str | None
+) -> str | None:
+    """
+    Clé de blocage : acheteur normalisé, date limite (UTC), division CPV.
+
+    Args:
+        buyer_name: Nom de l'acheteur
+        deadline: Date limite de réponse
+        cpv: Code CPV principal
+
+    Returns:
+        Clé "acheteur|AAAA-MM-JJ|division", ou None si un élément manque
+    """
+    if not buyer_name or deadline is None or not cpv:
+        return None
+    buyer = normalize_buyer(buyer_name)
+    division = re.sub(r"\D", "", cpv)[:2]
+    if not buyer or len(division) < 2:
+        return None
+    if deadline.tzinfo is not None:
+        deadline = deadline.astimezone(UTC)
+    return f"{buyer}|{deadline.date().isoformat()}|{division}"
+
+
+def title_shingles(title: str) -> set[str]:
+    """Trigrammes de caractères du titre normalisé."""
+    text = normalize_text(title)
+    if len(text) <= SHINGLE_SIZE:
+        return {text} if text else set()
+    return {text[i : i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+
+
+def minhash_signature(shingles: set[str]) -> list[int]:
+    """
+    Signature MinHash d'un ensemble de shingles.
+
+    Args:
+        shingles: Shingles du titre
+
+    Returns:
+        MINHASH_PERMUTATIONS minima (vide si aucun shingle)
+    """
+    if not shingles:
+        return []
+    hashes = [
+        int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), "big")
+        for s in shingles
+    ]
+    return [
+        min((a * h + b) % MINHASH_PRIME for h in hashes)
+        for a, b in _MINHASH_COEFFICIENTS
+    ]
+
+
+def signature_similarity(left: list[int], right: list[int]) -> float:
+    """Similarité de Jaccard estimée : part des minima identiques."""
+    if not left or len(left) != len(right):
+        return 0.0
+    return sum(a == b for a, b in zip(left, right, strict=True)) / len(left)
+
+
+def _fingerprint(
+    source: str,
+    notice_id: str,
+    title: str,
+    buyer_name: str | None,
+    deadline: datetime | None,
+    cpv: str | None,
+) -> TenderFingerprint | None:
+    """Empreinte d'un avis, ou None s'il ne peut pas être bloqué."""
+    key = blocking_key(buyer_name, deadline, cpv)
+    signature = minhash_signature(title_shingles(title))
+    if key is None or not signature:
+        return None
+    return TenderFingerprint(
+        source=source, notice_id=notice_id, blocking_key=key, signature=signature
+    )
+
+
+def fingerprint_tender(tender: Tender) -> TenderFingerprint | None:
+    """Empreinte d'une notice TED (CPV principal : premier code)."""
+    return _fingerprint(
+        "TED",
+        tender.notice_id,
+        tender.title,
+        tender.buyer_name,
+        tender.deadline,
+        tender.cpv_codes[0] if tender.cpv_codes else None,
+    )
+
+
+def fingerprint_boamp(tender: BoampTender) -> TenderFingerprint | None:
+    """Empreinte d'un avis BOAMP."""
+    return _fingerprint(
+        "BOAMP",
+        tender.id,
+        tender.title,
+        tender.buyer_name,
+        tender.deadline_date,
+        tender.cpv,
+    )
+
+
+def match_fingerprints(
+    fingerprints: list[TenderFingerprint],
+    candidates: list[TenderFingerprint],
+    threshold: float = DEDUP_SIMILARITY_THRESHOLD,
+) -> list[tuple[TenderFingerprint, TenderFingerprint, float]]:
+    """
+    Apparie les empreintes aux candidats d'une autre source du même bloc.
+
+    Args:
+        fingerprints: Empreintes des avis ingérés
+        candidates: Empreintes existantes partageant leurs clés de blocage
+        threshold: Similarité estimée minimale
+
+    Returns:
+        Paires (avis ingéré, doublon, similarité)
+    """
+    blocks: dict[str, list[TenderFingerprint]] = {}
+    for candidate in candidates:
+        blocks.setdefault(candidate.blocking_key, []).append(candidate)
+
+    matches: list[tuple[TenderFingerprint, TenderFingerprint, float]] = []
+    for fingerprint in fingerprints:
+        for candidate in blocks.get(fingerprint.blocking_key, ()):
+            if candidate.source == fingerprint.source:
+                continue
+            similarity = signature_similarity(fingerprint.signature, candidate.signature)
+            if similarity >= threshold:
+                matches.append((fingerprint, candidate, similarity))
+    return matches
+
+
+async def index_duplicates(
+    db: TenderDatabase,
+    source: str,
+    fingerprints: dict[str, TenderFingerprint | None],
+    threshold: float = DEDUP_SIMILARITY_THRESHOLD,
+) -> int:
+    """
+    Enregistre les empreintes d'un lot ingéré et ses doublons entre sources.
+
+    Un avis devenu non bloquable (deadline ou acheteur retiré par une mise à
+    jour) perd son empreinte et ses doublons : il n'est plus masqué de la
+    recherche par une paire détectée sur sa version précédente.
+
+    Best-effort : un échec est journalisé sans interrompre l'ingestion (les
+    avis sont déjà écrits ; ils seront réindexés à leur prochaine mise à jour).
+
+    Args:
+        db: Base de données
+        source: Source des avis du lot (TED, BOAMP)
+        fingerprints: Empreinte par identifiant d'avis (None pour les avis
+            non bloquables) ; un avis présent deux fois dans le lot ne garde
+            que sa dernière version
+        threshold: Similarité estimée minimale
+
+    Returns:
+        Nombre de paires de doublons enregistrées
+    """
+    batch = [fp for fp in fingerprints.values() if fp is not None]
+    unindexed = [notice_id for notice_id, fp in fingerprints.items() if fp is None]
+    matches: list[tuple[TenderFingerprint, TenderFingerprint, float]] = []
+    try:
+        if unindexed:
+            await db.delete_fingerprints(source, unindexed)
+        if batch:
+            await db.save_fingerprints(batch)
+            candidates = await db.get_fingerprints({fp.blocking_key for fp in batch})
+            matches = match_fingerprints(batch, candidates, threshold)
+            await db.save_duplicates(batch, matches)
+    except Exception as e:
+        logger.warning("Failed to index duplicates", notices=len(fingerprints), error=str(e))
+        return 0
+    if matches:
+        logger.info("Cross-source duplicates detected", pairs=len(matches))
+    return len(matches)
+
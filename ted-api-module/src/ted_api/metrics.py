@@ -0,0 +1,238 @@
+"""
+Métriques Prometheus du module TED API.
+
+Centralise la définition des métriques exposées sur /metrics:
+- Client TED: latence par code HTTP, retries, rate limits (429)
+- Cache: hits/misses et latence par backend
+- Base de données: latence par requête, attente de checkout du pool
+- Synchronisation: durée, lignes récupérées/insérées/mises à jour
+- HTTP: latence par route
+
+En mode multi-workers (uvicorn --workers), définir PROMETHEUS_MULTIPROC_DIR
+pour agréger les métriques de tous les processus.
+"""
+
+import functools
+import os
+import time
+from collections.abc import Callable, Coroutine
+from typing import Any, ParamSpec, TypeVar
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+# Buckets adaptés aux appels réseau (TED API, sync)
+NETWORK_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+# Buckets adaptés aux opérations locales (cache, requêtes SQL, checkout)
+FAST_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+SYNC_BUCKETS = (1.0, 5.0, 15.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0, 3600.0)
+
+# ----- Client TED -----
+TED_REQUEST_LATENCY = Histogram(
+    "ted_api_request_duration_seconds",
+    "Latence des requêtes vers l'API TED (par tentative)",
+    ["status"],
+    buckets=NETWORK_BUCKETS,
+)
+TED_REQUEST_RETRIES = Counter(
+    "ted_api_request_retries_total",
+    "Nombre de nouvelles tentatives vers l'API TED",
+)
+TED_RATE_LIMITED = Counter(
+    "ted_api_rate_limited_total",
+    "Nombre de réponses 429 reçues de l'API TED",
+)
+
+# ----- Cache -----
+CACHE_REQUESTS = Counter(
+    "ted_cache_requests_total",
+    "Lectures du cache par résultat (hit/miss)",
+    ["backend", "result"],
+)
+CACHE_LATENCY = Histogram(
+    "ted_cache_operation_duration_seconds",
+    "Latence des opérations de cache",
+    ["backend", "operation"],
+    buckets=FAST_BUCKETS,
+)
+
+# ----- Base de données -----
+DB_QUERY_LATENCY = Histogram(
+    "ted_db_query_duration_seconds",
+    "Latence des requêtes SQL par méthode de TenderDatabase",
+    ["query"],
+    buckets=FAST_BUCKETS,
+)
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "ted_db_pool_checkout_wait_seconds",
+    "Temps d'attente pour obtenir une connexion du pool",
+    buckets=FAST_BUCKETS,
+)
+DB_POOL_CHECKOUT_TIMEOUTS = Counter(
+    "ted_db_pool_checkout_timeouts_total",
+    "Checkouts abandonnés après db_pool_timeout",
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "ted_db_pool_checked_out",
+    "Connexions actuellement empruntées au pool",
+    multiprocess_mode="livesum",
+)
+DB_POOL_CAPACITY = Gauge(
+    "ted_db_pool_capacity",
+    "Connexions maximales du pool (pool_size + max_overflow)",
+    multiprocess_mode="livesum",
+)
+DB_POOL_WAITING = Gauge(
+    "ted_db_pool_waiting",
+    "Coroutines en attente d'une connexion",
+    multiprocess_mode="livesum",
+)
+DB_REPLICA_AVAILABLE = Gauge(
+    "ted_db_replica_available",
+    "Réplica en lecture utilisé (joignable et retard toléré) : 1, sinon 0",
+    multiprocess_mode="livemin",
+)
+DB_REPLICA_LAG = Gauge(
+    "ted_db_replica_lag_seconds",
+    "Retard de réplication mesuré au dernier contrôle du réplica",
+    multiprocess_mode="livemax",
+)
+
+# ----- Synchronisation -----
+SYNC_DURATION = Histogram(
+    "ted_sync_duration_seconds",
+    "Durée des synchronisations",
+    ["country", "status"],
+    buckets=SYNC_BUCKETS,
+)
+SYNC_ROWS = Counter(
+    "ted_sync_rows_total",
+    "Lignes traitées par la synchronisation",
+    ["country", "operation"],
+)
+SYNC_LAST_SUCCESS = Gauge(
+    "ted_sync_last_success_timestamp_seconds",
+    "Timestamp Unix de la dernière synchronisation réussie",
+    ["country"],
+    multiprocess_mode="max",
+)
+
+# ----- HTTP -----
+HTTP_REQUEST_LATENCY = Histogram(
+    "ted_http_request_duration_seconds",
+    "Latence des requêtes HTTP par route",
+    ["method", "route", "status"],
+    buckets=NETWORK_BUCKETS,
+)
+
+
+def observe_cache(
+    operation: str,
+) -> Callable[
+    [Callable[P, Coroutine[Any, Any, T]]], Callable[P, Coroutine[Any, Any, T]]
+]:
+    """
+    Décorateur mesurant une opération d'un CacheBackend.
+
+    Le backend est identifié par le nom de classe. Pour "get", un résultat
+    None compte comme miss.
+
+    Args:
+        operation: Nom de l'opération (get, set, ...)
+
+    Returns:
+        Décorateur pour une méthode async de CacheBackend
+    """
+
+    def decorator(
+        func: Callable[P, Coroutine[Any, Any, T]],
+    ) -> Callable[P, Coroutine[Any, Any, T]]:
+        @functools.wraps(func)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+            # args[0] : instance du CacheBackend
+            backend = type(args[0]).__name__
+            start = time.perf_counter()
+            result = await func(*args, **kwargs)
+            CACHE_LATENCY.labels(backend, operation).observe(time.perf_counter() - start)
+            if operation == "get":
+                CACHE_REQUESTS.labels(backend, "miss" if result is None else "hit").inc()
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def observe_query(
+    func: Callable[P, Coroutine[Any, Any, T]],
+) -> Callable[P, Coroutine[Any, Any, T]]:
+    """
+    Décorateur mesurant la latence d'une méthode async de TenderDatabase.
+
+    La requête est étiquetée par le nom de la méthode.
+    """
+    histogram = DB_QUERY_LATENCY.labels(func.__name__)
+
+    @functools.wraps(func)
+    async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+        start = time.perf_counter()
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            histogram.observe(time.perf_counter() - start)
+
+    return wrapper
+
+
+def record_sync(
+    country: str,
+    elapsed: float,
+    success: bool,
+    fetched: int = 0,
+    inserted: int = 0,
+    updated: int = 0,
+) -> None:
+    """
+    Enregistre le résultat d'une synchronisation.
+
+    Args:
+        country: Code pays synchronisé
+        elapsed: Durée en secondes
+        success: True si la synchronisation a abouti
+        fetched: Notices récupérées depuis TED
+        inserted: Notices insérées
+        updated: Notices mises à jour
+    """
+    SYNC_DURATION.labels(country, "success" if success else "error").observe(elapsed)
+    if not success:
+        return
+    SYNC_ROWS.labels(country, "fetched").inc(fetched)
+    SYNC_ROWS.labels(country, "inserted").inc(inserted)
+    SYNC_ROWS.labels(country, "updated").inc(updated)
+    SYNC_LAST_SUCCESS.labels(country).set_to_current_time()
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """
+    Sérialise les métriques au format texte Prometheus.
+
+    Returns:
+        Tuple (contenu, content-type)
+    """
+    registry = REGISTRY
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)  # type: ignore[no-untyped-call]
+    return generate_latest(registry), CONTENT_TYPE_LATEST
@@ -4,14 +4,88 @@ Modèles Pydantic pour les appels d'offres TED.
 Inclut la validation des données, conversion des dates et sérialisation JSON.
 """
 
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime, date
-from typing import Any, Generic, TypeVar
+from typing import Any, Generic, Literal, TypeVar, cast
 
-from pydantic import BaseModel, Field, computed_field, field_validator, model_validator
+from pydantic import (
+    BaseModel,
+    Field,
+    PrivateAttr,
+    computed_field,
+    field_validator,
+    model_validator,
+)
 
 
 T = TypeVar("T")
 
+# Heure de référence partagée par tous les Tender d'une même réponse
+_reference_time: ContextVar[datetime | None] = ContextVar("_reference_time", default=None)
+
+# Champs dérivés pouvant être précalculés (en SQL) et portés par la ligne
+DERIVED_TENDER_FIELDS: tuple[str, ...] = (
+    "days_until_deadline",
+    "is_expired",
+    "formatted_value",
+)
+
+
+@contextmanager
+def reference_time(now: datetime | None = None) -> Iterator[datetime]:
+    """
+    Fixe l'heure de référence des champs calculés pour un bloc de sérialisation.
+
+    Tous les Tender sérialisés dans le bloc utilisent la même heure,
+    capturée une seule fois, au lieu d'appeler datetime.now() par modèle.
+
+    Args:
+        now: Heure de référence (défaut: datetime.now())
+
+    Yields:
+        L'heure de référence utilisée
+    """
+    if now is None:
+        now = datetime.now()
+    token = _reference_time.set(now)
+    try:
+        yield now
+    finally:
+        _reference_time.reset(token)
+
+
+def _current_time() -> datetime:
+    """Retourne l'heure de référence courante (ou datetime.now())."""
+    return _reference_time.get() or datetime.now()
+
+
+def _naive(value: datetime) -> datetime:
+    """Retire le fuseau horaire pour comparer avec une datetime naive."""
+    return value.replace(tzinfo=None) if value.tzinfo else value
+
+
+def _days_until(deadline: datetime | None, now: datetime) -> int | None:
+    """Jours restants avant la deadline (négatif si passée)."""
+    if deadline is None:
+        return None
+    return (_naive(deadline) - now).days
+
+
+def _is_past(deadline: datetime | None, now: datetime) -> bool:
+    """Vérifie si la deadline est passée."""
+    if deadline is None:
+        return False
+    return now > _naive(deadline)
+
+
+def _format_value(value: float | None, currency: str | None) -> str | None:
+    """Formate une valeur avec sa devise (ex: "250,000.00 EUR")."""
+    if value is None:
+        return None
+    return f"{value:,.2f} {currency or 'EUR'}"
+
 
 class Tender(BaseModel):
     """
@@ -47,6 +121,9 @@ class Tender(BaseModel):
     place_of_performance: str | None = Field(None, description="Lieu d'exécution (NUTS)")
     url: str = Field(..., description="URL de la notice TED")
 
+    # Valeurs dérivées précalculées (ex: par la requête SQL), prioritaires
+    _derived: dict[str, Any] = PrivateAttr(default_factory=dict)
+
     @field_validator("deadline", "publication_date", mode="before")
     @classmethod
     def parse_ted_date(cls, v: Any) -> datetime | None:
@@ -133,32 +210,47 @@ class Tender(BaseModel):
             Nombre de jours restants, None si pas de deadline,
             négatif si la deadline est passée.
         """
-        if self.deadline is None:
-            return None
-        # Utiliser une datetime naive pour la comparaison
-        now = datetime.now()
-        deadline_naive = self.deadline.replace(tzinfo=None) if self.deadline.tzinfo else self.deadline
-        delta = deadline_naive - now
-        return delta.days
+        derived = self._precomputed()
+        if "days_until_deadline" in derived:
+            return cast(int | None, derived["days_until_deadline"])
+        return _days_until(self.deadline, _current_time())
 
     @computed_field  # type: ignore[misc]
     @property
     def is_expired(self) -> bool:
         """Vérifie si l'appel d'offres est expiré."""
-        if self.deadline is None:
-            return False
-        now = datetime.now()
-        deadline_naive = self.deadline.replace(tzinfo=None) if self.deadline.tzinfo else self.deadline
-        return now > deadline_naive
+        derived = self._precomputed()
+        if "is_expired" in derived:
+            return cast(bool, derived["is_expired"])
+        return _is_past(self.deadline, _current_time())
 
     @computed_field  # type: ignore[misc]
     @property
     def formatted_value(self) -> str | None:
         """Retourne la valeur formatée avec devise."""
-        if self.estimated_value is None:
-            return None
-        currency = self.currency or "EUR"
-        return f"{self.estimated_value:,.2f} {currency}"
+        derived = self._precomputed()
+        if "formatted_value" in derived:
+            return cast(str | None, derived["formatted_value"])
+        return _format_value(self.estimated_value, self.currency)
+
+    def _precomputed(self) -> dict[str, Any]:
+        """Valeurs dérivées précalculées (accès direct, sans __getattr__)."""
+        private = self.__pydantic_private__
+        return private["_derived"] if private else {}
+
+    def set_derived_fields(self, values: dict[str, Any]) -> None:
+        """
+        Attache des valeurs dérivées précalculées (ex: colonnes SQL).
+
+        Les clés absentes de DERIVED_TENDER_FIELDS sont ignorées. Les valeurs
+        sont figées: elles ne suivent pas une modification ultérieure du modèle.
+
+        Args:
+            values: Dictionnaire {champ dérivé: valeur}
+        """
+        self._derived = {
+            key: values[key] for key in DERIVED_TENDER_FIELDS if key in values
+        }
 
     class Config:
         json_schema_extra = {
@@ -214,6 +306,14 @@ class TenderFilter(BaseModel):
         default=None,
         description="Recherche full-text dans titre et description",
     )
+    published_from: date | None = Field(
+        default=None,
+        description="Première date de publication (incluse)",
+    )
+    published_to: date | None = Field(
+        default=None,
+        description="Dernière date de publication (incluse)",
+    )
 
     @model_validator(mode="after")
     def validate_value_range(self) -> "TenderFilter":
@@ -224,6 +324,65 @@ class TenderFilter(BaseModel):
         return self
 
 
+# Sources de la recherche unifiée (vue tender_search)
+TenderSource = Literal["TED", "BOAMP", "PLACE"]
+TENDER_SOURCES: tuple[TenderSource, ...] = ("TED", "BOAMP", "PLACE")
+
+
+class SearchTender(BaseModel):
+    """
+    Avis d'une source quelconque, tel que lu dans la vue tender_search.
+
+    Attributes:
+        id: Identifiant dans la source (notice TED, idweb BOAMP, id PLACE)
+        source: Source de l'avis (TED, BOAMP, PLACE)
+        location: Lieu (pays TED, département BOAMP, lieu PLACE)
+        cpv_codes: Codes CPV (CPV principal seul pour BOAMP)
+        is_joue: Avis BOAMP également publié au JOUE (donc sur TED)
+    """
+
+    id: str = Field(..., description="Identifiant dans la source")
+    source: TenderSource = Field(..., description="Source de l'avis")
+    title: str = Field(..., description="Titre/objet du marché")
+    description: str | None = Field(None, description="Description")
+    buyer_name: str | None = Field(None, description="Acheteur")
+    location: str | None = Field(None, description="Pays, département ou lieu")
+    publication_date: datetime = Field(..., description="Date de publication")
+    deadline: datetime | None = Field(None, description="Date limite de réponse")
+    procedure_type: str | None = Field(None, description="Type de procédure")
+    cpv_codes: list[str] = Field(default_factory=list, description="Codes CPV")
+    estimated_value: float | None = Field(None, description="Valeur estimée (TED)")
+    url: str | None = Field(None, description="URL de l'avis")
+    is_joue: bool = Field(False, description="Publié au JOUE")
+
+
+class SearchFilter(BaseModel):
+    """
+    Filtres de la recherche unifiée toutes sources.
+
+    Tous les filtres sont optionnels et cumulatifs (AND).
+    """
+
+    sources: list[TenderSource] = Field(
+        default_factory=lambda: list(TENDER_SOURCES),
+        description="Sources interrogées (défaut: toutes)",
+    )
+    cpv: str | None = Field(None, description="Code CPV (ex: 30000000)")
+    days_remaining: int | None = Field(
+        default=None,
+        ge=0,
+        description="Nombre minimum de jours restants avant deadline",
+    )
+    search_text: str | None = Field(None, description="Recherche dans titre et description")
+    dedupe: bool = Field(
+        True,
+        description=(
+            "Masquer les avis BOAMP dont un doublon TED a été détecté lorsque "
+            "TED est interrogé (l'avis TED fait foi)"
+        ),
+    )
+
+
 class PaginatedResponse(BaseModel, Generic[T]):
     """
     Réponse paginée générique.
@@ -275,6 +434,132 @@ class TEDAPIResponse(BaseModel):
     notices: list[dict[str, Any]] = Field(
         default_factory=list, description="Notices brutes"
     )
+    iteration_next_token: str | None = Field(
+        default=None, description="Jeton de la page suivante (pagination ITERATION)"
+    )
+
+
+# Phases d'attente de la file producteur/consommateur : elles se recouvrent
+# avec le travail de l'autre côté et ne peuvent pas être le goulot.
+WAIT_PHASE_PREFIX = "sync.queue"
+
+
+def sync_bottleneck(phases: list["SyncPhase"]) -> str | None:
+    """
+    Retourne la phase de travail la plus coûteuse.
+
+    Args:
+        phases: Phases d'une synchronisation
+
+    Returns:
+        Nom de la phase, ou None si aucune phase de travail
+    """
+    work = [p for p in phases if not p.name.startswith(WAIT_PHASE_PREFIX)]
+    if not work:
+        return None
+    return max(work, key=lambda p: p.total_seconds).name
+
+
+class SyncPhase(BaseModel):
+    """Durée cumulée d'une phase de synchronisation."""
+
+    name: str = Field(..., description="Nom de la phase (ted.fetch_page, sync.parse, ...)")
+    count: int = Field(0, description="Nombre d'occurrences")
+    total_seconds: float = Field(0.0, description="Durée cumulée (secondes)")
+    max_seconds: float = Field(0.0, description="Occurrence la plus longue (secondes)")
+
+
+class SyncReport(BaseModel):
+    """Rapport détaillé d'une synchronisation (durées par phase)."""
+
+    run_id: int | None = Field(None, description="Identifiant dans sync_runs")
+    country: str = Field(..., description="Code pays synchronisé")
+    started_at: datetime = Field(..., description="Début de la synchronisation")
+    elapsed_seconds: float = Field(..., description="Durée totale (secondes)")
+    pages: int = Field(0, description="Pages TED récupérées")
+    api_calls: int = Field(0, description="Requêtes HTTP vers l'API TED (retries inclus)")
+    fetched: int = Field(0, description="Notices converties")
+    inserted: int = Field(0, description="Notices insérées")
+    updated: int = Field(0, description="Notices mises à jour")
+    phases: list[SyncPhase] = Field(
+        default_factory=list, description="Phases, de la plus coûteuse à la moins coûteuse"
+    )
+    bottleneck: str | None = Field(
+        None, description="Phase de travail la plus coûteuse (hors attentes de file)"
+    )
+
+
+class SyncRun(BaseModel):
+    """Exécution de synchronisation enregistrée dans la table sync_runs."""
+
+    id: int = Field(..., description="Identifiant de l'exécution")
+    country: str = Field(..., description="Code pays synchronisé")
+    trigger: str = Field(..., description="Origine (manual, scheduled)")
+    status: str = Field(
+        ..., description="Statut (running, completed, error, interrupted)"
+    )
+    started_at: datetime = Field(..., description="Début")
+    finished_at: datetime | None = Field(None, description="Fin")
+    elapsed_seconds: float | None = Field(None, description="Durée totale (secondes)")
+    pages: int = Field(0, description="Pages TED récupérées")
+    api_calls: int = Field(0, description="Requêtes HTTP vers l'API TED (retries inclus)")
+    fetched: int = Field(0, description="Notices converties")
+    inserted: int = Field(0, description="Notices insérées")
+    updated: int = Field(0, description="Notices mises à jour")
+    phases: list[SyncPhase] = Field(default_factory=list, description="Durées par phase")
+    error_message: str | None = Field(None, description="Message d'erreur si échec")
+    expected: int | None = Field(
+        None, description="Notices attendues (total TED borné par max_results)"
+    )
+    progress_at: datetime | None = Field(None, description="Dernière mise à jour de progression")
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def progress(self) -> float | None:
+        """Avancement (0-1) : notices upsert sur notices attendues."""
+        if self.status == "completed":
+            return 1.0
+        if not self.expected:
+            return None
+        return min((self.inserted + self.updated) / self.expected, 1.0)
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def eta_seconds(self) -> float | None:
+        """Temps restant estimé d'une exécution en cours, au débit observé."""
+        if self.status != "running" or not self.expected or self.progress_at is None:
+            return None
+        done = self.inserted + self.updated
+        elapsed = (self.progress_at - self.started_at).total_seconds()
+        if done == 0 or elapsed <= 0:
+            return None
+        return max(self.expected - done, 0) * elapsed / done
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def rows_per_second(self) -> float | None:
+        """Débit de la synchronisation (notices converties par seconde)."""
+        if not self.elapsed_seconds:
+            return None
+        return self.fetched / self.elapsed_seconds
+
+    def to_report(self) -> SyncReport | None:
+        """Rapport équivalent, ou None si l'exécution n'est pas terminée."""
+        if self.elapsed_seconds is None:
+            return None
+        return SyncReport(
+            run_id=self.id,
+            country=self.country,
+            started_at=self.started_at,
+            elapsed_seconds=self.elapsed_seconds,
+            pages=self.pages,
+            api_calls=self.api_calls,
+            fetched=self.fetched,
+            inserted=self.inserted,
+            updated=self.updated,
+            phases=self.phases,
+            bottleneck=sync_bottleneck(self.phases),
+        )
 
 
 class SyncStatus(BaseModel):
@@ -285,6 +570,90 @@ class SyncStatus(BaseModel):
     new_notices: int = Field(0, description="Nouvelles notices depuis dernière sync")
     status: str = Field("idle", description="Statut (idle, running, error)")
     error_message: str | None = Field(None, description="Message d'erreur si échec")
+    report: SyncReport | None = Field(None, description="Détail par phase de la dernière sync")
+
+
+class SyncCheckpoint(BaseModel):
+    """Dernière page TED entièrement upsert d'une synchronisation interrompue."""
+
+    fingerprint: str = Field(..., description="Empreinte de la pagination (sha256)")
+    country: str = Field(..., description="Code pays")
+    query: str = Field(..., description="Requête TED")
+    last_page: int = Field(0, description="Dernière page dont toutes les notices sont upsert")
+    fetched: int = Field(0, description="Notices converties jusqu'à last_page incluse")
+    run_id: int | None = Field(None, description="Exécution ayant écrit le checkpoint")
+    iteration_token: str | None = Field(
+        None, description="Jeton TED de la page suivante (pagination ITERATION)"
+    )
+    updated_at: datetime | None = Field(None, description="Date du checkpoint")
+
+
+class BackfillCheckpoint(BaseModel):
+    """Avancement d'une fenêtre de backfill (table backfill_checkpoints)."""
+
+    country: str = Field(..., description="Code pays")
+    window_start: date = Field(..., description="Première date de publication (incluse)")
+    window_end: date = Field(..., description="Dernière date de publication (incluse)")
+    status: str = Field("pending", description="Statut (pending, running, completed, error)")
+    last_page: int = Field(0, description="Dernière page TED traitée")
+    fetched: int = Field(0, description="Notices converties")
+    inserted: int = Field(0, description="Notices insérées")
+    updated: int = Field(0, description="Notices mises à jour")
+    error_message: str | None = Field(None, description="Message d'erreur si échec")
+    iteration_token: str | None = Field(
+        None, description="Jeton TED de la page suivante (pagination ITERATION)"
+    )
+
+
+class BoampTender(BaseModel):
+    """
+    Avis BOAMP au format de la table partagée tender_cache (source BOAMP).
+
+    Colonnes alignées sur l'écriture de veille-boamp (src/lib/cache.ts).
+    """
+
+    id: str = Field(..., max_length=100, description="Identifiant BOAMP (idweb)")
+    title: str = Field(..., description="Objet du marché")
+    description: str | None = Field(None, description="Description")
+    buyer_name: str | None = Field(None, max_length=500, description="Acheteur")
+    buyer_department: str | None = Field(None, max_length=200, description="Département")
+    publication_date: datetime = Field(..., description="Date de parution")
+    deadline_date: datetime | None = Field(None, description="Date limite de réponse")
+    procedure_type: str | None = Field(None, max_length=100, description="Procédure")
+    sectors: list[str] = Field(default_factory=list, description="Familles de marché")
+    boamp_url: str | None = Field(None, description="URL de l'avis")
+    cpv: str | None = Field(None, max_length=50, description="Code CPV principal")
+    market_nature: str | None = Field(
+        None, description="Nature (fournitures, services, travaux)"
+    )
+    amount_range: str | None = Field(
+        None, description="Fourchette de montant (small, medium, large, xlarge)"
+    )
+    is_joue: bool = Field(False, description="Publié au JOUE")
+    is_defense_equipment: bool = Field(False, description="CPV division 35")
+    source: str = Field("BOAMP", description="Source")
+    raw_data: dict[str, Any] = Field(default_factory=dict, description="Enregistrement brut")
+    expires_at: datetime | None = Field(None, description="Fin de diffusion")
+
+
+class TenderFingerprint(BaseModel):
+    """Empreinte de déduplication d'un avis (table tender_fingerprints)."""
+
+    source: TenderSource = Field(..., description="Source de l'avis")
+    notice_id: str = Field(..., description="Identifiant dans la source")
+    blocking_key: str = Field(
+        ..., description="Acheteur normalisé | date limite | division CPV"
+    )
+    signature: list[int] = Field(..., description="Signature MinHash du titre")
+
+
+class TenderDuplicate(BaseModel):
+    """Doublon détecté dans une autre source (table tender_duplicates)."""
+
+    source: TenderSource = Field(..., description="Source de l'avis doublon")
+    notice_id: str = Field(..., description="Identifiant de l'avis doublon")
+    similarity: float = Field(..., ge=0, le=1, description="Similarité estimée des titres")
+    detected_at: datetime | None = Field(None, description="Date de détection")
 
 
 # Champs TED v3 à récupérer par défaut
@@ -306,6 +675,21 @@ DEFAULT_TED_FIELDS: list[str] = [
     "links",           # Liens vers les documents
 ]
 
+# Profils de projection des champs TED : TI, buyer-name et links sont
+# multilingues (24 langues) et dominent la taille des pages de 100 notices.
+TED_FIELD_PROFILES: dict[str, list[str]] = {
+    # Détection de changements, comptages, vérification de syntaxe
+    "ids-only": ["ND"],
+    # Synchronisation : champs lus par ted_notice_to_tender, sans links
+    # (l'URL de détail se déduit de l'identifiant)
+    "listing": [
+        "ND", "TI", "publication-date", "buyer-name", "CY", "NC",
+        "DT", "RC", "TVH", "TVL", "PR",
+    ],
+    # Détail d'une notice
+    "full": DEFAULT_TED_FIELDS,
+}
+
 
 def _extract_multilingual_text(data: Any, preferred_lang: str = "fra") -> str:
     """
@@ -3,20 +3,28 @@ Planificateur de tâches pour la synchronisation TED.
 
 Utilise APScheduler pour exécuter une synchronisation quotidienne
 des appels d'offres depuis l'API TED.
+
+Plusieurs répliques peuvent tourner en parallèle : seule la réplique élue
+leader (voir ted_api.coordination) exécute la synchronisation planifiée,
+et un nouveau leader rattrape le créneau manqué si l'ancien est mort.
 """
 
 import asyncio
-from datetime import datetime
+from datetime import UTC, datetime, timedelta
 from typing import Callable
 
 import structlog
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 
 from ted_api.cache import CacheBackend, get_cache_backend_async
 from ted_api.client import TEDAPIClient, TEDAPIError
 from ted_api.config import Settings
-from ted_api.database import TenderDatabase
+from ted_api.coordination import LeaderElector
+from ted_api.database import TenderDatabase, add_months, month_start
+from ted_api.models import SyncReport
+from ted_api.sync import SyncAlreadyRunningError, run_sync_pipeline
 
 logger = structlog.get_logger(__name__)
 
@@ -35,6 +43,7 @@ class TenderSyncScheduler:
         client: Client API TED
         db: Base de données
         scheduler: APScheduler instance
+        elector: Élection du leader entre répliques
     """
 
     def __init__(
@@ -57,6 +66,9 @@ class TenderSyncScheduler:
         self.scheduler = AsyncIOScheduler()
         self._log = logger.bind(component="TenderSyncScheduler")
         self._on_sync_complete: list[Callable[[int, int], None]] = []
+        self.last_report: SyncReport | None = None
+        self.elector = LeaderElector(db, on_elected=self._on_elected)
+        self._sync_time: tuple[int, int] = (settings.sync_hour, settings.sync_minute)
 
     def add_sync_callback(self, callback: Callable[[int, int], None]) -> None:
         """
@@ -67,12 +79,17 @@ class TenderSyncScheduler:
         """
         self._on_sync_complete.append(callback)
 
-    async def sync_tenders(self, country: str | None = None) -> tuple[int, int]:
+    async def sync_tenders(
+        self,
+        country: str | None = None,
+        trigger: str = "manual",
+    ) -> tuple[int, int]:
         """
         Synchronise les appels d'offres depuis l'API TED.
 
         Args:
             country: Code pays (défaut: settings.ted_default_country)
+            trigger: Origine enregistrée dans sync_runs (manual, scheduled)
 
         Returns:
             Tuple (nombre insérés, nombre mis à jour)
@@ -81,34 +98,32 @@ class TenderSyncScheduler:
             country = self.settings.ted_default_country
 
         self._log.info("Starting tender sync", country=country)
-        start_time = datetime.now()
 
         try:
-            # Récupérer les appels d'offres actifs
-            tenders = await self.client.get_active_tenders(country=country)
-            self._log.info("Tenders fetched from TED API", count=len(tenders))
-
-            # Stocker en base
-            inserted, updated = await self.db.upsert_tenders(tenders)
+            report = await run_sync_pipeline(
+                self.client,
+                self.db,
+                country,
+                trigger=trigger,
+                callbacks=self._on_sync_complete,
+            )
+            self.last_report = report
 
-            elapsed = (datetime.now() - start_time).total_seconds()
             self._log.info(
                 "Tender sync completed",
                 country=country,
-                total=len(tenders),
-                inserted=inserted,
-                updated=updated,
-                elapsed_seconds=elapsed,
+                total=report.fetched,
+                inserted=report.inserted,
+                updated=report.updated,
+                elapsed_seconds=report.elapsed_seconds,
+                bottleneck=report.bottleneck,
             )
 
-            # Appeler les callbacks
-            for callback in self._on_sync_complete:
-                try:
-                    callback(inserted, updated)
-                except Exception as e:
-                    self._log.warning("Sync callback failed", error=str(e))
+            return report.inserted, report.updated
 
-            return inserted, updated
+        except SyncAlreadyRunningError:
+            self._log.warning("Sync already running for country, skipping", country=country)
+            raise
 
         except TEDAPIError as e:
             self._log.error(
@@ -128,11 +143,130 @@ class TenderSyncScheduler:
             raise
 
     async def _scheduled_sync(self) -> None:
-        """Tâche planifiée de synchronisation."""
+        """Tâche planifiée de synchronisation (leader uniquement)."""
+        if not self.elector.is_leader:
+            self._log.info("Not leader, skipping scheduled sync")
+            return
         try:
-            await self.sync_tenders()
+            await self.sync_tenders(trigger="scheduled")
+        except SyncAlreadyRunningError:
+            # Synchronisation déjà lancée par un worker API ou un autre daemon
+            pass
         except Exception as e:
             self._log.error("Scheduled sync failed", error=str(e))
+        await self.maintain_partitions()
+        await self.archive_expired()
+
+    async def maintain_partitions(self) -> None:
+        """
+        Entretien quotidien de ted_tenders partitionnée (leader uniquement).
+
+        Crée d'avance les partitions des prochains mois et, si l'archive est
+        désactivée, retire en bloc les partitions expirées. Sans effet si la
+        table n'est pas partitionnée.
+        """
+        if not self.db.ted_partitioned:
+            return
+        current = month_start(datetime.now(UTC))
+        removed = 0
+        try:
+            created = await self.db.ensure_ted_partitions(
+                add_months(current, offset)
+                for offset in range(self.settings.ted_partition_months_ahead + 1)
+            )
+            if not self.settings.ted_archive_enabled:
+                removed = await self.db.expire_ted_partitions(
+                    self.settings.ted_partition_retention_months,
+                    mode=self.settings.ted_partition_expiry,
+                )
+        except Exception as e:
+            self._log.error("Partition maintenance failed", error=str(e))
+            return
+        self._log.info("Partition maintenance done", created=created, removed=removed)
+
+    async def archive_expired(self) -> None:
+        """
+        Déplace les notices expirées vers ted_tenders_archive (leader uniquement).
+
+        Garde ted_tenders limitée aux notices utiles aux listes, sans perdre
+        l'historique. Sans effet si l'archive est désactivée.
+        """
+        if not self.settings.ted_archive_enabled:
+            return
+        try:
+            archived = await self.db.archive_expired_tenders(
+                batch_size=self.settings.ted_archive_batch_size,
+                partition_retention_months=self.settings.ted_partition_retention_months,
+            )
+        except Exception as e:
+            self._log.error("Archive maintenance failed", error=str(e))
+            return
+        self._log.info("Archive maintenance done", archived=archived)
+
+    async def _on_elected(self) -> None:
+        """Planifie le rattrapage hors du job d'élection (qui doit rester court)."""
+        self.scheduler.add_job(
+            self.catch_up,
+            id="ted_tender_sync_catch_up",
+            name="TED Tender Sync catch-up",
+            replace_existing=True,
+        )
+
+    def last_scheduled_time(self, now: datetime | None = None) -> datetime:
+        """
+        Calcule le dernier créneau de synchronisation planifiée écoulé.
+
+        Args:
+            now: Instant de référence (défaut: maintenant, heure locale)
+
+        Returns:
+            datetime du dernier créneau (fuseau local)
+        """
+        if now is None:
+            now = datetime.now().astimezone()
+        hour, minute = self._sync_time
+        slot = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        if slot > now:
+            slot -= timedelta(days=1)
+        return slot
+
+    async def catch_up(self, country: str | None = None) -> bool:
+        """
+        Rattrape le dernier créneau planifié si aucune synchronisation ne l'a couvert.
+
+        Appelé à chaque élection : si l'ancien leader est mort avant ou
+        pendant la synchronisation, aucune exécution "completed" n'existe
+        depuis le créneau. Sans historique (première installation), rien
+        n'est rattrapé.
+
+        Args:
+            country: Code pays (défaut: settings.ted_default_country)
+
+        Returns:
+            True si une synchronisation de rattrapage a été lancée
+        """
+        if not self.elector.is_leader:
+            return False
+        if country is None:
+            country = self.settings.ted_default_country
+
+        history = await self.db.list_sync_runs(page=1, limit=1, country=country)
+        if not history.items:
+            return False
+
+        slot = self.last_scheduled_time()
+        completed = await self.db.list_sync_runs(
+            page=1, limit=1, country=country, status="completed"
+        )
+        if completed.items and completed.items[0].started_at >= slot:
+            return False
+
+        self._log.info("Catching up missed scheduled sync", country=country, slot=slot)
+        try:
+            await self.sync_tenders(country=country, trigger="catch-up")
+        except SyncAlreadyRunningError:
+            return False
+        return True
 
     def start(
         self,
@@ -155,6 +289,8 @@ class TenderSyncScheduler:
         if minute is None:
             minute = self.settings.sync_minute
 
+        self._sync_time = (hour, minute)
+
         # Configurer la tâche cron
         trigger = CronTrigger(hour=hour, minute=minute)
 
@@ -166,6 +302,18 @@ class TenderSyncScheduler:
             replace_existing=True,
         )
 
+        # Élection du leader : immédiatement puis à intervalle régulier
+        self.scheduler.add_job(
+            self.elector.campaign,
+            trigger=IntervalTrigger(seconds=self.settings.sync_leader_interval),
+            id="ted_leader_election",
+            name="TED Sync leader election",
+            next_run_time=datetime.now(),
+            max_instances=1,
+            coalesce=True,
+            replace_existing=True,
+        )
+
         self.scheduler.start()
         self._log.info(
             "Scheduler started",
@@ -178,6 +326,11 @@ class TenderSyncScheduler:
             self.scheduler.shutdown(wait=False)
             self._log.info("Scheduler stopped")
 
+    async def shutdown(self) -> None:
+        """Arrête le planificateur et cède le leadership aux autres répliques."""
+        self.stop()
+        await self.elector.resign()
+
     @property
     def is_running(self) -> bool:
         """Vérifie si le planificateur est actif."""
@@ -208,7 +361,10 @@ async def create_scheduler(settings: Settings) -> TenderSyncScheduler:
     """
     cache = await get_cache_backend_async(settings.redis_url)
     client = TEDAPIClient(settings, cache)
-    db = TenderDatabase(settings.async_database_url)
+    db = TenderDatabase(
+        settings.async_database_url,
+        engine_options=settings.database_engine_options,
+    )
     await db.init_schema()
 
     return TenderSyncScheduler(settings, client, db)
@@ -282,8 +438,9 @@ def main() -> None:
             try:
                 while True:
                     await asyncio.sleep(60)
-            except KeyboardInterrupt:
-                scheduler.stop()
+            finally:
+                # Cède le leadership pour une bascule immédiate
+                await scheduler.shutdown()
                 logger.info("Daemon stopped")
 
         asyncio.run(run_daemon())
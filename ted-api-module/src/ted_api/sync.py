@@ -0,0 +1,424 @@
+"""
+Pipeline de synchronisation TED -> PostgreSQL.
+
+Un producteur récupère les pages TED et convertit les notices, un
+consommateur les upsert par lots. Les deux communiquent par une
+asyncio.Queue bornée : le réseau et PostgreSQL travaillent en parallèle,
+et les temps d'attente de la file indiquent quel côté est le plus lent.
+
+Chaque phase est tracée (voir ted_api.tracing) et résumée dans le
+SyncReport retourné. Chaque exécution est enregistrée dans sync_runs, avec
+sa progression (pages, lignes upsert, total attendu) mise à jour par lot.
+
+Après chaque lot, la dernière page entièrement upsert est enregistrée dans
+sync_checkpoints avec l'empreinte de la pagination (et, en mode iteration,
+le jeton TED de la page suivante) : si la synchronisation échoue (panne
+TED), la suivante reprend à la page d'après au lieu de tout refaire. Le
+checkpoint est supprimé quand la pagination aboutit. Chaque lot upsert est
+aussi indexé pour la détection des doublons BOAMP/TED (ted_api.dedup).
+
+Une seule synchronisation par pays à la fois, tous processus confondus
+(workers uvicorn et daemon) : le pipeline s'exécute sous un verrou
+consultatif PostgreSQL (TenderDatabase.acquire_sync_lock). start_sync_job()
+lance le pipeline en tâche de fond et retourne immédiatement l'identifiant
+de l'exécution, consultable via sync_runs.
+"""
+
+import asyncio
+import time
+from collections.abc import Callable, Sequence
+from typing import Any
+
+import structlog
+
+from ted_api.client import RequestCounter, TEDAPIClient, count_requests
+from ted_api.database import AdvisoryLock, TenderDatabase
+from ted_api.dedup import fingerprint_tender, index_duplicates
+from ted_api.metrics import record_sync
+from ted_api.models import (
+    TED_FIELD_PROFILES,
+    SyncCheckpoint,
+    SyncReport,
+    Tender,
+    ted_notice_to_tender,
+)
+from ted_api.tracing import SyncTrace
+
+logger = structlog.get_logger(__name__)
+
+# Pages converties en attente d'upsert (backpressure sur le fetch TED)
+SYNC_QUEUE_SIZE = 4
+
+# Notices par transaction d'upsert
+SYNC_CHUNK_SIZE = 500
+
+# Âge maximal d'un checkpoint de reprise (secondes) : au-delà, les résultats
+# ACTIVE ont pu changer et la pagination repart de la première page
+SYNC_CHECKPOINT_MAX_AGE = 6 * 3600
+
+# Synchronisations en tâche de fond de ce processus, par identifiant d'exécution
+_jobs: dict[int, asyncio.Task[SyncReport | None]] = {}
+
+
+class SyncAlreadyRunningError(Exception):
+    """Une synchronisation du même pays est déjà en cours (verrou pris)."""
+
+    def __init__(self, country: str) -> None:
+        super().__init__(f"A sync is already running for {country}")
+        self.country = country
+
+
+def convert_notices(notices: list[dict[str, Any]]) -> list[Tender]:
+    """
+    Convertit une page de notices TED, en ignorant les notices invalides.
+
+    Args:
+        notices: Notices brutes de l'API TED
+
+    Returns:
+        Liste des Tender convertis
+    """
+    tenders: list[Tender] = []
+    for notice in notices:
+        try:
+            tenders.append(ted_notice_to_tender(notice))
+        except Exception as e:
+            logger.warning(
+                "Failed to parse notice",
+                notice_id=notice.get("notice-id"),
+                error=str(e),
+            )
+    return tenders
+
+
+async def _acquire(db: TenderDatabase, country: str) -> AdvisoryLock:
+    """Prend le verrou de synchronisation du pays ou lève SyncAlreadyRunningError."""
+    lock = await db.acquire_sync_lock(country)
+    if lock is None:
+        raise SyncAlreadyRunningError(country)
+    return lock
+
+
+async def run_sync_pipeline(
+    client: TEDAPIClient,
+    db: TenderDatabase,
+    country: str,
+    trigger: str = "manual",
+    max_results: int | None = 1000,
+    chunk_size: int = SYNC_CHUNK_SIZE,
+    callbacks: Sequence[Callable[[int, int], None]] = (),
+    tracer: Any | None = None,
+) -> SyncReport:
+    """
+    Synchronise les appels d'offres actifs d'un pays.
+
+    Args:
+        client: Client API TED
+        db: Base de données
+        country: Code pays ISO
+        trigger: Origine enregistrée dans sync_runs (manual, scheduled)
+        max_results: Nombre maximum de notices (None = illimité)
+        chunk_size: Notices par upsert
+        callbacks: Fonctions(inserted, updated) appelées en fin de sync
+        tracer: Tracer OpenTelemetry (défaut: tracer global)
+
+    Returns:
+        SyncReport avec compteurs et durées par phase
+
+    Raises:
+        SyncAlreadyRunningError: Si le pays est déjà en cours de synchronisation
+        TEDAPIError: En cas d'erreur de l'API TED
+    """
+    lock = await _acquire(db, country)
+    try:
+        run_id = await db.create_sync_run(country, trigger)
+        return await _run_pipeline(
+            client, db, country, run_id, max_results, chunk_size, callbacks, tracer
+        )
+    finally:
+        await lock.release()
+
+
+async def start_sync_job(
+    client: TEDAPIClient,
+    db: TenderDatabase,
+    country: str,
+    trigger: str = "manual",
+    max_results: int | None = 1000,
+    callbacks: Sequence[Callable[[int, int], None]] = (),
+) -> int:
+    """
+    Lance une synchronisation en tâche de fond.
+
+    Le verrou est pris et l'exécution créée avant le retour : l'appelant
+    peut suivre la progression via TenderDatabase.get_sync_run(run_id).
+
+    Args:
+        client: Client API TED
+        db: Base de données
+        country: Code pays ISO
+        trigger: Origine enregistrée dans sync_runs
+        max_results: Nombre maximum de notices (None = illimité)
+        callbacks: Fonctions(inserted, updated) appelées en fin de sync
+
+    Returns:
+        Identifiant de l'exécution dans sync_runs
+
+    Raises:
+        SyncAlreadyRunningError: Si le pays est déjà en cours de synchronisation
+    """
+    lock = await _acquire(db, country)
+    try:
+        run_id = await db.create_sync_run(country, trigger)
+    except BaseException:
+        await lock.release()
+        raise
+
+    async def job() -> SyncReport | None:
+        try:
+            return await _run_pipeline(
+                client, db, country, run_id, max_results, SYNC_CHUNK_SIZE, callbacks, None
+            )
+        except Exception as e:
+            # Déjà enregistré dans sync_runs par _run_pipeline
+            logger.error("Background sync failed", run_id=run_id, error=str(e))
+            return None
+        finally:
+            await lock.release()
+
+    task = asyncio.create_task(job(), name=f"ted-sync-{run_id}")
+    _jobs[run_id] = task
+    task.add_done_callback(lambda _: _jobs.pop(run_id, None))
+    logger.info("Sync job started", run_id=run_id, country=country, trigger=trigger)
+    return run_id
+
+
+def get_sync_job(run_id: int) -> asyncio.Task[SyncReport | None] | None:
+    """
+    Retourne la tâche d'une synchronisation lancée par ce processus.
+
+    Args:
+        run_id: Identifiant de l'exécution
+
+    Returns:
+        Tâche asyncio, ou None si terminée ou lancée par un autre processus
+    """
+    return _jobs.get(run_id)
+
+
+async def cancel_sync_jobs() -> None:
+    """Annule les synchronisations en tâche de fond (arrêt du processus)."""
+    tasks = list(_jobs.values())
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def _load_checkpoint(db: TenderDatabase, fingerprint: str) -> SyncCheckpoint | None:
+    """Checkpoint récent de la pagination, ou None (échec de lecture inclus)."""
+    try:
+        return await db.get_sync_checkpoint(fingerprint, SYNC_CHECKPOINT_MAX_AGE)
+    except Exception as e:
+        logger.warning("Failed to load sync checkpoint", error=str(e))
+        return None
+
+
+async def _run_pipeline(
+    client: TEDAPIClient,
+    db: TenderDatabase,
+    country: str,
+    run_id: int,
+    max_results: int | None,
+    chunk_size: int,
+    callbacks: Sequence[Callable[[int, int], None]],
+    tracer: Any | None,
+) -> SyncReport:
+    """Exécute le pipeline d'une exécution déjà créée, sous le verrou du pays."""
+    trace = SyncTrace(country, tracer=tracer)
+    queue: asyncio.Queue[tuple[int, str | None, list[Tender]] | None] = asyncio.Queue(
+        maxsize=SYNC_QUEUE_SIZE
+    )
+    api_calls = RequestCounter()
+    pages = 0
+    fetched = 0
+    expected: int | None = None
+    inserted = updated = 0
+
+    # Reprise après la dernière page entièrement upsert d'une exécution interrompue
+    query = client.build_active_query(country=country)
+    fields = TED_FIELD_PROFILES["listing"]
+    fingerprint = client.pagination_fingerprint(query, fields=fields)
+    checkpoint = await _load_checkpoint(db, fingerprint)
+    if checkpoint is None:
+        checkpoint = SyncCheckpoint(fingerprint=fingerprint, country=country, query=query)
+    else:
+        logger.info(
+            "Resuming sync from checkpoint",
+            run_id=run_id,
+            country=country,
+            page=checkpoint.last_page + 1,
+            previous_run_id=checkpoint.run_id,
+        )
+    resumed_fetched = checkpoint.fetched
+    limit = None if max_results is None else max(max_results - resumed_fetched, 0)
+
+    async def produce() -> None:
+        nonlocal pages, fetched, expected
+        page_iter = client.scan_pages(
+            query,
+            fields=fields,
+            start_page=checkpoint.last_page + 1,
+            start_token=checkpoint.iteration_token,
+        )
+        try:
+            while limit is None or fetched < limit:
+                with trace.phase("ted.fetch_page", page=checkpoint.last_page + pages + 1):
+                    response = await anext(page_iter, None)
+                if response is None:
+                    break
+                pages += 1
+                if expected is None:
+                    expected = max(response.total - resumed_fetched, 0)
+                    if limit is not None:
+                        expected = min(expected, limit)
+
+                with trace.phase("sync.parse", page=response.page, notices=len(response.notices)):
+                    tenders = convert_notices(response.notices)
+                if limit is not None:
+                    tenders = tenders[: limit - fetched]
+                fetched += len(tenders)
+
+                with trace.phase("sync.queue_put"):
+                    await queue.put((response.page, response.iteration_next_token, tenders))
+        finally:
+            await page_iter.aclose()
+            await queue.put(None)
+
+    async def save_progress() -> None:
+        # Progression indicative : un échec ne doit pas interrompre la sync
+        try:
+            with trace.phase("db.progress"):
+                await db.update_sync_progress(
+                    run_id,
+                    pages=pages,
+                    fetched=fetched,
+                    inserted=inserted,
+                    updated=updated,
+                    expected=expected,
+                    api_calls=api_calls.calls,
+                )
+        except Exception as e:
+            logger.warning("Failed to save sync progress", run_id=run_id, error=str(e))
+
+    async def save_checkpoint(page: int, token: str | None, rows: int) -> None:
+        checkpoint.last_page = page
+        checkpoint.iteration_token = token
+        checkpoint.fetched += rows
+        checkpoint.run_id = run_id
+        try:
+            with trace.phase("db.checkpoint"):
+                await db.save_sync_checkpoint(checkpoint)
+        except Exception as e:
+            logger.warning("Failed to save sync checkpoint", run_id=run_id, error=str(e))
+
+    async def upsert(chunk: list[Tender]) -> None:
+        nonlocal inserted, updated
+        with trace.phase("db.upsert_chunk", rows=len(chunk)):
+            ins, upd = await db.upsert_tenders(chunk)
+        inserted, updated = inserted + ins, updated + upd
+        with trace.phase("db.dedup", rows=len(chunk)):
+            await index_duplicates(db, "TED", {t.notice_id: fingerprint_tender(t) for t in chunk})
+        await save_progress()
+
+    async def consume() -> None:
+        chunk: list[Tender] = []
+        # Pages du lot en cours : (numéro, jeton suivant, fin dans chunk, notices)
+        boundaries: list[tuple[int, str | None, int, int]] = []
+        first = True
+
+        async def flush(size: int) -> None:
+            nonlocal chunk, boundaries
+            await upsert(chunk[:size])
+            chunk = chunk[size:]
+            committed = [b for b in boundaries if b[2] <= size]
+            boundaries = [(p, t, end - size, n) for p, t, end, n in boundaries if end > size]
+            if committed:
+                page, token, _, _ = committed[-1]
+                await save_checkpoint(page, token, sum(n for *_, n in committed))
+
+        while True:
+            with trace.phase("sync.queue_wait"):
+                item = await queue.get()
+            if item is None:
+                break
+            page, token, batch = item
+            if first:
+                # Total attendu connu dès la première page
+                first = False
+                await save_progress()
+            chunk.extend(batch)
+            boundaries.append((page, token, len(chunk), len(batch)))
+            while len(chunk) >= chunk_size:
+                await flush(chunk_size)
+        if chunk:
+            await flush(len(chunk))
+
+    def report() -> SyncReport:
+        return trace.report(
+            fetched=fetched,
+            inserted=inserted,
+            updated=updated,
+            pages=pages,
+            api_calls=api_calls.calls,
+            run_id=run_id,
+        )
+
+    start = time.perf_counter()
+    try:
+        with trace.run():
+            # La tâche producteur hérite du compteur de requêtes du contexte
+            with count_requests(api_calls):
+                producer = asyncio.create_task(produce())
+            try:
+                await consume()
+            except BaseException:
+                producer.cancel()
+                await asyncio.gather(producer, return_exceptions=True)
+                raise
+            # Propage les erreurs du producteur (TED API)
+            await producer
+
+            trace.set_attribute("ted.pages", pages)
+            trace.set_attribute("ted.fetched", fetched)
+            trace.set_attribute("db.inserted", inserted)
+            trace.set_attribute("db.updated", updated)
+
+            for callback in callbacks:
+                with trace.phase("sync.callback", callback=getattr(callback, "__name__", "")):
+                    try:
+                        callback(inserted, updated)
+                    except Exception as e:
+                        logger.warning("Sync callback failed", error=str(e))
+    except BaseException as e:
+        record_sync(country, time.perf_counter() - start, success=False)
+        try:
+            await db.finish_sync_run(run_id, report(), error=str(e) or type(e).__name__)
+        except Exception as db_error:
+            logger.error("Failed to record sync run", run_id=run_id, error=str(db_error))
+        raise
+
+    result = report()
+    await db.finish_sync_run(run_id, result)
+    try:
+        await db.delete_sync_checkpoint(fingerprint)
+    except Exception as e:
+        logger.warning("Failed to delete sync checkpoint", run_id=run_id, error=str(e))
+    record_sync(
+        country,
+        time.perf_counter() - start,
+        success=True,
+        fetched=fetched,
+        inserted=inserted,
+        updated=updated,
+    )
+    return result
@@ -0,0 +1,214 @@
+"""
+Traçage des synchronisations par phase.
+
+Chaque phase d'une synchronisation (fetch d'une page TED, conversion des
+notices, attente de la file, upsert d'un lot, callbacks) est:
+- émise comme span OpenTelemetry si opentelemetry-api est installé
+  (no-op sinon, et tant qu'aucun TracerProvider n'est configuré)
+- agrégée dans un SyncTrace pour produire le SyncReport renvoyé par l'API
+
+Pour la production, configurer un TracerProvider global (SDK/OTLP) suffit.
+Pour les tests, configure_tracing(InMemorySpanExporter()) crée un provider
+exportant en mémoire (nécessite opentelemetry-sdk).
+"""
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime
+from typing import TYPE_CHECKING, Any
+
+import structlog
+
+from ted_api.models import SyncPhase, SyncReport, sync_bottleneck
+
+logger = structlog.get_logger(__name__)
+
+if TYPE_CHECKING:
+    from opentelemetry import trace as otel_trace
+else:
+    try:
+        from opentelemetry import trace as otel_trace
+    except ImportError:  # pragma: no cover - dépendance optionnelle
+        otel_trace = None
+
+TRACER_NAME = "ted_api.sync"
+
+
+def get_tracer(tracer_provider: Any | None = None) -> Any | None:
+    """
+    Retourne le tracer OpenTelemetry des synchronisations.
+
+    Args:
+        tracer_provider: Provider explicite (défaut: provider global)
+
+    Returns:
+        Tracer OpenTelemetry, ou None si opentelemetry-api est absent
+    """
+    if otel_trace is None:
+        return None
+    return otel_trace.get_tracer(TRACER_NAME, tracer_provider=tracer_provider)
+
+
+def configure_tracing(exporter: Any) -> Any:
+    """
+    Crée un TracerProvider exportant les spans vers `exporter`.
+
+    Le provider est retourné (et non installé globalement) pour pouvoir être
+    passé à get_tracer(); les tests l'utilisent avec InMemorySpanExporter.
+
+    Args:
+        exporter: SpanExporter OpenTelemetry (InMemorySpanExporter, OTLP, ...)
+
+    Returns:
+        TracerProvider configuré
+
+    Raises:
+        ImportError: Si opentelemetry-sdk n'est pas installé
+    """
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    return provider
+
+
+class SyncTrace:
+    """
+    Trace d'une synchronisation: span racine et durées cumulées par phase.
+
+    Attributes:
+        country: Code pays synchronisé
+        started_at: Début de la synchronisation
+    """
+
+    def __init__(self, country: str, tracer: Any | None = None) -> None:
+        """
+        Initialise la trace.
+
+        Args:
+            country: Code pays synchronisé
+            tracer: Tracer OpenTelemetry (défaut: get_tracer())
+        """
+        self.country = country
+        self.started_at = datetime.now()
+        self._tracer = tracer if tracer is not None else get_tracer()
+        self._start = time.perf_counter()
+        self._elapsed: float | None = None
+        self._phases: dict[str, SyncPhase] = {}
+        self._root: Any = None
+        self._log = logger.bind(component="SyncTrace", country=country)
+
+    @contextmanager
+    def run(self) -> Iterator["SyncTrace"]:
+        """Ouvre le span racine "ted.sync" pour la durée de la synchronisation."""
+        self._start = time.perf_counter()
+        if self._tracer is None:
+            try:
+                yield self
+            finally:
+                self._finish()
+            return
+
+        with self._tracer.start_as_current_span(
+            "ted.sync", attributes={"ted.country": self.country}
+        ) as span:
+            self._root = span
+            try:
+                yield self
+            finally:
+                self._finish()
+
+    @contextmanager
+    def phase(self, name: str, **attributes: Any) -> Iterator[None]:
+        """
+        Chronomètre une phase et l'émet comme span enfant.
+
+        Args:
+            name: Nom de la phase (ted.fetch_page, sync.parse, ...)
+            **attributes: Attributs du span (page, rows, ...)
+        """
+        start = time.perf_counter()
+        if self._tracer is None:
+            try:
+                yield
+            finally:
+                self.record(name, time.perf_counter() - start)
+            return
+
+        with self._tracer.start_as_current_span(name, attributes=attributes):
+            try:
+                yield
+            finally:
+                self.record(name, time.perf_counter() - start)
+
+    def record(self, name: str, seconds: float) -> None:
+        """
+        Ajoute une durée à une phase sans ouvrir de span.
+
+        Args:
+            name: Nom de la phase
+            seconds: Durée mesurée
+        """
+        phase = self._phases.get(name)
+        if phase is None:
+            phase = self._phases[name] = SyncPhase(name=name)
+        phase.count += 1
+        phase.total_seconds += seconds
+        phase.max_seconds = max(phase.max_seconds, seconds)
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Ajoute un attribut au span racine (compteurs finaux)."""
+        if self._root is not None:
+            self._root.set_attribute(key, value)
+
+    def _finish(self) -> None:
+        """Fige la durée totale et journalise le détail par phase."""
+        self._elapsed = time.perf_counter() - self._start
+        self._log.info(
+            "Sync phase breakdown",
+            elapsed_seconds=round(self._elapsed, 3),
+            **{name: round(p.total_seconds, 3) for name, p in self._phases.items()},
+        )
+
+    def report(
+        self,
+        fetched: int,
+        inserted: int,
+        updated: int,
+        pages: int,
+        api_calls: int = 0,
+        run_id: int | None = None,
+    ) -> SyncReport:
+        """
+        Construit le rapport de synchronisation.
+
+        Args:
+            fetched: Notices converties
+            inserted: Notices insérées
+            updated: Notices mises à jour
+            pages: Pages TED récupérées
+            api_calls: Requêtes HTTP vers l'API TED
+            run_id: Identifiant de l'exécution dans sync_runs
+
+        Returns:
+            SyncReport avec les durées par phase
+        """
+        elapsed = self._elapsed
+        if elapsed is None:
+            elapsed = time.perf_counter() - self._start
+        phases = sorted(self._phases.values(), key=lambda p: p.total_seconds, reverse=True)
+        return SyncReport(
+            run_id=run_id,
+            country=self.country,
+            started_at=self.started_at,
+            elapsed_seconds=elapsed,
+            pages=pages,
+            api_calls=api_calls,
+            fetched=fetched,
+            inserted=inserted,
+            updated=updated,
+            phases=[p.model_copy() for p in phases],
+            bottleneck=sync_bottleneck(phases),
+        )
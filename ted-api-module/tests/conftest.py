@@ -17,6 +17,8 @@ from typing import Any, AsyncGenerator, Generator
 import pytest
 import pytest_asyncio
 from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
 
 from ted_api.cache import MemoryCache
 from ted_api.config import Settings
@@ -46,13 +48,87 @@ def test_settings(tmp_path: Path) -> Settings:
     )
 
 
+# Base PostgreSQL de test, initialisée avec init.sql (format asyncpg).
+# Les tests qui l'utilisent sont ignorés si la variable n'est pas définie
+# ou si la base est injoignable ; les tables TED y sont vidées à chaque test.
+TEST_DATABASE_URL_ENV = "TED_TEST_DATABASE_URL"
+
+# Tables du module vidées avant chaque test
+TEST_TRUNCATED_TABLES = (
+    "ted_tenders",
+    "ted_tenders_archive",
+    "sync_runs",
+    "sync_checkpoints",
+    "backfill_checkpoints",
+    "tender_fingerprints",
+    "tender_duplicates",
+)
+
+
+def test_database_url() -> str:
+    """URL de la base PostgreSQL de test (test ignoré si non configurée)."""
+    url = os.environ.get(TEST_DATABASE_URL_ENV)
+    if not url:
+        pytest.skip(f"{TEST_DATABASE_URL_ENV} non défini : tests PostgreSQL ignorés")
+    return url
+
+
+async def open_test_database(url: str, **options: Any) -> TenderDatabase:
+    """TenderDatabase initialisée (test ignoré si la base est injoignable)."""
+    db = TenderDatabase(url, **options)
+    try:
+        await db.init_schema()
+    except (OSError, SQLAlchemyError) as e:
+        await db.close()
+        pytest.skip(f"Base PostgreSQL de test indisponible : {e}")
+    return db
+
+
+@pytest_asyncio.fixture
+async def test_db() -> AsyncGenerator[TenderDatabase, None]:
+    """Base PostgreSQL de test initialisée, tables du module vides."""
+    db = await open_test_database(test_database_url())
+    async with db._begin() as conn:
+        await conn.execute(text(f"TRUNCATE {', '.join(TEST_TRUNCATED_TABLES)}"))
+    yield db
+    await db.close()
+
+
+# Schéma jetable de la disposition partitionnée (en tête du search_path)
+PARTITIONED_TEST_SCHEMA = "ted_partition_test"
+
+
 @pytest_asyncio.fixture
-async def test_db(test_settings: Settings) -> AsyncGenerator[TenderDatabase, None]:
-    """Base de données de test initialisée."""
-    db = TenderDatabase(test_settings.database_path)
-    await db.init_schema()
+async def partitioned_test_db() -> AsyncGenerator[TenderDatabase, None]:
+    """
+    Base PostgreSQL de test avec ted_tenders partitionnée.
+
+    Une copie vide de ted_tenders est créée dans un schéma jetable, puis
+    convertie par partition_ted_tenders ; les autres tables (archive,
+    tender_cache, place_tenders) restent lues dans public et sont vidées.
+    """
+    url = test_database_url()
+    admin = await open_test_database(url)
+    schema = PARTITIONED_TEST_SCHEMA
+    async with admin._begin() as conn:
+        await conn.execute(text(f"TRUNCATE {', '.join(TEST_TRUNCATED_TABLES)}"))
+        await conn.execute(text(f"DROP SCHEMA IF EXISTS {schema} CASCADE"))
+        await conn.execute(text(f"CREATE SCHEMA {schema}"))
+        await conn.execute(
+            text(f"CREATE TABLE {schema}.ted_tenders (LIKE public.ted_tenders INCLUDING ALL)")
+        )
+    db = await open_test_database(
+        url,
+        engine_options={
+            "connect_args": {"server_settings": {"search_path": f"{schema}, public"}},
+        },
+    )
+    await db.partition_ted_tenders(months_ahead=1)
     yield db
     await db.close()
+    async with admin._begin() as conn:
+        await conn.execute(text(f"DROP SCHEMA {schema} CASCADE"))
+    await admin.close()
 
 
 @pytest.fixture
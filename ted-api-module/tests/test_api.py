@@ -8,9 +8,13 @@ Couvre:
 - Gestion des erreurs
 """
 
-from datetime import datetime, timedelta
+import csv
+import io
+import json
+import time
+from datetime import UTC, date, datetime, timedelta
 from typing import Any
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from fastapi import status
@@ -18,10 +22,34 @@ from fastapi.testclient import TestClient
 
 from ted_api.api.app import app
 from ted_api.api import dependencies
+from ted_api.api.conditional import TenderVersionMap, etag_matches
+from ted_api.api.responses import TenderJSONResponse
 from ted_api.cache import MemoryCache
 from ted_api.config import Settings
 from ted_api.database import TenderDatabase
-from ted_api.models import PaginatedResponse, Tender
+from ted_api.deadlines import DeadlineBucketIndex
+from ted_api.models import (
+    PaginatedResponse,
+    SearchTender,
+    TenderDuplicate,
+    SyncPhase,
+    SyncRun,
+    TEDAPIResponse,
+    Tender,
+    reference_time,
+)
+
+
+UPDATED_AT = datetime(2025, 3, 10, 8, 15, 30, 123456, tzinfo=UTC)
+
+
+def test_etag_matches() -> None:
+    """Test comparaison faible de If-None-Match."""
+    assert etag_matches('"a1"', '"a1"')
+    assert etag_matches('W/"a1"', '"a1"')
+    assert etag_matches('"b2", W/"a1"', 'W/"a1"')
+    assert etag_matches("*", '"a1"')
+    assert not etag_matches('"a12"', '"a1"')
 
 
 class TestTendersAPI:
@@ -38,6 +66,8 @@ class TestTendersAPI:
             items=sample_tenders,
         )
         mock.get_tender_by_id.return_value = sample_tenders[0]
+        mock.get_tender_updated_at.return_value = UPDATED_AT
+        mock.get_tender_with_version.return_value = (sample_tenders[0], UPDATED_AT)
         mock.get_stats.return_value = {
             "total": len(sample_tenders),
             "active": len(sample_tenders),
@@ -46,6 +76,26 @@ class TestTendersAPI:
             "average_value": 225000,
         }
         mock.get_expiring_tenders.return_value = [sample_tenders[2]]
+        mock.get_duplicates.return_value = [
+            TenderDuplicate(source="BOAMP", notice_id="24-123456", similarity=0.8)
+        ]
+        mock.search_tenders.return_value = PaginatedResponse(
+            total=1,
+            page=1,
+            limit=20,
+            items=[
+                SearchTender(
+                    id="24-123456",
+                    source="BOAMP",
+                    title="Fourniture de gilets pare-balles",
+                    publication_date=datetime(2024, 12, 11),
+                    cpv_codes=["35811300"],
+                )
+            ],
+        )
+        mock.get_deadline_window.return_value = (1, [sample_tenders[2]])
+        mock.get_tenders_changes.return_value = 1
+        mock.tenders_version = 0
         return mock
 
     @pytest.fixture
@@ -73,7 +123,18 @@ class TestTendersAPI:
         async def get_cache_override() -> MemoryCache:
             return MemoryCache()
 
+        deadline_index = DeadlineBucketIndex(mock_db)
+        tender_versions = TenderVersionMap(mock_db)
+
+        async def get_deadline_index_override() -> DeadlineBucketIndex:
+            return deadline_index
+
+        async def get_tender_versions_override() -> TenderVersionMap:
+            return tender_versions
+
         app.dependency_overrides[dependencies.get_database] = get_db_override
+        app.dependency_overrides[dependencies.get_deadline_index] = get_deadline_index_override
+        app.dependency_overrides[dependencies.get_tender_versions] = get_tender_versions_override
         app.dependency_overrides[dependencies.get_ted_client] = get_client_override
         app.dependency_overrides[dependencies.get_cache] = get_cache_override
 
@@ -188,11 +249,128 @@ class TestTendersAPI:
         self, client: TestClient, mock_db: AsyncMock
     ) -> None:
         """Test GET /api/tenders/{id} non trouvé."""
-        mock_db.get_tender_by_id.return_value = None
+        mock_db.get_tender_updated_at.return_value = None
+        mock_db.get_tender_with_version.return_value = None
 
         response = client.get("/api/tenders/nonexistent-id")
         assert response.status_code == status.HTTP_404_NOT_FOUND
 
+    def test_get_tender_conditional(
+        self, client: TestClient, mock_db: AsyncMock, sample_tenders: list[Tender]
+    ) -> None:
+        """Test ETag / Last-Modified, 304 sans lecture de la ligne complète."""
+        url = f"/api/tenders/{sample_tenders[0].notice_id}"
+        response = client.get(url)
+        etag = response.headers["ETag"]
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["Last-Modified"] == "Mon, 10 Mar 2025 08:15:30 GMT"
+        mock_db.get_tender_with_version.reset_mock()
+
+        for headers in (
+            {"If-None-Match": etag},
+            {"If-None-Match": f'"other", W/{etag}'},
+            {"If-Modified-Since": "Mon, 10 Mar 2025 08:15:30 GMT"},
+        ):
+            response = client.get(url, headers=headers)
+            assert response.status_code == status.HTTP_304_NOT_MODIFIED
+            assert response.headers["ETag"] == etag
+            assert response.content == b""
+        mock_db.get_tender_with_version.assert_not_awaited()
+        # Version lue une fois, puis servie depuis la table en mémoire
+        mock_db.get_tender_updated_at.assert_awaited_once()
+
+        response = client.get(url, headers={"If-None-Match": '"stale"'})
+        assert response.status_code == status.HTTP_200_OK
+        response = client.get(url, headers={"If-Modified-Since": "Sun, 09 Mar 2025 08:00:00 GMT"})
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_list_weak_etag(self, client: TestClient, mock_db: AsyncMock) -> None:
+        """Test ETag faible des listes : paramètres et version des données."""
+        response = client.get("/api/tenders?country=FRA&page=1")
+        etag = response.headers["ETag"]
+        assert etag.startswith('W/"1-')
+
+        response = client.get("/api/tenders?page=1&country=FRA", headers={"If-None-Match": etag})
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        mock_db.get_tenders.assert_awaited_once()
+
+        other = client.get("/api/tenders?country=DEU&page=1").headers["ETag"]
+        assert other != etag
+
+        # Écriture validée par ce processus : nouvelle version, ETag périmé
+        mock_db.tenders_version = 1
+        mock_db.get_tenders_changes.return_value = 2
+        response = client.get("/api/tenders?country=FRA&page=1", headers={"If-None-Match": etag})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["ETag"].startswith('W/"2-')
+
+        expiring = client.get("/api/tenders/expiring?days=7")
+        response = client.get(
+            "/api/tenders/expiring?days=7", headers={"If-None-Match": expiring.headers["ETag"]}
+        )
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_list_without_version(self, client: TestClient, mock_db: AsyncMock) -> None:
+        """Test version illisible : réponse complète sans ETag."""
+        mock_db.get_tenders_changes.side_effect = RuntimeError("DB down")
+
+        response = client.get("/api/tenders", headers={"If-None-Match": "*"})
+        assert response.status_code == status.HTTP_200_OK
+        assert "ETag" not in response.headers
+
+    def test_get_archived_tenders(
+        self, client: TestClient, mock_db: AsyncMock, sample_tenders: list[Tender]
+    ) -> None:
+        """Test GET /api/tenders/archive (route distincte de /tenders/{id})."""
+        mock_db.get_archived_tenders.return_value = PaginatedResponse(
+            total=1, page=1, limit=20, items=[sample_tenders[0]]
+        )
+
+        response = client.get("/api/tenders/archive?published_from=2024-01-01&cpv=72")
+        assert response.status_code == status.HTTP_200_OK
+
+        assert response.json()["items"][0]["notice_id"] == sample_tenders[0].notice_id
+        filters = mock_db.get_archived_tenders.call_args.kwargs["filters"]
+        assert filters.published_from == date(2024, 1, 1)
+        assert filters.cpv == "72"
+        mock_db.get_tender_by_id.assert_not_called()
+
+    def test_get_archived_tender_not_found(
+        self, client: TestClient, mock_db: AsyncMock
+    ) -> None:
+        """Test GET /api/tenders/archive/{id} non archivé."""
+        mock_db.get_archived_tender.return_value = None
+
+        response = client.get("/api/tenders/archive/123456-2024")
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        mock_db.get_archived_tender.assert_called_once_with("123456-2024")
+
+    def test_search_tenders(self, client: TestClient, mock_db: AsyncMock) -> None:
+        """Test GET /api/tenders/search (route distincte de /tenders/{id})."""
+        response = client.get("/api/tenders/search?source=BOAMP&source=TED&search=gilets")
+        assert response.status_code == status.HTTP_200_OK
+
+        data = response.json()
+        assert data["items"][0]["source"] == "BOAMP"
+        filters = mock_db.search_tenders.call_args.kwargs["filters"]
+        assert filters.sources == ["BOAMP", "TED"]
+        assert filters.search_text == "gilets"
+        assert filters.dedupe is True
+        mock_db.get_tender_by_id.assert_not_called()
+
+    def test_search_tenders_invalid_source(self, client: TestClient) -> None:
+        """Test GET /api/tenders/search avec source inconnue."""
+        response = client.get("/api/tenders/search?source=SIMAP")
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    def test_get_tender_duplicates(self, client: TestClient, mock_db: AsyncMock) -> None:
+        """Test GET /api/tenders/{id}/duplicates."""
+        response = client.get("/api/tenders/123456-2024/duplicates")
+        assert response.status_code == status.HTTP_200_OK
+
+        assert response.json()[0]["notice_id"] == "24-123456"
+        mock_db.get_duplicates.assert_called_once_with("TED", "123456-2024")
+
     def test_get_tenders_stats(
         self, client: TestClient, mock_db: AsyncMock
     ) -> None:
@@ -207,12 +385,44 @@ class TestTendersAPI:
     def test_get_expiring_tenders(
         self, client: TestClient, mock_db: AsyncMock
     ) -> None:
-        """Test GET /api/tenders/expiring."""
+        """Test GET /api/tenders/expiring servi depuis l'index des deadlines."""
         response = client.get("/api/tenders/expiring?days=7")
         assert response.status_code == status.HTTP_200_OK
 
         data = response.json()
         assert isinstance(data, list)
+        assert data[0]["notice_id"] == "333333-2024"
+        assert data[0]["days_until_deadline"] == 4
+
+        # Autre horizon : seaux concaténés, sans nouvelle requête
+        assert client.get("/api/tenders/expiring?days=3").json() == []
+        mock_db.get_deadline_window.assert_awaited_once()
+        mock_db.get_expiring_tenders.assert_not_called()
+
+    def test_get_expiring_tenders_utc_day(
+        self, client: TestClient, mock_db: AsyncMock, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test index construit pour le jour UTC, quel que soit le fuseau de l'hôte."""
+        monkeypatch.setenv("TZ", "Etc/GMT-14")
+        time.tzset()
+        try:
+            response = client.get("/api/tenders/expiring?days=7")
+        finally:
+            monkeypatch.undo()
+            time.tzset()
+
+        assert response.status_code == status.HTTP_200_OK
+        start = mock_db.get_deadline_window.await_args.args[0]
+        assert start == datetime.now(UTC).date()
+
+    def test_get_expiring_tenders_db_error(
+        self, client: TestClient, mock_db: AsyncMock
+    ) -> None:
+        """Test erreur DB à la construction de l'index -> 503."""
+        mock_db.get_deadline_window.side_effect = RuntimeError("DB down")
+
+        response = client.get("/api/tenders/expiring?days=7")
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
 
     def test_get_expiring_tenders_invalid_days(
         self, client: TestClient
@@ -221,6 +431,49 @@ class TestTendersAPI:
         response = client.get("/api/tenders/expiring?days=100")
         assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
 
+    def test_export_ndjson(
+        self, client: TestClient, mock_db: AsyncMock, sample_tenders: list[Tender]
+    ) -> None:
+        """Test GET /api/tenders/export en NDJSON."""
+        async def batches(*args: Any, **kwargs: Any):
+            yield sample_tenders[:2]
+            yield sample_tenders[2:]
+
+        mock_db.iter_tenders = MagicMock(side_effect=batches)
+
+        response = client.get("/api/tenders/export?country=FRA")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+
+        lines = response.text.strip().split("\n")
+        assert len(lines) == len(sample_tenders)
+        assert json.loads(lines[0])["notice_id"] == sample_tenders[0].notice_id
+
+        filters = mock_db.iter_tenders.call_args[0][0]
+        assert filters.country == "FRA"
+
+    def test_export_csv(
+        self, client: TestClient, mock_db: AsyncMock, sample_tenders: list[Tender]
+    ) -> None:
+        """Test GET /api/tenders/export en CSV."""
+        async def batches(*args: Any, **kwargs: Any):
+            yield sample_tenders
+
+        mock_db.iter_tenders = MagicMock(side_effect=batches)
+
+        response = client.get("/api/tenders/export?format=csv")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("text/csv")
+
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert len(rows) == len(sample_tenders)
+        assert rows[0]["cpv_codes"] == "72000000"
+
+    def test_export_invalid_format(self, client: TestClient) -> None:
+        """Test format d'export invalide."""
+        response = client.get("/api/tenders/export?format=xml")
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
 
 class TestSyncAPI:
     """Tests pour les endpoints de synchronisation."""
@@ -231,13 +484,41 @@ class TestSyncAPI:
         mock = AsyncMock(spec=TenderDatabase)
         mock.upsert_tenders.return_value = (5, 2)
         mock.get_stats.return_value = {"total": 7}
+        mock.create_sync_run.return_value = 42
+        mock.acquire_sync_lock.return_value = AsyncMock()
+        mock.get_sync_checkpoint.return_value = None
+        run = SyncRun(
+            id=42,
+            country="FRA",
+            trigger="scheduled",
+            status="completed",
+            started_at=datetime(2024, 3, 1, 2, 0),
+            finished_at=datetime(2024, 3, 1, 2, 1),
+            elapsed_seconds=60.0,
+            pages=3,
+            api_calls=4,
+            fetched=300,
+            inserted=120,
+            updated=180,
+            phases=[SyncPhase(name="ted.fetch_page", count=3, total_seconds=45.0)],
+        )
+        mock.list_sync_runs.return_value = PaginatedResponse(
+            total=1, page=1, limit=20, items=[run]
+        )
+        mock.get_sync_run.return_value = run
         return mock
 
     @pytest.fixture
-    def mock_client(self, sample_tenders: list[Tender]) -> AsyncMock:
-        """Mock du client TED API."""
-        mock = AsyncMock()
-        mock.get_active_tenders.return_value = sample_tenders
+    def mock_client(self, mock_ted_response: dict[str, Any]) -> MagicMock:
+        """Mock du client TED API (une page de notices)."""
+        mock = MagicMock()
+        mock.build_active_query.return_value = "buyer-country = FRA"
+        mock.pagination_fingerprint.return_value = "fingerprint"
+
+        async def pages(*args: Any, **kwargs: Any):
+            yield TEDAPIResponse(**mock_ted_response)
+
+        mock.iter_pages = MagicMock(side_effect=pages)
         return mock
 
     @pytest.fixture
@@ -245,7 +526,7 @@ class TestSyncAPI:
         self,
         test_settings: Settings,
         mock_db: AsyncMock,
-        mock_client: AsyncMock,
+        mock_client: MagicMock,
     ) -> TestClient:
         """Client de test."""
         async def get_db_override() -> AsyncMock:
@@ -267,15 +548,42 @@ class TestSyncAPI:
         app.dependency_overrides.clear()
 
     def test_trigger_sync(
-        self, client: TestClient, mock_db: AsyncMock, mock_client: AsyncMock
+        self, client: TestClient, mock_db: AsyncMock, mock_client: MagicMock
     ) -> None:
-        """Test POST /api/tenders/sync."""
+        """Test POST /api/tenders/sync: lancement en tâche de fond."""
         response = client.post("/api/tenders/sync?country=FRA")
-        assert response.status_code == status.HTTP_200_OK
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert response.headers["location"] == "/api/tenders/sync/history/42"
 
         data = response.json()
-        assert data["status"] == "completed"
-        assert "total_synced" in data
+        assert data["id"] == 42
+        assert "progress" in data and "eta_seconds" in data
+
+        # Verrou pris et exécution créée avant la réponse
+        mock_db.acquire_sync_lock.assert_awaited_once_with("FRA")
+        mock_db.create_sync_run.assert_awaited_once_with("FRA", "manual")
+
+    def test_trigger_sync_run_missing(
+        self, client: TestClient, mock_db: AsyncMock
+    ) -> None:
+        """Test exécution introuvable après création : 202 avec l'exécution lancée."""
+        mock_db.get_sync_run.return_value = None
+
+        response = client.post("/api/tenders/sync?country=FRA")
+        assert response.status_code == status.HTTP_202_ACCEPTED
+
+        data = response.json()
+        assert (data["id"], data["country"], data["status"]) == (42, "FRA", "running")
+
+    def test_trigger_sync_conflict(
+        self, client: TestClient, mock_db: AsyncMock
+    ) -> None:
+        """Test 409 si le verrou du pays est tenu (autre worker ou daemon)."""
+        mock_db.acquire_sync_lock.return_value = None
+
+        response = client.post("/api/tenders/sync?country=FRA")
+        assert response.status_code == status.HTTP_409_CONFLICT
+        mock_db.create_sync_run.assert_not_awaited()
 
     def test_get_sync_status(self, client: TestClient) -> None:
         """Test GET /api/tenders/sync/status."""
@@ -284,18 +592,55 @@ class TestSyncAPI:
 
         data = response.json()
         assert "status" in data
+        assert data["total_synced"] == 300
+        assert data["report"]["bottleneck"] == "ted.fetch_page"
+
+    def test_get_sync_status_no_runs(
+        self, client: TestClient, mock_db: AsyncMock
+    ) -> None:
+        """Test statut sans aucune synchronisation enregistrée."""
+        mock_db.list_sync_runs.return_value = PaginatedResponse(
+            total=0, page=1, limit=1, items=[]
+        )
+
+        response = client.get("/api/tenders/sync/status")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["status"] == "idle"
+
+    def test_get_sync_history(
+        self, client: TestClient, mock_db: AsyncMock
+    ) -> None:
+        """Test GET /api/tenders/sync/history."""
+        response = client.get("/api/tenders/sync/history?country=FRA&page=1&limit=10")
+        assert response.status_code == status.HTTP_200_OK
+
+        data = response.json()
+        assert data["total"] == 1
+        assert data["items"][0]["rows_per_second"] == 5.0
+        mock_db.list_sync_runs.assert_awaited_once_with(page=1, limit=10, country="FRA")
+
+    def test_get_sync_run(self, client: TestClient, mock_db: AsyncMock) -> None:
+        """Test GET /api/tenders/sync/history/{run_id}."""
+        response = client.get("/api/tenders/sync/history/42")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["api_calls"] == 4
+
+        mock_db.get_sync_run.return_value = None
+        response = client.get("/api/tenders/sync/history/43")
+        assert response.status_code == status.HTTP_404_NOT_FOUND
 
     def test_delete_expired(
         self, client: TestClient, mock_db: AsyncMock
     ) -> None:
-        """Test DELETE /api/tenders/expired."""
-        mock_db.delete_expired_tenders.return_value = 3
+        """Test DELETE /api/tenders/expired : notices déplacées dans l'archive."""
+        mock_db.archive_expired_tenders.return_value = 3
 
         response = client.delete("/api/tenders/expired")
         assert response.status_code == status.HTTP_200_OK
 
         data = response.json()
-        assert data["deleted"] == 3
+        assert data == {"deleted": 3, "archived": 3}
+        mock_db.delete_expired_tenders.assert_not_called()
 
 
 class TestHealthCheck:
@@ -340,3 +685,60 @@ class TestHealthCheck:
 
         response = client.get("/api/health")
         assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+
+    def test_pool_status(
+        self, client: TestClient, mock_db: AsyncMock
+    ) -> None:
+        """Test GET /api/health/pool."""
+        mock_db.pool_status = MagicMock(
+            return_value={"pool_size": 5, "capacity": 15, "checked_out": 2}
+        )
+
+        response = client.get("/api/health/pool")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["capacity"] == 15
+
+    def test_metrics_endpoint(self, client: TestClient) -> None:
+        """Test GET /metrics (format Prometheus, latence par gabarit de route)."""
+        client.get("/api/health")
+
+        response = client.get("/metrics")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("text/plain")
+        assert (
+            'ted_http_request_duration_seconds_count{method="GET",'
+            'route="/api/health",status="200"}'
+        ) in response.text
+        assert "ted_sync_duration_seconds" in response.text
+
+
+class TestTenderJSONResponse:
+    """Tests pour la réponse JSON optimisée."""
+
+    def test_same_contract_as_pydantic(self, sample_tenders: list[Tender]) -> None:
+        """Test contenu identique à la sérialisation Pydantic standard."""
+        page = PaginatedResponse(total=4, page=1, limit=20, items=sample_tenders)
+        now = datetime.now()
+
+        with reference_time(now):
+            expected = page.model_dump_json().encode()
+
+        response = TenderJSONResponse(page, reference=now)
+        assert response.body == expected
+        assert response.media_type == "application/json"
+
+    def test_list_of_tenders(self, sample_tenders: list[Tender]) -> None:
+        """Test sérialisation d'une liste de Tender."""
+        response = TenderJSONResponse(sample_tenders)
+        assert response.body.startswith(b"[{")
+        assert b"111111-2024" in response.body
+
+    def test_plain_content(self) -> None:
+        """Test contenu natif (dict, liste vide)."""
+        assert TenderJSONResponse({"deleted": 3}).body == b'{"deleted":3}'
+        assert TenderJSONResponse([]).body == b"[]"
+
+    def test_plain_content_iso_datetimes(self) -> None:
+        """Test dates natives en ISO-8601, séparateur T et suffixe Z en UTC."""
+        body = TenderJSONResponse({"at": datetime(2024, 1, 2, 3, 4, 5, tzinfo=UTC)}).body
+        assert body == b'{"at":"2024-01-02T03:04:05Z"}'
@@ -0,0 +1,168 @@
+"""
+Tests pour le backfill historique par fenêtres de dates.
+
+Couvre:
+- Découpage de la période en fenêtres
+- Requête TED bornée par date de publication
+- Checkpoint par page, reprise et erreurs
+"""
+
+from datetime import date
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from ted_api.backfill import backfill_window_with, date_windows
+from ted_api.client import TEDAPIClient, TEDAPIError, TEDPageWindowError
+from ted_api.config import Settings
+from ted_api.database import TenderDatabase
+from ted_api.models import TED_FIELD_PROFILES, BackfillCheckpoint, TEDAPIResponse
+
+
+def test_date_windows() -> None:
+    """Test fenêtres contiguës couvrant toute la période."""
+    windows = date_windows(date(2024, 1, 1), date(2024, 3, 10), days=30)
+
+    assert windows == [
+        (date(2024, 1, 1), date(2024, 1, 30)),
+        (date(2024, 1, 31), date(2024, 2, 29)),
+        (date(2024, 3, 1), date(2024, 3, 10)),
+    ]
+    assert date_windows(date(2024, 1, 1), date(2024, 1, 1), days=7) == [
+        (date(2024, 1, 1), date(2024, 1, 1))
+    ]
+    with pytest.raises(ValueError):
+        date_windows(date(2024, 1, 1), date(2024, 1, 2), days=0)
+
+
+def test_query_published_range(test_settings: Settings) -> None:
+    """Test filtre de date de publication au format TED."""
+    client = TEDAPIClient(test_settings)
+
+    query = client.build_active_query(
+        country="FRA",
+        published_from=date(2024, 1, 1),
+        published_to=date(2024, 1, 31),
+    )
+
+    assert "publication-date >= 20240101" in query
+    assert "publication-date <= 20240131" in query
+
+
+class TestBackfillWindow:
+    """Tests pour backfill_window_with."""
+
+    @pytest.fixture
+    def db(self) -> AsyncMock:
+        """Base de données mockée (tout est inséré)."""
+        db = AsyncMock(spec=TenderDatabase)
+        db.upsert_tenders.side_effect = lambda tenders: (len(tenders), 0)
+        return db
+
+    def make_client(
+        self, mock_ted_response: dict[str, Any], pages: int, error: Exception | None = None
+    ) -> MagicMock:
+        """Client TED servant `pages` pages à partir de start_page."""
+        client = MagicMock()
+        client.build_active_query.return_value = "publication-date >= 20240101"
+
+        async def scan_pages(
+            query: str,
+            fields: list[str] | None = None,
+            scope: str = "ACTIVE",
+            start_page: int = 1,
+            start_token: str | None = None,
+            truncate: bool = True,
+        ):
+            for page in range(start_page, pages + 1):
+                yield TEDAPIResponse(
+                    total=2 * pages,
+                    page=page,
+                    notices=[
+                        {**notice, "ND": f"{page}-{notice['notice-id']}"}
+                        for notice in mock_ted_response["notices"]
+                    ],
+                    iteration_next_token=(
+                        f"token-{page + 1}" if page < pages or error else None
+                    ),
+                )
+            if error is not None:
+                raise error
+
+        client.scan_pages = MagicMock(side_effect=scan_pages)
+        return client
+
+    @pytest.mark.asyncio
+    async def test_resume_from_checkpoint(
+        self, db: AsyncMock, mock_ted_response: dict[str, Any]
+    ) -> None:
+        """Test reprise après la dernière page enregistrée."""
+        client = self.make_client(mock_ted_response, pages=3)
+        checkpoint = BackfillCheckpoint(
+            country="FRA",
+            window_start=date(2024, 1, 1),
+            window_end=date(2024, 1, 30),
+            status="error",
+            last_page=1,
+            fetched=2,
+            inserted=2,
+            iteration_token="token-2",
+        )
+
+        result = await backfill_window_with(client, db, checkpoint)
+
+        assert client.scan_pages.call_args.kwargs == {
+            "fields": TED_FIELD_PROFILES["listing"],
+            "scope": "ALL",
+            "start_page": 2,
+            "start_token": "token-2",
+            "truncate": False,
+        }
+        assert result.status == "completed"
+        assert result.last_page == 3
+        assert result.iteration_token is None
+        assert result.fetched == 6
+        assert result.inserted == 6
+        # running, une sauvegarde par page, état final
+        assert db.save_backfill_checkpoint.await_count == 4
+
+    @pytest.mark.asyncio
+    async def test_error_keeps_progress(
+        self, db: AsyncMock, mock_ted_response: dict[str, Any]
+    ) -> None:
+        """Test erreur TED : pages déjà upsert conservées dans le checkpoint."""
+        client = self.make_client(
+            mock_ted_response, pages=1, error=TEDAPIError("boom", status_code=503)
+        )
+        checkpoint = BackfillCheckpoint(
+            country="FRA", window_start=date(2024, 1, 1), window_end=date(2024, 1, 30)
+        )
+
+        result = await backfill_window_with(client, db, checkpoint)
+
+        assert result.status == "error"
+        assert result.error_message == "boom"
+        assert result.last_page == 1
+        saved = db.save_backfill_checkpoint.await_args.args[0]
+        assert saved.status == "error"
+        assert saved.last_page == 1
+        assert saved.iteration_token == "token-2"
+
+    @pytest.mark.asyncio
+    async def test_page_window_exceeded(
+        self, db: AsyncMock, mock_ted_response: dict[str, Any]
+    ) -> None:
+        """Test fenêtre trop large en mode page_number : erreur, jamais completed."""
+        client = self.make_client(
+            mock_ted_response, pages=0, error=TEDPageWindowError(20000, 15000)
+        )
+        checkpoint = BackfillCheckpoint(
+            country="FRA", window_start=date(2024, 1, 1), window_end=date(2024, 1, 30)
+        )
+
+        result = await backfill_window_with(client, db, checkpoint)
+
+        assert result.status == "error"
+        assert "20000" in (result.error_message or "")
+        assert result.last_page == 0
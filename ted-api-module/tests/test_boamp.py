@@ -0,0 +1,190 @@
+"""
+Tests pour l'ingestion BOAMP (export Opendatasoft).
+
+Couvre:
+- Décodage CSV incrémental (champs multilignes, blocs coupés)
+- Conversion des enregistrements en lignes tender_cache
+- Pipeline export -> lots -> upsert
+"""
+
+import json
+from collections.abc import AsyncIterator
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from ted_api.boamp import (
+    BoampExportError,
+    boamp_record_to_tender,
+    ingest_boamp,
+    iter_csv_lines,
+    iter_csv_records,
+)
+from ted_api.database import TenderDatabase
+
+
+async def chunked(text: str, size: int) -> AsyncIterator[str]:
+    """Flux texte découpé en blocs de `size` caractères."""
+    for index in range(0, len(text), size):
+        yield text[index : index + size]
+
+
+def make_record(**overrides: str) -> dict[str, str]:
+    """Enregistrement d'export BOAMP minimal."""
+    record = {
+        "idweb": "24-123456",
+        "objet": "Fourniture de gilets pare-balles",
+        "nomacheteur": "Ministère des Armées",
+        "datelimitereponse": "2025-01-15T12:00:00+01:00",
+        "datefindiffusion": "2025-01-16",
+        "dateparution": "2024-12-11",
+        "donnees": json.dumps(
+            {"OBJET": {"CPV": {"PRINCIPAL": "35811300"}, "VALEUR_TOTALE": "150000"}}
+        ),
+        "procedure_libelle": "Procédure ouverte",
+        "nature_libelle": "Avis de marché",
+        "famille_libelle": "Fournitures courantes",
+        "code_departement": "75|92",
+        "url_avis": "https://www.boamp.fr/avis/detail/24-123456",
+        "type_marche": "FOURNITURES",
+        "perimetre": "National",
+    }
+    record.update(overrides)
+    return record
+
+
+@pytest.mark.asyncio
+async def test_iter_csv_records_multiline() -> None:
+    """Test champs entre guillemets sur plusieurs lignes, blocs arbitraires."""
+    csv_text = (
+        "\ufeffidweb;objet;donnees\r\n"
+        '1;"Objet; avec ""guillemets""";"{""a"":\n""b c""}"\r\n'
+        "2;Simple;\r\n"
+    )
+
+    for size in (1, 3, 7, len(csv_text)):
+        records = [r async for r in iter_csv_records(iter_csv_lines(chunked(csv_text, size)))]
+
+        assert [r["idweb"] for r in records] == ["1", "2"]
+        assert records[0]["objet"] == 'Objet; avec "guillemets"'
+        assert json.loads(records[0]["donnees"]) == {"a": "b c"}
+        assert records[1] == {"idweb": "2", "objet": "Simple", "donnees": ""}
+
+
+class TestBoampRecordToTender:
+    """Tests pour boamp_record_to_tender."""
+
+    def test_convert_record(self) -> None:
+        """Test conversion complète (CPV, montant, nature, dates)."""
+        tender = boamp_record_to_tender(make_record())
+
+        assert tender is not None
+        assert tender.id == "24-123456"
+        assert tender.buyer_department == "75"
+        assert tender.cpv == "35811300"
+        assert tender.is_defense_equipment is True
+        assert tender.amount_range == "large"
+        assert tender.market_nature == "fournitures"
+        assert tender.is_joue is False
+        assert tender.sectors == ["Fournitures courantes"]
+        assert tender.publication_date.isoformat() == "2024-12-11T00:00:00+00:00"
+        assert tender.deadline_date is not None
+        assert tender.deadline_date.utcoffset() is not None
+        assert tender.raw_data["donnees"]["OBJET"]["VALEUR_TOTALE"] == "150000"
+
+    def test_convert_eforms_fallbacks(self) -> None:
+        """Test eForms : CPV, montant et JOUE ; date limite depuis donnees."""
+        donnees = {
+            "EFORMS": {
+                "ContractNotice": {
+                    "cac:ProcurementProject": {
+                        "cac:MainCommodityClassification": {
+                            "cbc:ItemClassificationCode": {"#text": "72000000"}
+                        },
+                        "cac:RequestedTenderTotal": {
+                            "cbc:EstimatedOverallContractAmount": {"#text": "30000"}
+                        },
+                    }
+                }
+            },
+            "CONDITION_DELAI": {"RECEPT_OFFRES": "2025-02-01T16:00:00"},
+        }
+        tender = boamp_record_to_tender(
+            make_record(
+                donnees=json.dumps(donnees),
+                datelimitereponse="",
+                datefindiffusion="",
+                type_marche="SERVICES",
+            )
+        )
+
+        assert tender is not None
+        assert tender.cpv == "72000000"
+        assert tender.is_defense_equipment is False
+        assert tender.amount_range == "small"
+        assert tender.is_joue is True
+        assert tender.market_nature == "services"
+        assert tender.expires_at == tender.deadline_date
+        assert tender.deadline_date.isoformat() == "2025-02-01T16:00:00+00:00"
+
+    def test_skip_incomplete(self) -> None:
+        """Test enregistrements sans identifiant ou date de parution ignorés."""
+        assert boamp_record_to_tender(make_record(idweb="")) is None
+        assert boamp_record_to_tender(make_record(dateparution="inconnue")) is None
+        tender = boamp_record_to_tender(make_record(donnees="{invalide"))
+        assert tender is not None
+        assert tender.cpv is None
+
+
+class TestIngestBoamp:
+    """Tests pour ingest_boamp."""
+
+    @pytest.fixture
+    def db(self) -> AsyncMock:
+        """Base de données mockée (tout est inséré)."""
+        db = AsyncMock(spec=TenderDatabase)
+        db.upsert_tender_cache.side_effect = lambda batch: (len(batch), 0)
+        return db
+
+    def make_client(
+        self, records: list[dict[str, str]], error: Exception | None = None
+    ) -> MagicMock:
+        """Client d'export servant des enregistrements prédéfinis."""
+
+        async def iter_records(where: str | None = None) -> AsyncIterator[dict[str, Any]]:
+            for record in records:
+                yield record
+            if error is not None:
+                raise error
+
+        client = MagicMock()
+        client.iter_records = MagicMock(side_effect=iter_records)
+        return client
+
+    @pytest.mark.asyncio
+    async def test_batches(self, db: AsyncMock) -> None:
+        """Test lots de batch_size et enregistrements ignorés comptés."""
+        records = [make_record(idweb=f"24-{i}") for i in range(5)] + [make_record(idweb="")]
+        client = self.make_client(records)
+
+        where = "dateparution >= date'2024-01-01'"
+        result = await ingest_boamp(client, db, where=where, batch_size=2)
+
+        assert [len(c.args[0]) for c in db.upsert_tender_cache.await_args_list] == [2, 2, 1]
+        assert result["records"] == 6
+        assert result["skipped"] == 1
+        assert result["inserted"] == 5
+        client.iter_records.assert_called_once_with(where)
+
+    @pytest.mark.asyncio
+    async def test_export_error_propagates(self, db: AsyncMock) -> None:
+        """Test erreur d'export : lots déjà reçus écrits, erreur levée."""
+        client = self.make_client(
+            [make_record(idweb="24-1")], error=BoampExportError("boom", status_code=503)
+        )
+
+        with pytest.raises(BoampExportError):
+            await ingest_boamp(client, db)
+
+        db.upsert_tender_cache.assert_awaited_once()
@@ -10,6 +10,7 @@ import asyncio
 from typing import Any
 
 import pytest
+from prometheus_client import REGISTRY
 
 from ted_api.cache import (
     CacheBackend,
@@ -153,6 +154,26 @@ class TestMemoryCache:
         assert cache.size == 100
 
 
+    @pytest.mark.asyncio
+    async def test_hit_miss_metrics(self, cache: MemoryCache) -> None:
+        """Test comptage des hits/misses par backend."""
+
+        def sample(result: str) -> float:
+            return REGISTRY.get_sample_value(
+                "ted_cache_requests_total",
+                {"backend": "MemoryCache", "result": result},
+            ) or 0.0
+
+        hits, misses = sample("hit"), sample("miss")
+
+        await cache.set("key1", "value", ttl=60)
+        await cache.get("key1")
+        await cache.get("missing")
+
+        assert sample("hit") == hits + 1
+        assert sample("miss") == misses + 1
+
+
 class TestGetCacheBackend:
     """Tests pour la factory get_cache_backend."""
 
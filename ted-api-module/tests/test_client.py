@@ -5,9 +5,12 @@ Couvre:
 - Requêtes HTTP mockées
 - Retry sur erreurs 429/503
 - Pagination automatique
+- Découpage des requêtes dépassant la fenêtre de pagination
 - Cache intégré
 """
 
+import re
+from datetime import date, timedelta
 from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -16,7 +19,7 @@ import pytest
 import pytest_asyncio
 
 from ted_api.cache import MemoryCache
-from ted_api.client import TEDAPIClient, TEDAPIError
+from ted_api.client import TEDAPIClient, TEDAPIError, TEDPageWindowError, count_requests
 from ted_api.config import Settings
 from ted_api.models import TEDAPIResponse
 
@@ -277,6 +280,220 @@ class TestTEDAPIClient:
 
         await client.close()
 
+    @pytest.mark.asyncio
+    async def test_count_requests(
+        self,
+        client: TEDAPIClient,
+    ) -> None:
+        """Test comptage des requêtes HTTP dans un contexte."""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"total": 0, "notices": []}
+
+        with patch.object(
+            client, "_ensure_client", new_callable=AsyncMock
+        ) as mock_ensure:
+            mock_ensure.return_value.post = AsyncMock(return_value=mock_response)
+
+            await client._request({"query": "hors contexte"})
+            with count_requests() as counter:
+                await client._request({"query": "a"})
+                await client._request({"query": "b"})
+
+        assert counter.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_split_query(self, client: TEDAPIClient) -> None:
+        """Test découpage par dates puis par CPV jusqu'à tenir dans la fenêtre."""
+        client.settings.ted_max_page_window = 100
+        hot_day = date(2024, 1, 10)
+        # 30 notices/jour (division 30), 150 le 10/01 réparties par CPV
+        # (dont 10 classées au seul niveau de la division 45)
+        hot = {"45": 10, "451": 60, "452": 50, "72": 30}
+
+        async def fake_count(query: str, scope: str = "ACTIVE") -> int:
+            start, end = (
+                date.fromisoformat(d)
+                for d in re.findall(r"publication-date [<>]= (\d{8})", query)
+            )
+            cpv = re.search(r"classification-cpv = (\d+)", query)
+            prefix = cpv.group(1).rstrip("0").ljust(2, "0") if cpv else ""
+            not_in = re.search(r"NOT IN \(([\d ]+)\)", query)
+            excluded = [c.rstrip("0") for c in not_in.group(1).split()] if not_in else []
+            total = 0
+            day = start
+            while day <= end:
+                distribution = hot if day == hot_day else {"30": 30}
+                total += sum(
+                    n
+                    for k, n in distribution.items()
+                    if k.startswith(prefix) and not any(k.startswith(e) for e in excluded)
+                )
+                day += timedelta(days=1)
+            return total
+
+        with patch.object(client, "count_notices", side_effect=fake_count):
+            subqueries = await client.split_query(
+                "notice-type = cn-standard",
+                published_from=date(2024, 1, 1),
+                published_to=hot_day,
+            )
+
+        assert sum(total for _, total in subqueries) == 420
+        assert all(total <= 100 for _, total in subqueries)
+        cpv_queries = {
+            q.split("classification-cpv = ", 1)[1]: n for q, n in subqueries if "cpv" in q
+        }
+        residual = next(code for code in cpv_queries if "NOT IN" in code)
+        assert cpv_queries == {"45100000": 60, "45200000": 50, residual: 10, "72000000": 30}
+        assert residual.startswith("45000000 AND")
+
+    @pytest.mark.asyncio
+    async def test_iter_pages_complete_dedup(self, client: TEDAPIClient) -> None:
+        """Test sous-requêtes parallèles et déduplication par identifiant."""
+        client.settings.ted_max_page_window = 100
+        client.settings.ted_pagination_mode = "page_number"
+        notices = {
+            "base": ["1"],
+            "sub-a": ["1", "2"],
+            "sub-b": ["2", "3"],
+        }
+
+        async def fake_request(payload: dict[str, Any]) -> dict[str, Any]:
+            ids = notices[payload["query"]]
+            total = 500 if payload["query"] == "base" else len(ids)
+            return {"totalNoticeCount": total, "notices": [{"ND": i} for i in ids]}
+
+        with (
+            patch.object(client, "_request", side_effect=fake_request),
+            patch.object(
+                client,
+                "split_query",
+                AsyncMock(return_value=[("sub-a", 2), ("sub-b", 2)]),
+            ),
+        ):
+            pages = [page async for page in client.iter_pages_complete("base")]
+
+        ids = sorted(n["ND"] for page in pages for n in page.notices)
+        assert ids == ["1", "2", "3"]
+        assert all(page.total == 4 for page in pages)
+
+    @pytest.mark.asyncio
+    async def test_iter_pages_complete_error(self, client: TEDAPIClient) -> None:
+        """Test erreur d'une sous-requête propagée en TEDAPIError."""
+        client.settings.ted_max_page_window = 100
+        client.settings.ted_pagination_mode = "page_number"
+
+        async def fake_request(payload: dict[str, Any]) -> dict[str, Any]:
+            if payload["query"] == "sub-b":
+                raise httpx.ConnectError("down")
+            return {"totalNoticeCount": 500, "notices": [{"ND": payload["query"]}]}
+
+        with (
+            patch.object(client, "_request", side_effect=fake_request),
+            patch.object(
+                client,
+                "split_query",
+                AsyncMock(return_value=[("sub-a", 1), ("sub-b", 1)]),
+            ),
+        ):
+            with pytest.raises(TEDAPIError):
+                async for _ in client.iter_pages_complete("base"):
+                    pass
+
+    @pytest.mark.asyncio
+    async def test_iter_pages_window(self, client: TEDAPIClient) -> None:
+        """Test fenêtre de pagination : troncature signalée ou TEDPageWindowError."""
+        client.settings.ted_max_page_window = 100
+        client.settings.ted_pagination_mode = "page_number"
+
+        async def fake_search(**kwargs: Any) -> TEDAPIResponse:
+            return TEDAPIResponse(
+                total=150, page=kwargs["page"], notices=[{"ND": str(i)} for i in range(10)]
+            )
+
+        with patch.object(client, "search_tenders", side_effect=fake_search) as mock:
+            pages = [page async for page in client.iter_pages("q")]
+            assert len(pages) == 10
+
+            mock.reset_mock()
+            with pytest.raises(TEDPageWindowError) as error:
+                async for _ in client.scan_pages("q", truncate=False):
+                    pass
+
+        assert (error.value.total, error.value.window) == (150, 100)
+        mock.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_iter_pages_iteration(self, client: TEDAPIClient) -> None:
+        """Test pagination par jeton : pas de numéro de page, pas de cache."""
+        tokens = {None: ("t2", ["1", "2"]), "t2": ("t3", ["3"]), "t3": (None, ["4"])}
+
+        async def fake_request(payload: dict[str, Any]) -> dict[str, Any]:
+            assert payload["paginationMode"] == "ITERATION"
+            assert "page" not in payload
+            token, ids = tokens[payload.get("iterationNextToken")]
+            return {
+                "totalNoticeCount": 4,
+                "notices": [{"ND": i} for i in ids],
+                "iterationNextToken": token,
+            }
+
+        with patch.object(client, "_request", side_effect=fake_request) as mock:
+            pages = [page async for page in client.iter_pages_iteration("q")]
+            resumed = [
+                page async for page in client.scan_pages("q", start_page=3, start_token="t3")
+            ]
+
+        assert [page.page for page in pages] == [1, 2, 3]
+        assert [page.iteration_next_token for page in pages] == ["t2", "t3", None]
+        assert [n["ND"] for page in pages for n in page.notices] == ["1", "2", "3", "4"]
+        assert [page.page for page in resumed] == [3]
+        assert mock.call_count == 4
+        assert client.cache._cache == {}
+
+    @pytest.mark.asyncio
+    async def test_iteration_token_expired(self, client: TEDAPIClient) -> None:
+        """Test jeton de reprise refusé : parcours relancé depuis le début."""
+        calls: list[str | None] = []
+
+        async def fake_search(**kwargs: Any) -> TEDAPIResponse:
+            calls.append(kwargs["iteration_token"])
+            if kwargs["iteration_token"] == "stale":
+                raise TEDAPIError("expired", status_code=400)
+            return TEDAPIResponse(total=1, page=kwargs["page"], notices=[{"ND": "1"}])
+
+        with patch.object(client, "search_tenders", side_effect=fake_search):
+            pages = [
+                page
+                async for page in client.iter_pages_iteration(
+                    "q", start_page=5, start_token="stale"
+                )
+            ]
+
+        assert calls == ["stale", None]
+        assert [page.page for page in pages] == [1]
+
+    @pytest.mark.asyncio
+    async def test_iter_pages_complete_iteration(self, client: TEDAPIClient) -> None:
+        """Test fenêtre dépassée en mode iteration : parcours par jeton, sans découpage."""
+        client.settings.ted_max_page_window = 100
+
+        async def fake_request(payload: dict[str, Any]) -> dict[str, Any]:
+            if "paginationMode" not in payload:
+                return {"totalNoticeCount": 500, "notices": [{"ND": "probe"}]}
+            return {"totalNoticeCount": 500, "notices": [{"ND": "1"}], "iterationNextToken": None}
+
+        split = AsyncMock()
+        with (
+            patch.object(client, "_request", side_effect=fake_request),
+            patch.object(client, "split_query", split),
+        ):
+            pages = [page async for page in client.iter_pages_complete("base")]
+
+        assert [n["ND"] for page in pages for n in page.notices] == ["1"]
+        split.assert_not_awaited()
+
     @pytest.mark.asyncio
     async def test_check_query_syntax_valid(
         self,
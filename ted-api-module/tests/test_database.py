@@ -1,5 +1,7 @@
 """
-Tests pour la base de données SQLite.
+Tests pour la base de données PostgreSQL.
+
+Les tests sur base réelle sont ignorés sans TED_TEST_DATABASE_URL (conftest).
 
 Couvre:
 - Initialisation du schéma
@@ -8,25 +10,47 @@ Couvre:
 - Statistiques
 """
 
-from datetime import datetime, timedelta
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import UTC, date, datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
-import pytest_asyncio
-
-from ted_api.database import TenderDatabase
-from ted_api.models import Tender, TenderFilter
+from prometheus_client import REGISTRY
+from sqlalchemy import text
+
+from ted_api.config import Settings
+from ted_api.database import (
+    MIGRATION_LOCK_NAMESPACE,
+    SCHEMA_MIGRATIONS,
+    TED_TENDERS_INDEX_SQL,
+    SchemaMigration,
+    TenderDatabase,
+    add_months,
+    concurrent_index_sql,
+    created_index_name,
+    month_start,
+    ted_partition_name,
+)
+from ted_api.models import (
+    DERIVED_TENDER_FIELDS,
+    SearchFilter,
+    SyncCheckpoint,
+    SyncPhase,
+    SyncReport,
+    Tender,
+    TenderFilter,
+    reference_time,
+)
 
 
 class TestTenderDatabase:
     """Tests pour TenderDatabase."""
 
-    @pytest_asyncio.fixture
-    async def db(self, tmp_path) -> TenderDatabase:
-        """Fixture base de données de test."""
-        db = TenderDatabase(str(tmp_path / "test.db"))
-        await db.init_schema()
-        yield db
-        await db.close()
+    @pytest.fixture
+    def db(self, test_db: TenderDatabase) -> TenderDatabase:
+        """Base PostgreSQL de test (voir conftest.test_db)."""
+        return test_db
 
     @pytest.mark.asyncio
     async def test_init_schema(self, db: TenderDatabase) -> None:
@@ -35,6 +59,27 @@ class TestTenderDatabase:
         # Re-exécuter init_schema ne devrait pas échouer
         await db.init_schema()
 
+    @pytest.mark.asyncio
+    async def test_module_tables_created_by_migration(self, db: TenderDatabase) -> None:
+        """Test tables du module créées par la migration 0, pas à chaque démarrage."""
+        async with db._begin() as conn:
+            await conn.execute(text("DROP TABLE tender_duplicates"))
+
+        # Migration enregistrée : le démarrage ne recrée rien
+        await db.init_schema()
+        async with db._connect() as conn:
+            result = await conn.execute(text("SELECT to_regclass('tender_duplicates')"))
+            assert result.scalar() is None
+
+        async with db._begin() as conn:
+            await conn.execute(text("DELETE FROM schema_migrations WHERE version = 0"))
+        assert await db.apply_migrations() == [0]
+        async with db._connect() as conn:
+            result = await conn.execute(text("SELECT version FROM schema_migrations"))
+            assert set(result.scalars().all()) >= {m.version for m in SCHEMA_MIGRATIONS}
+            result = await conn.execute(text("SELECT to_regclass('tender_duplicates')"))
+            assert result.scalar() is not None
+
     @pytest.mark.asyncio
     async def test_upsert_single_tender(
         self, db: TenderDatabase, sample_tender: Tender
@@ -138,6 +183,18 @@ class TestTenderDatabase:
         # Deux tenders ont des CPV commençant par 30
         assert result.total >= 1
 
+    def test_build_where_cpv_full_code_or_prefix(self) -> None:
+        """Test code CPV complet (containment JSONB) ou préfixe (LIKE)."""
+        where_sql, params = TenderDatabase._build_where(
+            TenderFilter(country=None, cpv="30200000")
+        )
+        assert "cpv_codes @> CAST(:cpv AS jsonb)" in where_sql
+        assert params == {"cpv": '["30200000"]'}
+
+        where_sql, params = TenderDatabase._build_where(TenderFilter(country=None, cpv="302"))
+        assert "LIKE :cpv_prefix" in where_sql
+        assert params == {"cpv_prefix": "302%"}
+
     @pytest.mark.asyncio
     async def test_get_tenders_filter_value_range(
         self, db: TenderDatabase, sample_tenders: list[Tender]
@@ -169,6 +226,40 @@ class TestTenderDatabase:
         assert result.total >= 1
         assert any("informatique" in t.title.lower() for t in result.items)
 
+    @pytest.mark.asyncio
+    async def test_derived_fields_match_python(
+        self, db: TenderDatabase, sample_tender: Tender
+    ) -> None:
+        """Test champs dérivés calculés en SQL identiques au calcul Python (bornes)."""
+        now = datetime(2030, 6, 15, 12, 0, 0)
+        cases = [
+            (timedelta(0), 0.005),
+            (timedelta(seconds=1), 0.015),
+            (-timedelta(seconds=1), 2.675),
+            (timedelta(days=1), 1234567.125),
+            (-timedelta(days=1, seconds=1), 9999999999999.99),
+            (timedelta(days=2, hours=23), None),
+            (None, 1000.0),
+        ]
+        await db.upsert_tenders([
+            sample_tender.model_copy(update={
+                "notice_id": f"derived-{i}",
+                "deadline": None if offset is None else (now + offset).replace(tzinfo=UTC),
+                "estimated_value": value,
+            })
+            for i, (offset, value) in enumerate(cases)
+        ])
+
+        result = await db.get_tenders(limit=50, reference_time=now)
+        assert result.total == len(cases)
+        for tender in result.items:
+            from_sql = {name: getattr(tender, name) for name in DERIVED_TENDER_FIELDS}
+            plain = Tender.model_validate(
+                tender.model_dump(exclude=set(DERIVED_TENDER_FIELDS))
+            )
+            with reference_time(now):
+                assert from_sql == {name: getattr(plain, name) for name in DERIVED_TENDER_FIELDS}
+
     @pytest.mark.asyncio
     async def test_get_tenders_pagination(
         self, db: TenderDatabase, sample_tenders: list[Tender]
@@ -192,6 +283,178 @@ class TestTenderDatabase:
         ids2 = {t.notice_id for t in result2.items}
         assert ids1.isdisjoint(ids2)
 
+    @pytest.mark.asyncio
+    async def test_iter_tenders_batches(
+        self, db: TenderDatabase, sample_tenders: list[Tender]
+    ) -> None:
+        """Test parcours par lots (curseur serveur)."""
+        await db.upsert_tenders(sample_tenders)
+
+        batches = [
+            batch async for batch in db.iter_tenders(TenderFilter(country=None), batch_size=3)
+        ]
+
+        assert [len(batch) for batch in batches] == [3, 1]
+        ids = {t.notice_id for batch in batches for t in batch}
+        assert ids == {t.notice_id for t in sample_tenders}
+
+    @pytest.mark.asyncio
+    async def test_pool_status_tracks_checkouts(
+        self, db: TenderDatabase, sample_tender: Tender
+    ) -> None:
+        """Test mesure des checkouts et de l'utilisation du pool."""
+        before = db.pool_status()["checkouts"]
+        await db.upsert_tenders([sample_tender])
+        await db.get_tender_by_id(sample_tender.notice_id)
+
+        status = db.pool_status()
+        assert status["checkouts"] == before + 2
+        assert status["checked_out"] == 0
+        assert status["waiting"] == 0
+        assert status["checkout_wait_max"] >= status["checkout_wait_avg"] >= 0
+
+    @pytest.mark.asyncio
+    async def test_statement_cache_disabled(
+        self, db: TenderDatabase, test_settings: Settings
+    ) -> None:
+        """Test caches désactivés : statements asyncpg nommés de façon unique."""
+        settings = test_settings.model_copy(update={"db_statement_cache_size": 0})
+        options = settings.database_engine_options
+        connect_args = options["connect_args"]
+        assert connect_args["statement_cache_size"] == 0
+        name = connect_args["prepared_statement_name_func"]
+        assert name() != name()
+
+        uncached = TenderDatabase(db.database_url, engine_options=options)
+        try:
+            for _ in range(2):
+                assert await uncached.get_tender_by_id("missing") is None
+        finally:
+            await uncached.close()
+
+    @pytest.mark.asyncio
+    async def test_pool_metrics_updated_on_checkout(self, db: TenderDatabase) -> None:
+        """Test jauges du pool mises à jour au checkout/checkin (sans set_function)."""
+
+        def sample(name: str) -> float:
+            return REGISTRY.get_sample_value(name) or 0.0
+
+        db.enable_pool_metrics()
+        capacity = db.pool_status()["capacity"]
+        assert sample("ted_db_pool_capacity") == capacity
+
+        async with db._connect():
+            assert sample("ted_db_pool_checked_out") == 1
+        assert sample("ted_db_pool_checked_out") == 0
+        assert sample("ted_db_pool_waiting") == 0
+
+        await db.close()
+        assert sample("ted_db_pool_capacity") == 0
+
+    @pytest.mark.asyncio
+    async def test_sync_runs_history(self, db: TenderDatabase) -> None:
+        """Test enregistrement et lecture de l'historique des synchronisations."""
+        run_id = await db.create_sync_run("FRA", "scheduled")
+        report = SyncReport(
+            country="FRA",
+            started_at=datetime.now(),
+            elapsed_seconds=12.5,
+            pages=2,
+            api_calls=3,
+            fetched=150,
+            inserted=100,
+            updated=50,
+            phases=[SyncPhase(name="db.upsert_chunk", count=1, total_seconds=4.0)],
+        )
+        await db.finish_sync_run(run_id, report)
+        failed_id = await db.create_sync_run("DEU")
+        await db.finish_sync_run(failed_id, error="TED API error")
+
+        run = await db.get_sync_run(run_id)
+        assert run is not None
+        assert run.status == "completed"
+        assert run.trigger == "scheduled"
+        assert run.api_calls == 3
+        assert run.phases[0].name == "db.upsert_chunk"
+
+        history = await db.list_sync_runs(page=1, limit=10)
+        assert [r.id for r in history.items[:2]] == [failed_id, run_id]
+        assert history.items[0].error_message == "TED API error"
+
+        fra = await db.list_sync_runs(country="FRA")
+        assert all(r.country == "FRA" for r in fra.items)
+
+    @pytest.mark.asyncio
+    async def test_advisory_lock_waits(self, db: TenderDatabase) -> None:
+        """Test verrou bloquant : obtenu à la libération par l'autre session."""
+        held = await db.try_advisory_lock(MIGRATION_LOCK_NAMESPACE, "schema")
+        assert held is not None
+
+        waiter = asyncio.create_task(
+            db.advisory_lock(MIGRATION_LOCK_NAMESPACE, "schema", poll_interval=0.05)
+        )
+        await asyncio.sleep(0.2)
+        assert not waiter.done()
+
+        await held.release()
+        lock = await asyncio.wait_for(waiter, timeout=5)
+        assert await lock.is_held()
+        await lock.release()
+
+    @pytest.mark.asyncio
+    async def test_sync_lock_and_progress(self, db: TenderDatabase) -> None:
+        """Test verrou de synchronisation par pays et suivi de progression."""
+        lock = await db.acquire_sync_lock("FRA")
+        assert lock is not None
+        try:
+            assert await db.acquire_sync_lock("FRA") is None
+            other = await db.acquire_sync_lock("DEU")
+            assert other is not None
+            await other.release()
+
+            stale_id = await db.create_sync_run("FRA")
+            run_id = await db.create_sync_run("FRA")
+            await db.update_sync_progress(
+                run_id, pages=1, fetched=100, inserted=40, updated=10, expected=200
+            )
+        finally:
+            await lock.release()
+
+        lock = await db.acquire_sync_lock("FRA")
+        assert lock is not None
+        assert await lock.is_held()
+        await lock.release()
+
+        stale = await db.get_sync_run(stale_id)
+        assert stale is not None and stale.status == "interrupted"
+        run = await db.get_sync_run(run_id)
+        assert run is not None
+        assert run.status == "running"
+        assert run.expected == 200
+        assert run.progress == 0.25
+        await db.finish_sync_run(run_id, error="test")
+
+    @pytest.mark.asyncio
+    async def test_sync_checkpoint_roundtrip(self, db: TenderDatabase) -> None:
+        """Test enregistrement, expiration et suppression d'un checkpoint."""
+        checkpoint = SyncCheckpoint(
+            fingerprint="test-fingerprint", country="FRA", query="q", last_page=3, fetched=300
+        )
+        await db.save_sync_checkpoint(checkpoint)
+        checkpoint.last_page = 4
+        checkpoint.iteration_token = "next-token"
+        await db.save_sync_checkpoint(checkpoint)
+
+        loaded = await db.get_sync_checkpoint("test-fingerprint", max_age_seconds=3600)
+        assert loaded is not None
+        assert loaded.last_page == 4
+        assert loaded.iteration_token == "next-token"
+        assert loaded.updated_at is not None
+        assert await db.get_sync_checkpoint("test-fingerprint", max_age_seconds=0) is None
+
+        await db.delete_sync_checkpoint("test-fingerprint")
+        assert await db.get_sync_checkpoint("test-fingerprint", max_age_seconds=3600) is None
+
     @pytest.mark.asyncio
     async def test_get_new_tenders_since(
         self, db: TenderDatabase, sample_tenders: list[Tender]
@@ -262,3 +525,319 @@ class TestTenderDatabase:
 
         assert stats["total"] == 0
         assert stats["active"] == 0
+
+
+class TestSearchWhere:
+    """Tests pour la clause WHERE de la recherche unifiée."""
+
+    def test_all_sources_dedupe_joue(self) -> None:
+        """Test défaut : pas de filtre de source, doublons BOAMP de TED masqués."""
+        where_sql, params = TenderDatabase._build_search_where(None)
+
+        assert "source = ANY" not in where_sql
+        assert "tender_duplicates" in where_sql
+        assert params == {}
+
+    def test_sources_without_ted_keep_duplicates(self) -> None:
+        """Test sans TED : les avis BOAMP ayant un doublon restent visibles."""
+        where_sql, params = TenderDatabase._build_search_where(
+            SearchFilter(sources=["PLACE", "BOAMP"], cpv="35811300", days_remaining=5)
+        )
+
+        assert "tender_duplicates" not in where_sql
+        assert params["sources"] == ["BOAMP", "PLACE"]
+        assert params["cpv"] == '["35811300"]'
+        assert params["days_remaining"] == 5
+
+
+class TestTedPartitions:
+    """Tests pour le partitionnement mensuel de ted_tenders."""
+
+    def test_month_helpers(self) -> None:
+        """Test mois UTC, décalage et nommage des partitions."""
+        paris = timezone(timedelta(hours=1))
+
+        assert month_start(datetime(2024, 3, 1, 0, 30, tzinfo=paris)) == date(2024, 2, 1)
+        assert month_start(datetime(2024, 3, 1, 0, 30)) == date(2024, 3, 1)
+        assert add_months(date(2024, 11, 1), 3) == date(2025, 2, 1)
+        assert add_months(date(2024, 1, 1), -1) == date(2023, 12, 1)
+        assert ted_partition_name(date(2024, 1, 1)) == "ted_tenders_p2024_01"
+
+    def test_partition_bounds(self) -> None:
+        """Test bornes UTC [début du mois, mois suivant)."""
+        sql = TenderDatabase._create_ted_partition_sql(date(2024, 12, 1))
+
+        assert "EXISTS ted_tenders_p2024_12" in sql
+        assert "FROM ('2024-12-01 00:00:00+00')" in sql
+        assert "TO ('2025-01-01 00:00:00+00')" in sql
+
+    @pytest.mark.asyncio
+    async def test_unpartitioned_is_noop(self) -> None:
+        """Test table non partitionnée : aucune requête de partition."""
+        db = TenderDatabase("postgresql+asyncpg://unused/unused")
+
+        assert await db.ensure_ted_partitions([date(2024, 1, 1)]) == 0
+        assert await db.expire_ted_partitions(6) == 0
+        assert db._engine is None
+
+    @pytest.mark.asyncio
+    async def test_upsert_keeps_notice_unique(
+        self, partitioned_test_db: TenderDatabase, sample_tender: Tender
+    ) -> None:
+        """Test notice déplacée si sa date de publication change, comptes exacts."""
+        db = partitioned_test_db
+        moved = sample_tender.model_copy(
+            update={
+                "title": "Titre corrigé",
+                "publication_date": sample_tender.publication_date - timedelta(days=40),
+            }
+        )
+        fresh = sample_tender.model_copy(update={"notice_id": "999-2024"})
+
+        assert await db.upsert_tenders([sample_tender]) == (1, 0)
+        assert await db.upsert_tenders([moved]) == (0, 1)
+        # Insérée puis mise à jour dans la même transaction : une insertion
+        assert await db.upsert_tenders([fresh, moved, fresh]) == (1, 2)
+
+        async with db._connect() as conn:
+            result = await conn.execute(
+                text("""
+                    SELECT publication_date, title FROM ted_tenders
+                    WHERE notice_id = :id
+                """),
+                {"id": sample_tender.notice_id},
+            )
+            rows = result.all()
+        assert len(rows) == 1
+        assert rows[0].title == "Titre corrigé"
+        assert rows[0].publication_date.date() == moved.publication_date.date()
+
+    def test_published_range_prunes(self) -> None:
+        """Test bornes de publication sur la clé de partitionnement (fin incluse)."""
+        where_sql, params = TenderDatabase._build_where(
+            TenderFilter(published_from=date(2024, 1, 1), published_to=date(2024, 1, 31))
+        )
+
+        assert "publication_date >= :published_from" in where_sql
+        assert "publication_date < :published_before" in where_sql
+        assert params["published_before"] == datetime(2024, 2, 1, tzinfo=UTC)
+
+
+class TestTedArchive:
+    """Tests pour l'archive des notices expirées."""
+
+    def test_archive_insert_sql(self) -> None:
+        """Test copie colonne à colonne, notice réarchivée remplacée."""
+        sql = TenderDatabase._archive_insert_sql("moved")
+
+        assert "INSERT INTO ted_tenders_archive (notice_id, title," in sql
+        assert "archived_at)" in sql
+        assert "SELECT DISTINCT ON (notice_id)" in sql
+        assert "FROM moved" in sql
+        assert "ORDER BY notice_id, updated_at DESC" in sql
+        assert "ON CONFLICT (notice_id) DO UPDATE" in sql
+        assert "notice_id = EXCLUDED.notice_id" not in sql
+        assert "cpv_codes = EXCLUDED.cpv_codes" in sql
+
+    @pytest.mark.asyncio
+    async def test_partitioned_archives_partitions_and_rows(
+        self, partitioned_test_db: TenderDatabase, sample_tender: Tender
+    ) -> None:
+        """Test table partitionnée : partition expirée copiée sans doublon, puis lots."""
+        db = partitioned_test_db
+        old_month = add_months(month_start(datetime.now(UTC).date()), -7)
+        old_publication = datetime.combine(old_month, datetime.min.time(), UTC)
+        await db.ensure_ted_partitions([old_publication])
+        # Doublon antérieur à l'unicité de notice_id, écrit hors upsert
+        async with db._begin() as conn:
+            await conn.execute(
+                text("""
+                    INSERT INTO ted_tenders (
+                        notice_id, title, buyer_name, buyer_country,
+                        publication_date, deadline, url, updated_at
+                    )
+                    SELECT 'old-1', title, 'Acheteur', 'FRA', published + shift,
+                        published + INTERVAL '1 day', 'https://test.com', published + shift
+                    FROM (VALUES ('Ancienne', INTERVAL '0 day'),
+                                 ('Récente', INTERVAL '2 day')) AS v(title, shift),
+                        CAST(:published AS TIMESTAMPTZ) AS published
+                """),
+                {"published": old_publication},
+            )
+        expired = sample_tender.model_copy(
+            update={
+                "notice_id": "expired-1",
+                "deadline": datetime.now() - timedelta(days=1),
+            }
+        )
+        await db.upsert_tenders([sample_tender, expired])
+
+        assert await db.archive_expired_tenders(partition_retention_months=3) == 3
+
+        archived = await db.get_archived_tender("old-1")
+        assert archived is not None
+        assert archived.title == "Récente"
+        assert await db.get_archived_tender("expired-1") is not None
+        assert await db.get_tender_by_id("expired-1") is None
+        assert await db.get_tender_by_id(sample_tender.notice_id) is not None
+
+    @pytest.mark.asyncio
+    async def test_partitioned_delete_kept_partitions(
+        self, partitioned_test_db: TenderDatabase, sample_tender: Tender
+    ) -> None:
+        """Test table partitionnée : notices expirées des partitions conservées supprimées."""
+        db = partitioned_test_db
+        expired = sample_tender.model_copy(
+            update={
+                "notice_id": "expired-1",
+                "deadline": datetime.now() - timedelta(days=1),
+            }
+        )
+        await db.upsert_tenders([sample_tender, expired])
+
+        assert await db.delete_expired_tenders(partition_retention_months=3) == 1
+        assert await db.get_tender_by_id("expired-1") is None
+        assert await db.get_tender_by_id(sample_tender.notice_id) is not None
+
+
+class TestSchemaMigrations:
+    """Tests pour les migrations versionnées."""
+
+    @pytest.fixture
+    def db(self) -> TenderDatabase:
+        """Base sans moteur : versions enregistrées et exécution mockées."""
+        db = TenderDatabase("postgresql+asyncpg://unused/unused")
+        conn = AsyncMock()
+        conn.execute.return_value.scalars = MagicMock()
+        conn.execute.return_value.scalars.return_value.all.return_value = [
+            migration.version for migration in SCHEMA_MIGRATIONS
+        ]
+
+        @asynccontextmanager
+        async def connect():
+            yield conn
+
+        db._connect = connect
+        db.try_advisory_lock = AsyncMock(return_value=AsyncMock())
+        db._run_concurrent_migration = AsyncMock()
+        db._run_transactional_migration = AsyncMock()
+        return db
+
+    def test_versions_ordered(self) -> None:
+        """Test versions uniques et croissantes, index repris sur la table partitionnée."""
+        versions = [migration.version for migration in SCHEMA_MIGRATIONS]
+
+        assert versions == sorted(set(versions))
+        indexes = next(migration for migration in SCHEMA_MIGRATIONS if migration.version == 1)
+        created = " ".join(indexes.statements)
+        for name in ("idx_ted_country_publication", "idx_ted_open_deadline"):
+            assert name in created
+            assert any(name in statement for statement in TED_TENDERS_INDEX_SQL)
+
+    def test_concurrent_index_sql(self) -> None:
+        """Test réécriture CONCURRENTLY et nom de l'index créé."""
+        create = "\n    CREATE UNIQUE INDEX IF NOT EXISTS idx_a ON t(a)"
+
+        assert "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS idx_a" in concurrent_index_sql(
+            create
+        )
+        assert concurrent_index_sql("DROP INDEX IF EXISTS idx_b") == (
+            "DROP INDEX CONCURRENTLY IF EXISTS idx_b"
+        )
+        assert concurrent_index_sql("ALTER TABLE t ADD COLUMN c INT") == (
+            "ALTER TABLE t ADD COLUMN c INT"
+        )
+        assert created_index_name(create) == "idx_a"
+        assert created_index_name("DROP INDEX IF EXISTS idx_b") is None
+
+    @pytest.mark.asyncio
+    async def test_apply_pending_only(self, db: TenderDatabase) -> None:
+        """Test migrations enregistrées ignorées, index CONCURRENTLY, verrou libéré."""
+        last = SCHEMA_MIGRATIONS[-1].version
+        index = SchemaMigration(last + 1, "index", ("SELECT 1",), concurrent=True)
+        column = SchemaMigration(last + 2, "column", ("SELECT 2",))
+
+        with patch("ted_api.database.SCHEMA_MIGRATIONS", SCHEMA_MIGRATIONS + (index, column)):
+            assert await db.apply_migrations() == [last + 1, last + 2]
+
+        db._run_concurrent_migration.assert_awaited_once_with(index)
+        db._run_transactional_migration.assert_awaited_once_with(column)
+        db.try_advisory_lock.return_value.release.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_partitioned_and_failure(self, db: TenderDatabase) -> None:
+        """Test table partitionnée : transaction ; échec : série interrompue."""
+        db._ted_partitioned = True
+        db._run_transactional_migration.side_effect = [None, RuntimeError("lock timeout")]
+        last = SCHEMA_MIGRATIONS[-1].version
+        migrations = SCHEMA_MIGRATIONS + (
+            SchemaMigration(last + 1, "index", ("SELECT 1",), concurrent=True),
+            SchemaMigration(last + 2, "column", ("SELECT 2",)),
+            SchemaMigration(last + 3, "other", ("SELECT 3",)),
+        )
+
+        with patch("ted_api.database.SCHEMA_MIGRATIONS", migrations):
+            assert await db.apply_migrations() == [last + 1]
+
+        db._run_concurrent_migration.assert_not_awaited()
+        assert db._run_transactional_migration.await_count == 2
+        db.try_advisory_lock.return_value.release.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_wait_when_locked(self, db: TenderDatabase) -> None:
+        """Test autre processus en cours de migration : attente, puis rien à rejouer."""
+        db.try_advisory_lock.return_value = None
+        db.advisory_lock = AsyncMock(return_value=AsyncMock())
+
+        assert await db.apply_migrations() == []
+        db.advisory_lock.assert_awaited_once()
+        db.advisory_lock.return_value.release.assert_awaited_once()
+        db._run_concurrent_migration.assert_not_awaited()
+
+
+class TestReadReplica:
+    """Tests pour le routage des lectures vers le réplica."""
+
+    def make_db(self, lag: float | Exception) -> TenderDatabase:
+        """Base avec réplica dont le retard mesuré est simulé."""
+        db = TenderDatabase(
+            "postgresql+asyncpg://unused/primary",
+            replica_url="postgresql+asyncpg://unused/replica",
+            replica_max_lag=30.0,
+            replica_check_interval=60.0,
+        )
+        db._replica_lag_seconds = AsyncMock(
+            side_effect=lag if isinstance(lag, Exception) else None, return_value=lag
+        )
+        return db
+
+    @pytest.mark.asyncio
+    async def test_without_replica(self) -> None:
+        """Test sans réplica : primaire, aucun moteur réplica."""
+        db = TenderDatabase("postgresql+asyncpg://unused/primary")
+
+        assert await db._use_replica() is False
+        assert db.replica_engine is None
+        assert "replica" not in db.pool_status()
+
+    @pytest.mark.asyncio
+    async def test_replica_within_lag_checked_once(self) -> None:
+        """Test réplica à jour utilisé, contrôle réutilisé pendant l'intervalle."""
+        db = self.make_db(1.5)
+
+        assert await db._use_replica() is True
+        assert await db._use_replica() is True
+        db._replica_lag_seconds.assert_awaited_once()
+        assert db.pool_status()["replica"]["lag"] == 1.5
+
+    @pytest.mark.asyncio
+    async def test_lagging_or_down_falls_back(self) -> None:
+        """Test retard au-delà du seuil ou réplica injoignable : primaire."""
+        db = self.make_db(45.0)
+        assert await db._use_replica() is False
+
+        db = self.make_db(OSError("connection refused"))
+        assert await db._use_replica() is False
+        status = db.pool_status()["replica"]
+        assert status["available"] is False
+        assert status["error"] == "connection refused"
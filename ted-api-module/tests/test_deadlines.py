@@ -0,0 +1,136 @@
+"""
+Tests pour l'index des deadlines de /api/tenders/expiring.
+
+Couvre:
+- Concaténation des seaux journaliers (bornes de la fenêtre SQL)
+- Réponses sans requête tant que ted_tenders n'a pas changé
+- Reconstruction : écriture locale, autre processus, changement de jour
+"""
+
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, PropertyMock
+
+import pytest
+
+from ted_api.database import TenderDatabase
+from ted_api.deadlines import DeadlineBucketIndex
+from ted_api.models import Tender
+
+NOW = datetime(2025, 3, 10, 14, 30)
+
+
+def make_tender(notice_id: str, deadline: datetime) -> Tender:
+    """Notice TED minimale."""
+    return Tender(
+        notice_id=notice_id,
+        title=f"Notice {notice_id}",
+        buyer_name="Acheteur",
+        buyer_country="FRA",
+        deadline=deadline,
+        publication_date=datetime(2025, 3, 1),
+        url=f"https://ted.europa.eu/notice/{notice_id}",
+    )
+
+
+@pytest.fixture
+def tenders() -> list[Tender]:
+    """Notices de la fenêtre, par deadline croissante (UTC, comme asyncpg)."""
+    return [
+        make_tender("today-passed", datetime(2025, 3, 10, 9, 0, tzinfo=UTC)),
+        make_tender("today", datetime(2025, 3, 10, 18, 0, tzinfo=UTC)),
+        make_tender("in-2-days", datetime(2025, 3, 12, 12, 0, tzinfo=UTC)),
+        make_tender("midnight-d3", datetime(2025, 3, 13, 0, 0, tzinfo=UTC)),
+        make_tender("late-d3", datetime(2025, 3, 13, 10, 0, tzinfo=UTC)),
+    ]
+
+
+@pytest.fixture
+def db(tenders: list[Tender]) -> AsyncMock:
+    """Base simulée : version des données 7, aucune écriture locale."""
+    mock = AsyncMock(spec=TenderDatabase)
+    mock.get_deadline_window.return_value = (7, tenders)
+    mock.get_tenders_changes.return_value = 7
+    type(mock).tenders_version = PropertyMock(return_value=0)
+    return mock
+
+
+class TestDeadlineBucketIndex:
+    """Tests pour DeadlineBucketIndex."""
+
+    @pytest.mark.asyncio
+    async def test_concatenates_buckets(self, db: AsyncMock) -> None:
+        """Test fenêtre [aujourd'hui 00:00, J+days 00:00] bornes incluses."""
+        index = DeadlineBucketIndex(db)
+
+        one_day = await index.get(1, NOW)
+        three_days = await index.get(3, NOW)
+
+        assert [t.notice_id for t in one_day] == ["today-passed", "today"]
+        assert [t.notice_id for t in three_days] == [
+            "today-passed", "today", "in-2-days", "midnight-d3",
+        ]
+        assert len(await index.get(30, NOW)) == 5
+        db.get_deadline_window.assert_awaited_once_with(NOW.date(), 31)
+
+    @pytest.mark.asyncio
+    async def test_no_query_until_check_interval(self, db: AsyncMock) -> None:
+        """Test version distante contrôlée au plus une fois par intervalle."""
+        index = DeadlineBucketIndex(db, check_interval=60.0)
+        for days in range(1, 31):
+            await index.get(days, NOW)
+
+        db.get_deadline_window.assert_awaited_once()
+        db.get_tenders_changes.assert_not_awaited()
+
+        index._checked_at -= 60.0
+        await index.get(7, NOW)
+        db.get_tenders_changes.assert_awaited_once()
+        db.get_deadline_window.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_rebuild_on_changes(self, db: AsyncMock) -> None:
+        """Test reconstruction : écriture locale, autre processus, minuit."""
+        index = DeadlineBucketIndex(db, check_interval=0.001)
+        await index.get(7, NOW)
+
+        type(db).tenders_version = PropertyMock(return_value=1)
+        await index.get(7, NOW)
+        assert db.get_deadline_window.await_count == 2
+
+        db.get_tenders_changes.return_value = 8
+        index._checked_at -= 1.0
+        await index.get(7, NOW)
+        assert db.get_deadline_window.await_count == 3
+
+        tomorrow = NOW + timedelta(days=1)
+        await index.get(7, tomorrow)
+        db.get_deadline_window.assert_awaited_with(tomorrow.date(), 31)
+
+    @pytest.mark.asyncio
+    async def test_version_check_failure_keeps_index(self, db: AsyncMock) -> None:
+        """Test échec du contrôle de version : index courant servi."""
+        index = DeadlineBucketIndex(db, check_interval=0.001)
+        await index.get(7, NOW)
+        db.get_tenders_changes.side_effect = OSError("connection refused")
+        index._checked_at -= 1.0
+
+        assert len(await index.get(7, NOW)) == 5
+        db.get_deadline_window.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_invalid_days(self, db: AsyncMock) -> None:
+        """Test days hors de l'horizon refusé."""
+        index = DeadlineBucketIndex(db)
+        with pytest.raises(ValueError):
+            await index.get(31, NOW)
+
+
+@pytest.mark.asyncio
+async def test_tenders_changed_hook() -> None:
+    """Test hook d'invalidation : version locale avancée même si la base échoue."""
+    db = TenderDatabase("postgresql+asyncpg://unused/primary")
+    db._connect = MagicMock(side_effect=OSError("connection refused"))
+
+    await db._tenders_changed()
+
+    assert db.tenders_version == 1
@@ -0,0 +1,145 @@
+"""
+Tests pour la détection des doublons entre sources.
+
+Couvre:
+- Clé de blocage (normalisation acheteur, date, division CPV)
+- Signature MinHash et similarité estimée
+- Appariement incrémental d'un lot ingéré
+"""
+
+from datetime import UTC, datetime, timedelta, timezone
+from unittest.mock import AsyncMock
+
+import pytest
+
+from ted_api.database import TenderDatabase
+from ted_api.dedup import (
+    blocking_key,
+    fingerprint_boamp,
+    fingerprint_tender,
+    index_duplicates,
+    match_fingerprints,
+    minhash_signature,
+    signature_similarity,
+    title_shingles,
+)
+from ted_api.models import BoampTender, Tender
+
+DEADLINE = datetime(2025, 1, 15, 11, 0, tzinfo=UTC)
+
+
+def make_pair() -> tuple[Tender, BoampTender]:
+    """Même marché publié sur TED et au BOAMP."""
+    ted = Tender(
+        notice_id="123456-2024",
+        title="Fourniture de gilets pare-balles pour la gendarmerie",
+        buyer_name="Ministère des Armées",
+        buyer_country="FRA",
+        publication_date=datetime(2024, 12, 11),
+        deadline=DEADLINE,
+        cpv_codes=["35811300"],
+        url="https://ted.europa.eu/fr/notice/-/detail/123456-2024",
+    )
+    boamp = BoampTender(
+        id="24-123456",
+        title="Fourniture de gilets pare balles - gendarmerie",
+        buyer_name="MINISTERE DES ARMEES",
+        publication_date=datetime(2024, 12, 11, tzinfo=UTC),
+        deadline_date=DEADLINE.astimezone(timezone(timedelta(hours=1))),
+        cpv="35800000",
+        is_joue=True,
+    )
+    return ted, boamp
+
+
+def test_blocking_key() -> None:
+    """Test clé identique malgré casse, accents, mots vides et fuseau."""
+    paris = timezone(timedelta(hours=1))
+
+    assert blocking_key("Ministère des Armées", DEADLINE, "35811300") == (
+        "ministere armees|2025-01-15|35"
+    )
+    assert blocking_key("MINISTERE DES ARMEES", DEADLINE.astimezone(paris), "35-800000") == (
+        "ministere armees|2025-01-15|35"
+    )
+    assert blocking_key(None, DEADLINE, "35811300") is None
+    assert blocking_key("Ministère des Armées", None, "35811300") is None
+    assert blocking_key("Ministère des Armées", DEADLINE, "3") is None
+
+
+def test_minhash_estimates_jaccard() -> None:
+    """Test signature déterministe, similarité proche du Jaccard exact."""
+    left = title_shingles("Fourniture de gilets pare-balles pour la gendarmerie")
+    right = title_shingles("Fourniture de gilets pare balles - gendarmerie")
+    jaccard = len(left & right) / len(left | right)
+
+    signature = minhash_signature(left)
+    assert signature == minhash_signature(set(left))
+    assert abs(signature_similarity(signature, minhash_signature(right)) - jaccard) < 0.2
+    assert signature_similarity(signature, signature) == 1.0
+    assert minhash_signature(title_shingles("!!")) == []
+
+
+def test_match_cross_source_only() -> None:
+    """Test appariement BOAMP/TED du même bloc, sans paire intra-source."""
+    ted, boamp = make_pair()
+    ted_fp = fingerprint_tender(ted)
+    boamp_fp = fingerprint_boamp(boamp)
+    assert ted_fp is not None and boamp_fp is not None
+    other = ted_fp.model_copy(update={"notice_id": "999999-2024"})
+    unrelated = fingerprint_boamp(boamp.model_copy(update={"title": "Entretien espaces verts"}))
+
+    matches = match_fingerprints([boamp_fp], [ted_fp, boamp_fp, unrelated])
+
+    assert [(m[0].notice_id, m[1].notice_id) for m in matches] == [("24-123456", "123456-2024")]
+    assert matches[0][2] >= 0.5
+    assert match_fingerprints([ted_fp], [other]) == []
+
+
+class TestIndexDuplicates:
+    """Tests pour index_duplicates."""
+
+    @pytest.mark.asyncio
+    async def test_index_batch(self) -> None:
+        """Test empreintes enregistrées, candidats lus par clé, paires remplacées."""
+        ted, boamp = make_pair()
+        db = AsyncMock(spec=TenderDatabase)
+        db.get_fingerprints.return_value = [fingerprint_tender(ted)]
+        boamp_fp = fingerprint_boamp(boamp)
+
+        pairs = await index_duplicates(db, "BOAMP", {boamp.id: boamp_fp, "24-999999": None})
+
+        assert pairs == 1
+        db.delete_fingerprints.assert_awaited_once_with("BOAMP", ["24-999999"])
+        db.save_fingerprints.assert_awaited_once_with([boamp_fp])
+        db.get_fingerprints.assert_awaited_once_with({boamp_fp.blocking_key})
+        batch, matches = db.save_duplicates.await_args.args
+        assert batch == [boamp_fp]
+        assert matches[0][1].source == "TED"
+
+    @pytest.mark.asyncio
+    async def test_failure_does_not_raise(self) -> None:
+        """Test best-effort : une erreur de base n'interrompt pas l'ingestion."""
+        _, boamp = make_pair()
+        db = AsyncMock(spec=TenderDatabase)
+        db.save_fingerprints.side_effect = RuntimeError("connection lost")
+
+        assert await index_duplicates(db, "BOAMP", {boamp.id: fingerprint_boamp(boamp)}) == 0
+        db.save_duplicates.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_unblockable_update_drops_pairs(self, test_db: TenderDatabase) -> None:
+        """Test avis mis à jour sans deadline : empreinte et doublons retirés."""
+        ted, boamp = make_pair()
+        await index_duplicates(test_db, "TED", {ted.notice_id: fingerprint_tender(ted)})
+        assert await index_duplicates(test_db, "BOAMP", {boamp.id: fingerprint_boamp(boamp)}) == 1
+        assert await test_db.get_duplicates("BOAMP", boamp.id)
+
+        updated = boamp.model_copy(update={"deadline_date": None})
+        assert fingerprint_boamp(updated) is None
+        assert await index_duplicates(test_db, "BOAMP", {boamp.id: None}) == 0
+
+        assert await test_db.get_duplicates("BOAMP", boamp.id) == []
+        assert await test_db.get_duplicates("TED", ted.notice_id) == []
+        candidates = await test_db.get_fingerprints({fingerprint_tender(ted).blocking_key})
+        assert [(fp.source, fp.notice_id) for fp in candidates] == [("TED", ted.notice_id)]
@@ -13,9 +13,12 @@ from datetime import datetime, timedelta
 import pytest
 
 from ted_api.models import (
+    DEFAULT_TED_FIELDS,
+    TED_FIELD_PROFILES,
     PaginatedResponse,
     Tender,
     TenderFilter,
+    reference_time,
     ted_notice_to_tender,
 )
 
@@ -198,6 +201,49 @@ class TestTender:
         assert "123456-2024" in json_data
         assert "FRA" in json_data
 
+    def test_reference_time_shared(self) -> None:
+        """Test heure de référence fixée pour tout un bloc de sérialisation."""
+        tender = Tender(
+            notice_id="test",
+            title="Test",
+            buyer_name="Test",
+            buyer_country="FRA",
+            publication_date=datetime(2024, 12, 1),
+            deadline=datetime(2025, 1, 15),
+            url="https://test.com",
+        )
+        with reference_time(datetime(2025, 1, 5, 12, 0)):
+            data = tender.model_dump()
+        assert data["days_until_deadline"] == 9
+        assert data["is_expired"] is False
+
+        with reference_time(datetime(2025, 1, 16)):
+            assert tender.is_expired is True
+            assert tender.days_until_deadline == -1
+
+    def test_derived_fields_precomputed(self) -> None:
+        """Test champs dérivés précalculés (ex: SQL) prioritaires."""
+        tender = Tender(
+            notice_id="test",
+            title="Test",
+            buyer_name="Test",
+            buyer_country="FRA",
+            publication_date=datetime.now(),
+            deadline=datetime.now() + timedelta(days=10),
+            estimated_value=1000.0,
+            url="https://test.com",
+        )
+        tender.set_derived_fields({
+            "days_until_deadline": 3,
+            "is_expired": False,
+            "formatted_value": "1,000.00 EUR",
+            "notice_id": "ignored",
+        })
+        data = tender.model_dump()
+        assert data["days_until_deadline"] == 3
+        assert data["formatted_value"] == "1,000.00 EUR"
+        assert data["notice_id"] == "test"
+
 
 class TestTenderFilter:
     """Tests pour le modèle TenderFilter."""
@@ -332,3 +378,31 @@ class TestTedNoticeToTender:
         assert tender.title == "Sans titre"
         assert tender.buyer_name == "Inconnu"
         assert tender.buyer_country == "UNKNOWN"
+
+    def test_listing_profile_keeps_tender(self) -> None:
+        """Test profil listing : même Tender qu'avec tous les champs."""
+        notice = {
+            "ND": "123456-2024",
+            "TI": {"fra": "Fourniture de serveurs", "eng": "Supply of servers"},
+            "publication-date": "2024-12-11+01:00",
+            "buyer-name": {"fra": ["Ministère de l'Intérieur"]},
+            "CY": ["FRA"],
+            "NC": ["supplies"],
+            "DT": ["2025-01-15+01:00"],
+            "DS": ["2024-12-09+01:00"],
+            "RC": ["FR101"],
+            "TVH": "250000",
+            "TVL": "200000",
+            "notice-type": "cn-standard",
+            "PR": "open",
+            "links": {
+                "html": {
+                    "FRA": "https://ted.europa.eu/fr/notice/-/detail/123456-2024",
+                    "ENG": "https://ted.europa.eu/en/notice/-/detail/123456-2024",
+                }
+            },
+        }
+        listing = {k: v for k, v in notice.items() if k in TED_FIELD_PROFILES["listing"]}
+
+        assert set(notice) == set(DEFAULT_TED_FIELDS)
+        assert ted_notice_to_tender(listing) == ted_notice_to_tender(notice)
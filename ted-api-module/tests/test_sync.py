@@ -0,0 +1,351 @@
+"""
+Tests pour le pipeline de synchronisation.
+
+Couvre:
+- Fetch/parse/upsert par lots via la file
+- Limite max_results
+- Propagation des erreurs TED
+- Enregistrement dans sync_runs et progression
+- Checkpoint de pagination et reprise après échec
+- Verrou par pays et synchronisation en tâche de fond
+- Élection du leader et rattrapage des créneaux planifiés manqués
+- Spans OpenTelemetry (exporter en mémoire) et SyncReport
+"""
+
+from datetime import datetime, timedelta
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from ted_api.client import TEDAPIError
+from ted_api.config import Settings
+from ted_api.coordination import LeaderElector
+from ted_api.database import LEADER_LOCK_NAMESPACE, TenderDatabase
+from ted_api.models import (
+    TED_FIELD_PROFILES,
+    PaginatedResponse,
+    SyncCheckpoint,
+    SyncRun,
+    TEDAPIResponse,
+)
+from ted_api.scheduler import TenderSyncScheduler
+from ted_api.sync import (
+    SyncAlreadyRunningError,
+    get_sync_job,
+    run_sync_pipeline,
+    start_sync_job,
+)
+from ted_api.tracing import configure_tracing, get_tracer
+
+
+def make_client(pages: list[TEDAPIResponse], error: Exception | None = None) -> MagicMock:
+    """Client TED mocké servant des pages prédéfinies."""
+    client = MagicMock()
+    client.build_active_query.return_value = "buyer-country = FRA"
+    client.pagination_fingerprint.return_value = "fingerprint"
+
+    async def scan_pages(*args: Any, start_page: int = 1, **kwargs: Any):
+        for page in pages:
+            if page.page >= start_page:
+                yield page
+        if error is not None:
+            raise error
+
+    client.scan_pages = MagicMock(side_effect=scan_pages)
+    return client
+
+
+def make_pages(mock_ted_response: dict[str, Any], count: int) -> list[TEDAPIResponse]:
+    """Pages de deux notices aux identifiants distincts, chaînées par jeton."""
+    pages = []
+    for index in range(count):
+        notices = [
+            {**notice, "notice-id": f"{index}-{notice['notice-id']}"}
+            for notice in mock_ted_response["notices"]
+        ]
+        token = f"token-{index + 2}" if index + 1 < count else None
+        pages.append(
+            TEDAPIResponse(
+                total=2 * count, page=index + 1, notices=notices, iteration_next_token=token
+            )
+        )
+    return pages
+
+
+class TestSyncPipeline:
+    """Tests pour run_sync_pipeline."""
+
+    @pytest.fixture
+    def db(self) -> AsyncMock:
+        """Base de données mockée (tout est inséré)."""
+        db = AsyncMock(spec=TenderDatabase)
+        db.upsert_tenders.side_effect = lambda chunk: (len(chunk), 0)
+        db.create_sync_run.return_value = 7
+        db.acquire_sync_lock.return_value = AsyncMock()
+        db.get_sync_checkpoint.return_value = None
+        return db
+
+    @pytest.mark.asyncio
+    async def test_chunks_and_report(
+        self, db: AsyncMock, mock_ted_response: dict[str, Any]
+    ) -> None:
+        """Test upsert par lots et compteurs du rapport."""
+        client = make_client(make_pages(mock_ted_response, 3))
+
+        report = await run_sync_pipeline(client, db, "FRA", chunk_size=4)
+
+        assert [len(call.args[0]) for call in db.upsert_tenders.await_args_list] == [4, 2]
+        assert report.pages == 3
+        assert report.fetched == 6
+        assert report.inserted == 6
+        # Projection "listing" : pas de links multilingues
+        assert client.scan_pages.call_args.kwargs["fields"] == TED_FIELD_PROFILES["listing"]
+        phases = {phase.name: phase for phase in report.phases}
+        assert phases["sync.parse"].count == 3
+        assert phases["db.upsert_chunk"].count == 2
+        assert report.bottleneck is not None
+        assert not report.bottleneck.startswith("sync.queue")
+
+        # Exécution enregistrée dans sync_runs
+        db.create_sync_run.assert_awaited_once_with("FRA", "manual")
+        db.finish_sync_run.assert_awaited_once_with(7, report)
+        assert report.run_id == 7
+
+        # Progression après la première page puis après chaque lot
+        progress = db.update_sync_progress.await_args_list
+        assert len(progress) == 3
+        assert progress[0].kwargs["expected"] == 6
+        assert progress[-1].kwargs["inserted"] == 6
+        db.acquire_sync_lock.return_value.release.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_lock_held(self, db: AsyncMock) -> None:
+        """Test refus si le pays est déjà en cours de synchronisation."""
+        db.acquire_sync_lock.return_value = None
+
+        with pytest.raises(SyncAlreadyRunningError):
+            await run_sync_pipeline(make_client([]), db, "FRA")
+
+        db.create_sync_run.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_start_sync_job(
+        self, db: AsyncMock, mock_ted_response: dict[str, Any]
+    ) -> None:
+        """Test tâche de fond : identifiant immédiat, verrou libéré à la fin."""
+        db.upsert_tenders.side_effect = TEDAPIError("db down")
+        client = make_client(make_pages(mock_ted_response, 1))
+
+        run_id = await start_sync_job(client, db, "FRA")
+
+        assert run_id == 7
+        job = get_sync_job(run_id)
+        assert job is not None
+        assert await job is None
+        assert db.finish_sync_run.await_args.kwargs["error"] == "db down"
+        db.acquire_sync_lock.return_value.release.assert_awaited_once()
+        assert get_sync_job(run_id) is None
+
+    @pytest.mark.asyncio
+    async def test_max_results(
+        self, db: AsyncMock, mock_ted_response: dict[str, Any]
+    ) -> None:
+        """Test arrêt du fetch une fois max_results atteint."""
+        client = make_client(make_pages(mock_ted_response, 5))
+
+        report = await run_sync_pipeline(client, db, "FRA", max_results=3)
+
+        assert report.fetched == 3
+        assert report.pages == 2
+
+    @pytest.mark.asyncio
+    async def test_ted_error_propagates(
+        self, db: AsyncMock, mock_ted_response: dict[str, Any]
+    ) -> None:
+        """Test erreur TED après une page: lot déjà reçu conservé, erreur levée."""
+        client = make_client(
+            make_pages(mock_ted_response, 1),
+            error=TEDAPIError("boom", status_code=503),
+        )
+
+        with pytest.raises(TEDAPIError):
+            await run_sync_pipeline(client, db, "FRA")
+
+        db.upsert_tenders.assert_awaited_once()
+        run_id, partial = db.finish_sync_run.await_args.args
+        assert run_id == 7
+        assert partial.fetched == 2
+        assert db.finish_sync_run.await_args.kwargs["error"] == "boom"
+
+        # Page 1 upsert : checkpoint conservé pour la reprise
+        checkpoint = db.save_sync_checkpoint.await_args.args[0]
+        assert checkpoint.last_page == 1
+        assert checkpoint.fetched == 2
+        db.delete_sync_checkpoint.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_checkpoint_per_committed_page(
+        self, db: AsyncMock, mock_ted_response: dict[str, Any]
+    ) -> None:
+        """Test checkpoint sur la dernière page entièrement upsert de chaque lot."""
+        client = make_client(make_pages(mock_ted_response, 3))
+        saved: list[tuple[int, str | None, int]] = []
+        db.save_sync_checkpoint.side_effect = lambda c: saved.append(
+            (c.last_page, c.iteration_token, c.fetched)
+        )
+
+        await run_sync_pipeline(client, db, "FRA", chunk_size=3)
+
+        # Lot 1 : page 1 + moitié de page 2 ; lot 2 : fin de page 2 + page 3
+        assert saved == [(1, "token-2", 2), (3, None, 6)]
+        db.delete_sync_checkpoint.assert_awaited_once_with("fingerprint")
+
+    @pytest.mark.asyncio
+    async def test_resume_from_checkpoint(
+        self, db: AsyncMock, mock_ted_response: dict[str, Any]
+    ) -> None:
+        """Test reprise à la page suivant le checkpoint, max_results cumulé."""
+        db.get_sync_checkpoint.return_value = SyncCheckpoint(
+            fingerprint="abc",
+            country="FRA",
+            query="q",
+            last_page=2,
+            fetched=4,
+            run_id=6,
+            iteration_token="token-3",
+        )
+        client = make_client(make_pages(mock_ted_response, 4))
+
+        report = await run_sync_pipeline(client, db, "FRA", max_results=7)
+
+        assert client.scan_pages.call_args.kwargs["start_page"] == 3
+        assert client.scan_pages.call_args.kwargs["start_token"] == "token-3"
+        assert report.pages == 2
+        assert report.fetched == 3
+        progress = db.update_sync_progress.await_args_list
+        assert progress[0].kwargs["expected"] == 3
+
+    @pytest.mark.asyncio
+    async def test_callbacks(
+        self, db: AsyncMock, mock_ted_response: dict[str, Any]
+    ) -> None:
+        """Test appel des callbacks, une erreur n'interrompt pas la sync."""
+        client = make_client(make_pages(mock_ted_response, 1))
+        calls: list[tuple[int, int]] = []
+
+        def failing(inserted: int, updated: int) -> None:
+            raise RuntimeError("callback error")
+
+        report = await run_sync_pipeline(
+            client, db, "FRA", callbacks=[failing, lambda i, u: calls.append((i, u))]
+        )
+
+        assert calls == [(2, 0)]
+        assert {phase.name: phase for phase in report.phases}["sync.callback"].count == 2
+
+    @pytest.mark.asyncio
+    async def test_spans_exported(
+        self, db: AsyncMock, mock_ted_response: dict[str, Any]
+    ) -> None:
+        """Test spans OpenTelemetry rattachés au span racine ted.sync."""
+        exporter = InMemorySpanExporter()
+        tracer = get_tracer(configure_tracing(exporter))
+        client = make_client(make_pages(mock_ted_response, 2))
+
+        await run_sync_pipeline(client, db, "FRA", tracer=tracer)
+
+        spans = exporter.get_finished_spans()
+        root = next(span for span in spans if span.name == "ted.sync")
+        assert root.attributes["ted.country"] == "FRA"
+        assert root.attributes["ted.fetched"] == 4
+
+        children = [span for span in spans if span.parent is not None]
+        assert {span.parent.span_id for span in children} == {root.context.span_id}
+        names = {span.name for span in children}
+        assert {
+            "ted.fetch_page",
+            "sync.parse",
+            "sync.queue_wait",
+            "db.upsert_chunk",
+        } <= names
+        fetch = [span for span in children if span.name == "ted.fetch_page"]
+        assert fetch[0].attributes["page"] == 1
+
+
+def make_run(started_at: datetime, status: str = "completed") -> SyncRun:
+    """Exécution sync_runs minimale."""
+    return SyncRun(
+        id=1, country="FRA", trigger="scheduled", status=status, started_at=started_at
+    )
+
+
+class TestSyncCoordination:
+    """Tests pour LeaderElector et le rattrapage du scheduler."""
+
+    @pytest.fixture
+    def db(self) -> AsyncMock:
+        """Base de données mockée, verrou d'élection libre."""
+        db = AsyncMock(spec=TenderDatabase)
+        lock = AsyncMock()
+        lock.is_held.return_value = True
+        db.try_advisory_lock.return_value = lock
+        return db
+
+    @pytest.mark.asyncio
+    async def test_election_and_failover(self, db: AsyncMock) -> None:
+        """Test prise du leadership, perte de connexion puis réélection."""
+        elected = AsyncMock()
+        elector = LeaderElector(db, on_elected=elected)
+
+        assert await elector.campaign()
+        assert elector.is_leader
+        db.try_advisory_lock.assert_awaited_once_with(LEADER_LOCK_NAMESPACE, elector.name)
+
+        # Tour suivant : verrou toujours tenu, pas de nouvelle élection
+        assert await elector.campaign()
+        assert elected.await_count == 1
+
+        # Connexion perdue et verrou pris par une autre réplique
+        db.try_advisory_lock.return_value.is_held.return_value = False
+        db.try_advisory_lock.return_value = None
+        assert not await elector.campaign()
+        assert not elector.is_leader
+
+        await elector.resign()
+
+    @pytest.mark.asyncio
+    async def test_catch_up(self, db: AsyncMock, test_settings: Settings) -> None:
+        """Test rattrapage uniquement si le dernier créneau n'a pas abouti."""
+        scheduler = TenderSyncScheduler(test_settings, MagicMock(), db)
+        scheduler.sync_tenders = AsyncMock(return_value=(0, 0))  # type: ignore[method-assign]
+        slot = scheduler.last_scheduled_time()
+
+        def history(*runs: SyncRun) -> None:
+            async def list_sync_runs(**kwargs: Any) -> PaginatedResponse[SyncRun]:
+                items = [r for r in runs if kwargs.get("status") in (None, r.status)]
+                return PaginatedResponse(total=len(items), page=1, limit=1, items=items[:1])
+
+            db.list_sync_runs.side_effect = list_sync_runs
+
+        # Non leader : rien
+        assert not await scheduler.catch_up()
+
+        await scheduler.elector.campaign()
+
+        # Première installation : pas d'historique, pas de rattrapage
+        history()
+        assert not await scheduler.catch_up()
+
+        # Créneau couvert par une exécution terminée
+        history(make_run(slot + timedelta(minutes=1)))
+        assert not await scheduler.catch_up()
+
+        # Leader mort pendant la sync du créneau
+        history(
+            make_run(slot + timedelta(minutes=1), status="running"),
+            make_run(slot - timedelta(days=1)),
+        )
+        assert await scheduler.catch_up()
+        scheduler.sync_tenders.assert_awaited_once_with(country="FRA", trigger="catch-up")